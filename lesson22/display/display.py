@@ -1,11 +1,56 @@
 from display.displayline import DisplayLine
 from lcd1602 import LCD1602
+from lcd1602._helper import _Helper
+import utime as time
 
 
 class Display:
-    def __init__(self, lcd1602: LCD1602, autoscroll_speed_ms: int = 2000):
+    # Scroll modes. In the hardware modes, text longer than a line scrolls as
+    # a marquee using the display shift of the LCD: the 40 DDRAM columns of
+    # each line are loaded once, then each scroll step is a single shift
+    # command (plus one write per line for text longer than 40 characters,
+    # which is refilled in the column that has just moved off-screen). The
+    # shift applies to both lines, so a line whose text fits would move too:
+    #   * SCROLL_HARDWARE: hardware shift only when no line has static text
+    #     (blank lines are fine), software scrolling otherwise
+    #   * SCROLL_HARDWARE_ALL: hardware shift as soon as a line overflows,
+    #     lines whose text fits scroll along
+    SCROLL_SOFTWARE = 0
+    SCROLL_HARDWARE = 1
+    SCROLL_HARDWARE_ALL = 2
+
+    _NUM_DDRAM_COLS = 40
+
+    def __init__(
+        self,
+        lcd1602: LCD1602,
+        autoscroll_speed_ms: int = 2000,
+        scroll_mode: int = SCROLL_SOFTWARE,
+        max_fps: int = 10,
+    ):
+        _Helper.validate_integer_arg("max_fps", max_fps, min_value=1)
+
         self._lcd = lcd1602
-        self._lines = [DisplayLine(16, autoscroll_speed_ms), DisplayLine(16, autoscroll_speed_ms)]
+        self._lines = [
+            DisplayLine(16, autoscroll_speed_ms, encode=lcd1602._encode_text),
+            DisplayLine(16, autoscroll_speed_ms, encode=lcd1602._encode_text),
+        ]
+        self._autoscroll_speed_ms = autoscroll_speed_ms
+        self._scroll_mode = scroll_mode
+        self._is_marquee_on = False
+        self._marquee_pos = 0  # Position of the marquee text in the leftmost visible column
+        self._marquee_shift = 0  # Number of columns the display is shifted left by
+        self._last_marquee_step_on = 0  # Timestamp
+
+        # Render governor. Producers post the sensor state, which is rendered
+        # on the next frame. Frames are at least `_frame_interval_ms` apart:
+        # states posted in between are coalesced, only the last one is
+        # rendered. A state equal to the one displayed is not formatted again.
+        self._frame_interval_ms = 1000 // max_fps
+        self._last_frame_on = None  # Timestamp
+        self._posted_state = None
+        self._rendered_state = None
+        self.reset_frame_stats()
 
     def update_sensor_values(self, temp: int, temp_unit: str, humidity_percent: int):
         self._lines[0].set_text(f"Temp: {int(temp)}{chr(176)}{temp_unit}")
@@ -15,7 +60,176 @@ class Display:
         self._lines[0].set_text("SENSOR ERROR!")
         self._lines[1].set_text(str(error))
 
+    def post_sensor_values(self, temp: int, temp_unit: str, humidity_percent: int):
+        self._post_state((int(temp), temp_unit, humidity_percent))
+
+    def post_sensor_error(self, error: Exception):
+        self._post_state((str(error),))
+
+    def get_frame_stats(self) -> dict:
+        # Frames are the refreshes that wrote to the LCD. Times are in
+        # microseconds and include formatting.
+        stats = dict(self._frame_stats)
+        stats["avg_frame_us"] = stats["total_frame_us"] // stats["frames"] if stats["frames"] else 0
+        return stats
+
+    def get_next_refresh_ms(self) -> int | None:
+        # Returns the time (see `time.ticks_ms()`) at which `refresh()` has
+        # something to do, or None when nothing changes until new values are
+        # set. The main loop can sleep until then.
+        deadline = self._get_next_render_ms()
+        if self._posted_state is not None:
+            frame_deadline = self._get_next_frame_ms()
+            if deadline is None or time.ticks_diff(frame_deadline, deadline) < 0:
+                deadline = frame_deadline
+        return deadline
+
     def refresh(self):
-        for idx, line in enumerate(self._lines):
+        started_at = time.ticks_us()
+        now = time.ticks_ms()
+        is_frame = False
+        if self._posted_state is not None and time.ticks_diff(now, self._get_next_frame_ms()) >= 0:
+            state = self._posted_state
+            self._posted_state = None
+            if state == self._rendered_state:
+                self._frame_stats["skipped_formats"] += 1
+            else:
+                self._rendered_state = state
+                if len(state) == 1:
+                    self.update_sensor_error(state[0])
+                else:
+                    self.update_sensor_values(*state)
+                self._last_frame_on = now
+                is_frame = True
+
+        if self._render() or is_frame:
+            stats = self._frame_stats
+            elapsed = time.ticks_diff(time.ticks_us(), started_at)
+            stats["frames"] += 1
+            stats["last_frame_us"] = elapsed
+            stats["max_frame_us"] = max(stats["max_frame_us"], elapsed)
+            stats["total_frame_us"] += elapsed
+
+    def reset_frame_stats(self):
+        self._frame_stats = {
+            "frames": 0,
+            "posts": 0,
+            "coalesced_posts": 0,
+            "skipped_formats": 0,
+            "last_frame_us": 0,
+            "max_frame_us": 0,
+            "total_frame_us": 0,
+        }
+
+    def _get_next_frame_ms(self) -> int:
+        if self._last_frame_on is None:
+            return time.ticks_ms()
+        return time.ticks_add(self._last_frame_on, self._frame_interval_ms)
+
+    def _get_next_render_ms(self) -> int | None:
+        now = time.ticks_ms()
+        if self._should_use_marquee():
+            if not self._is_marquee_on or any(line.has_new_text() for line in self._lines):
+                return now
+            return time.ticks_add(self._last_marquee_step_on, self._autoscroll_speed_ms)
+
+        if self._is_marquee_on:
+            return now
+
+        deadline = None
+        for line in self._lines:
+            line_deadline = line.get_next_refresh_ms()
+            if line_deadline is not None and (deadline is None or time.ticks_diff(line_deadline, deadline) < 0):
+                deadline = line_deadline
+        return deadline
+
+    def _post_state(self, state: tuple):
+        stats = self._frame_stats
+        stats["posts"] += 1
+        if self._posted_state is not None:
+            stats["coalesced_posts"] += 1
+        self._posted_state = state
+
+    def _render(self) -> bool:
+        # Writes the lines that have changed or scrolled. Returns True when
+        # something has been written to the LCD.
+        if self._should_use_marquee():
+            return self._refresh_marquee()
+
+        if self._is_marquee_on:
+            # Back to software scrolling: undo the display shift and redraw
+            self._lcd.home()
+            self._is_marquee_on = False
+            self._marquee_shift = 0
+            for line in self._lines:
+                line.invalidate()
+
+        # Lines are read by index, so that no enumerate object is created on
+        # each software scroll step (see `DisplayLine`).
+        is_written = False
+        lines = self._lines
+        for idx in range(len(lines)):
+            line = lines[idx]
             if line.should_refresh():
-                self._lcd.write_text(0, idx, line.get_text())
+                self._lcd.write_codes(0, idx, line.get_codes())
+                is_written = True
+        return is_written
+
+    def _refresh_marquee(self) -> bool:
+        lcd = self._lcd
+        num_cols = Display._NUM_DDRAM_COLS
+        now = time.ticks_ms()
+
+        if not self._is_marquee_on or any(line.has_new_text() for line in self._lines):
+            # Load the 40 columns of each line, starting at the leftmost
+            # visible column, so the current display shift is kept.
+            shift = self._marquee_shift
+            codes = bytearray(num_cols)
+            for idx, line in enumerate(self._lines):
+                for pos in range(num_cols):
+                    codes[pos] = line.get_marquee_code(pos, num_cols)
+                lcd.write_codes(shift, idx, codes[: num_cols - shift])
+                if shift:
+                    lcd.write_codes(0, idx, codes[num_cols - shift :])
+                line.set_text_displayed()
+
+            self._is_marquee_on = True
+            self._marquee_pos = 0
+            self._last_marquee_step_on = now
+            return True
+
+        if abs(time.ticks_diff(now, self._last_marquee_step_on)) < self._autoscroll_speed_ms:
+            return False
+
+        # Moves the content one column to the left (the window over the
+        # DDRAM moves right, see `LCD1602.scroll_display_right()`)
+        lcd.scroll_display_right()
+
+        # The DDRAM column that has just moved off-screen (text position `pos`)
+        # comes back into view on the right after 40 - 16 = 24 steps. It then
+        # shows the text position 40 ahead (`pos + num_cols`), one full loop
+        # of the DDRAM: the refill index is `pos + num_cols`, not the number of
+        # steps. Only text longer than 40 characters needs to be refilled.
+        pos = self._marquee_pos
+        for idx, line in enumerate(self._lines):
+            code = line.get_marquee_code(pos + num_cols, num_cols)
+            if code != line.get_marquee_code(pos, num_cols):
+                lcd.write_code(self._marquee_shift, idx, code)
+
+        self._marquee_pos = pos + 1
+        self._marquee_shift = (self._marquee_shift + 1) % num_cols
+        self._last_marquee_step_on = now
+        return True
+
+    def _should_use_marquee(self) -> bool:
+        if self._scroll_mode == Display.SCROLL_SOFTWARE:
+            return False
+
+        lines = self._lines
+        if not any(line.is_overflowing() for line in lines):
+            return False
+
+        if self._scroll_mode == Display.SCROLL_HARDWARE_ALL:
+            return True
+
+        return all(line.is_overflowing() or line.is_blank() for line in lines)
@@ -2,12 +2,68 @@ import utime as time
 
 
 class DisplayLine:
-    def __init__(self, num_visible_chars: int, autoscroll_speed_ms: int):
+    # The text is stored as LCD character codes in a preallocated buffer.
+    # Scrolling only moves the index of the first visible character, and the
+    # visible characters are copied into a preallocated window handed to the
+    # LCD as a memoryview. Once the text has been set, refreshing the line does
+    # not build strings, slices or lists.
+
+    # Number of spaces between the end of a scrolling text and its beginning
+    _SCROLL_GAP = 3
+
+    def __init__(self, num_visible_chars: int, autoscroll_speed_ms: int, encode=None, max_text_length: int = 64):
+        # `encode` translates a string to LCD character codes (such as
+        # `LCD1602._encode_text()`, which applies the character mappings).
+        # By default, characters are used as codes, and characters above 255
+        # are replaced with blanks.
         self._num_visible_chars = num_visible_chars
         self._autoscroll_speed_ms = autoscroll_speed_ms
         self._last_autoscroll_on = 0  # Timestamp
+        self._encode = DisplayLine._encode_latin1 if encode is None else encode
+        self._codes = bytearray(max(max_text_length, num_visible_chars) + DisplayLine._SCROLL_GAP)
+        self._window = bytearray(num_visible_chars)
+        self._window_mv = memoryview(self._window)
         self.set_text("")
 
+    def get_marquee_code(self, pos: int, num_cols: int) -> int:
+        # Returns the code at position `pos` of a marquee looping over
+        # `num_cols` columns. Text that fits in the columns is padded with
+        # spaces, longer text loops with the gap added by `set_text()`.
+        if self._length > num_cols:
+            return self._codes[pos % self._length]
+        pos = pos % num_cols
+        return self._codes[pos] if pos < self._length else 0x20
+
+    def get_next_refresh_ms(self) -> int | None:
+        # Returns the time (see `time.ticks_ms()`) at which the line has to be
+        # refreshed, or None when it does not change until new text is set.
+        if not self._text_getter_called:
+            return time.ticks_ms()
+        if self._length <= self._num_visible_chars:
+            return None
+        return time.ticks_add(self._last_autoscroll_on, self._autoscroll_speed_ms)
+
+    def has_new_text(self) -> bool:
+        return not self._text_getter_called
+
+    def invalidate(self):
+        # Forces the text to be displayed again on the next refresh
+        self._text_getter_called = False
+
+    def is_blank(self) -> bool:
+        codes = self._codes
+        for idx in range(self._length):
+            if codes[idx] != 0x20:
+                return False
+        return True
+
+    def is_overflowing(self) -> bool:
+        return self._length > self._num_visible_chars
+
+    def set_text_displayed(self):
+        # Same as `get_codes()` for a line displayed without calling it (marquee)
+        self._text_getter_called = True
+
     def should_refresh(self) -> bool:
         if not self._text_getter_called:
             return True
@@ -17,13 +73,15 @@ class DisplayLine:
         if not self._text_getter_called:
             return False
 
-        if len(self._text) <= self._num_visible_chars:
+        if self._length <= self._num_visible_chars:
             return False
 
         elapsed = abs(time.ticks_diff(time.ticks_ms(), self._last_autoscroll_on))
         return elapsed >= self._autoscroll_speed_ms
 
-    def get_text(self) -> str:
+    def get_codes(self) -> memoryview:
+        # Returns the visible codes. The memoryview is reused: its content is
+        # only valid until the next call.
         should_autoscroll = self._should_autoscroll()
 
         if not self._text_getter_called:
@@ -31,31 +89,52 @@ class DisplayLine:
             self._last_autoscroll_on = time.ticks_ms()
 
         if should_autoscroll:
-            self._text_head = (self._text_head + 1) % len(self._text)
-            self._text_tail = (self._text_tail + 1) % len(self._text)
+            self._head = (self._head + 1) % self._length
             self._last_autoscroll_on = time.ticks_ms()
 
-        if self._text_tail < self._text_head:
-            return self._text[self._text_head :] + self._text[: self._text_tail + 1]
-        else:
-            return self._text[self._text_head : self._text_tail + 1]
+        codes = self._codes
+        window = self._window
+        length = self._length
+        idx = self._head
+        for pos in range(self._num_visible_chars):
+            window[pos] = codes[idx]
+            idx = idx + 1
+            if idx == length:
+                idx = 0
+        return self._window_mv
 
     def set_text(self, text: str):
-        if len(text) < self._num_visible_chars:
+        text_codes = self._encode(text)
+        num_codes = len(text_codes)
+
+        if num_codes < self._num_visible_chars:
             # Pad text so it has the same number of characters as the number of
             # visible characters per LCD line. This makes sure that any previous
             # text is overwritten when the new text is written to the LCD.
-            self._text = "{:<{}}".format(text, self._num_visible_chars)
-        elif len(text) > self._num_visible_chars:
+            length = self._num_visible_chars
+        elif num_codes > self._num_visible_chars:
             # If text has more characters than the number of visible characters,
             # add 3 spaces to the end of the text so there is a gap between the
             # end of the text and the start of the text when it loops around.
-            self._text = text + "   "
+            length = num_codes + DisplayLine._SCROLL_GAP
         else:
             # If text has the same number of characters as the number of visible
             # characters, we can use it as is.
-            self._text = text
+            length = num_codes
+
+        # The buffer only grows when a text longer than all previous ones is set
+        if length > len(self._codes):
+            self._codes = bytearray(length)
 
+        codes = self._codes
+        codes[:num_codes] = text_codes
+        for idx in range(num_codes, length):
+            codes[idx] = 0x20
+
+        self._length = length
         self._text_getter_called = False
-        self._text_head = 0
-        self._text_tail = self._num_visible_chars - 1
+        self._head = 0
+
+    @staticmethod
+    def _encode_latin1(text: str) -> bytes:
+        return bytes(ord(char) if ord(char) <= 0xFF else 0x20 for char in text)
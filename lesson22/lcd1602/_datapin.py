@@ -19,9 +19,11 @@ from machine import Pin
 # `Pin.mode()` is not supported by all MicroPython implementations. We need to be
 # able to switch between `Pin.OUT` and `Pin.IN` to perform read operations on the
 # LCD, such as reading the busy flag, the address counter or the cursor position.
-# The `_DataPin` class implements this feature through his `mode()` method. It also
-# implements a subset of the `Pin` class interface which covers the needs of the
-# LCD1602 library, making it a drop-in replacement to the `Pin` class.
+# The `_DataPin` class implements this feature through his `mode()` method, using
+# `Pin.init()` which all implementations support. The pin object is reused, so
+# switching modes does not allocate memory (the busy flag may be polled in a loop).
+# It also implements a subset of the `Pin` class interface which covers the needs
+# of the LCD1602 library, making it a drop-in replacement to the `Pin` class.
 class _DataPin:
     def __init__(self, pin_num: int):
         self._pin_num = pin_num
@@ -40,4 +42,4 @@ class _DataPin:
             return self._pin.value(value)
 
     def mode(self, mode: int):
-        self._pin = Pin(self._pin_num, mode)
+        self._pin.init(mode)
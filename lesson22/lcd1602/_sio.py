@@ -0,0 +1,49 @@
+# This file is part of the LCD1602 MicroPython LCD library
+# Copyright (C) 2023 Pascal Jobin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import os
+import sys
+
+try:
+    from machine import mem32
+except ImportError:
+    mem32 = None
+
+
+# RP2040 single-cycle IO (SIO) registers, used to read and write several GPIOs
+# at once. See RP2040 datasheet, section 2.3.1.7 (list of registers). The
+# RP2350 (e.g. Pico 2) is an "rp2" platform too, but its registers are at other
+# offsets: its pins are accessed one by one.
+class _SIO:
+    AVAILABLE = sys.platform == "rp2" and "RP2040" in os.uname().machine and mem32 is not None
+
+    GPIO_IN = 0xD0000004
+    GPIO_OUT_SET = 0xD0000014
+    GPIO_OUT_CLR = 0xD0000018
+    GPIO_OE_SET = 0xD0000024
+    GPIO_OE_CLR = 0xD0000028
+
+    @classmethod
+    def get_data_base(cls, pin_nums: list[int]) -> int | None:
+        # Returns the GPIO of the lowest data pin (DB0 or DB4) when the data
+        # pins (DB7 first) are on consecutive GPIOs and the SIO registers are
+        # available. Returns None otherwise (pins are accessed one by one).
+        if not cls.AVAILABLE:
+            return None
+
+        base = pin_nums[-1]
+        if list(pin_nums) != list(range(base + len(pin_nums) - 1, base - 1, -1)):
+            return None
+        return base
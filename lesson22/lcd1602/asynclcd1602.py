@@ -0,0 +1,218 @@
+# This file is part of the LCD1602 MicroPython LCD library
+# Copyright (C) 2023 Pascal Jobin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from lcd1602.hd44780bus import HD44780Bus
+from lcd1602.hd44780cmds import HD44780Cmds
+from lcd1602.lcd1602 import LCD1602
+import uasyncio as asyncio
+
+
+class AsyncLCD1602:
+    """Drives an LCD from asyncio tasks without blocking the event loop
+
+    The `LCD1602` class waits for each command to complete, which blocks the
+    whole program: 150ms when initializing the display, 1.52ms for each
+    clear or home command, etc. This class wraps an `LCD1602` instance and
+    hands the bus work over to a background task, which yields to the other
+    tasks whenever it has to wait for the LCD.
+
+    Text and custom characters are written to the frame buffer of the LCD
+    right away (see `LCD1602.set_buffering_on()`), and the clear and home
+    commands are queued. The background task executes the queued commands,
+    then sends the characters that have changed. Awaiting `flush()` returns
+    once the display is up to date:
+
+        ```
+        import uasyncio as asyncio
+        from lcd1602 import AsyncLCD1602, HD44780Bus4
+
+        async def main():
+            lcd = AsyncLCD1602(HD44780Bus4(rs=2, e=3, db_7_to_4=[7, 6, 5, 4], rw=1))
+            await lcd.init()
+            await lcd.write_text(0, 0, "Hello World!")
+            await lcd.flush()
+
+        asyncio.run(main())
+        ```
+
+    Short waits (less than 1ms) are still performed by the LCD class, so
+    sending a full screen of characters blocks for a few milliseconds.
+    """
+
+    # Waits shorter than this are not worth a trip through the scheduler
+    _MIN_YIELD_US = 1000
+
+    def __init__(self, bus: HD44780Bus):
+        """Creates a new AsyncLCD1602 instance
+
+        Creating a new AsyncLCD1602 instance DOES NOT initialize the display.
+        `init()` must be awaited before any other operation on the display.
+
+        Args:
+            bus HD44780Bus: The bus used to communicate with the LCD.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+        """
+        self.lcd = LCD1602(bus)
+        """The wrapped LCD, in buffered and deferred wait modes. It can be used
+        for operations this class does not provide (cursor, custom character
+        mappings, etc.). Such operations take effect immediately."""
+
+        self.lcd.set_buffering_on()
+        self.lcd.set_deferred_wait_on()
+
+        self._cmds = []
+        self._has_work = asyncio.Event()
+        self._is_idle = asyncio.Event()
+        self._is_idle.set()
+        self._task = None
+
+        # Exception raised by the background task, re-raised by `flush()`.
+        # After an error, what the display contains is unknown: the whole
+        # frame buffer is sent again.
+        self._error = None
+        self._must_redraw = False
+
+    async def clear(self):
+        """Clears the display
+
+        The frame buffer is cleared immediately, so text written after this
+        call is displayed once the clear command has been executed. The
+        clear command also sets the entry mode to left to right.
+        """
+        lcd = self.lcd
+        lcd.clear()
+        lcd._entry_mode = lcd._entry_mode | HD44780Cmds.C03_ARG_LEFT_TO_RIGHT
+        self._queue(HD44780Cmds.C01_CLEAR)
+
+    async def create_character(self, lcdcharcode: int, bitmap: list[int]):
+        """Creates a custom character
+
+        See `LCD1602.create_character()`.
+
+        Args:
+            lcdcharcode (int): The LCD character code of the custom character (0 to 7).
+            bitmap (list[int]): The 8 rows of the custom character (5 bits each).
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range.
+        """
+        self.lcd.create_character(lcdcharcode, bitmap)
+        self._has_work.set()
+
+    async def flush(self):
+        """Waits until the queued commands and the changes have been sent to the display
+
+        When the background task fails to update the display (for instance, an
+        `OSError` raised by the I2C bus), the exception is raised by the next
+        call to this method. The background task keeps running: the whole
+        display is sent again on the following flush.
+
+        Raises:
+            RuntimeError: The display has not been initialized.
+        """
+        if self._task is None:
+            raise RuntimeError("Display is not initialized. Please await init() first.")
+
+        self._is_idle.clear()
+        self._has_work.set()
+        await self._is_idle.wait()
+
+        error = self._error
+        if error is not None:
+            self._error = None
+            raise error
+
+    async def home(self):
+        """Sets the cursor position to (0, 0) and resets scrolling"""
+        self._queue(HD44780Cmds.C02_HOME)
+
+    async def init(self):
+        """Initializes the display and starts the background task
+
+        The initialization procedure is the same as `LCD1602.init()`. Other
+        tasks run while waiting for the LCD to power up (150ms) and while the
+        long commands execute. Queued commands are discarded.
+        """
+        self._cmds = []
+        for delay_ms in self.lcd._init_steps():
+            await asyncio.sleep_ms(delay_ms)
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def write_text(self, col: int, line: int, text: str):
+        """Writes text at the given position
+
+        See `LCD1602.write_text()`. The text is displayed by the background
+        task, on the next flush.
+
+        Args:
+            col (int): The column index (0 to 39).
+            line (int): The line index (0 or 1).
+            text (str): The text to write.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range.
+        """
+        self.lcd.write_text(col, line, text)
+        self._has_work.set()
+
+    def _queue(self, cmd: int):
+        # Queues a command for the background task
+        self._cmds.append(cmd)
+        self._has_work.set()
+
+    async def _run(self):
+        # Background task. Queued commands are executed first: their effect on
+        # the frame buffer has already been applied by the public methods.
+        lcd = self.lcd
+        while True:
+            await self._has_work.wait()
+            self._has_work.clear()
+
+            try:
+                # Commands may be queued while waiting for the LCD: the frame
+                # buffer is sent only once none is left.
+                while True:
+                    while self._cmds:
+                        cmd = self._cmds.pop(0)
+                        await self._wait_until_ready()
+                        lcd._execute_unchecked(cmd)
+                        if cmd == HD44780Cmds.C01_CLEAR:
+                            lcd._ddram_shadow[:] = b" " * LCD1602._DDRAM_SIZE
+
+                    await self._wait_until_ready()
+                    if not self._cmds:
+                        break
+                lcd.flush(self._must_redraw)
+                self._must_redraw = False
+            except Exception as ex:
+                # Keep the task alive, and let `flush()` report the error
+                self._error = ex
+                self._must_redraw = True
+                lcd._address_counter = None
+            self._is_idle.set()
+
+    async def _wait_until_ready(self):
+        # Yields for the part of the execution time of the last command that
+        # is long enough to let other tasks run.
+        remaining_us = self.lcd._get_remaining_us()
+        if remaining_us >= AsyncLCD1602._MIN_YIELD_US:
+            await asyncio.sleep_ms(remaining_us // 1000)
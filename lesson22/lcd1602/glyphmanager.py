@@ -0,0 +1,152 @@
+# This file is part of the LCD1602 MicroPython LCD library
+# Copyright (C) 2023 Pascal Jobin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from lcd1602._helper import _Helper
+from lcd1602.lcd1602 import LCD1602
+
+
+class GlyphManager:
+    """Assigns named custom characters to CGRAM slots on demand
+
+    The LCD can only hold 8 custom characters at a time. The glyph manager
+    accepts any number of named 5x8 bitmaps (glyphs) and loads them into the
+    custom character slots when they are used. When all slots are taken, the
+    least recently used glyph is evicted, unless it is still displayed (i.e.
+    its character code is still present in the LCD's DDRAM). A glyph already
+    loaded in a slot is never uploaded again.
+
+    Glyphs are used in text through the string returned by `get_char()`:
+
+        ```
+        from lcd1602 import LCD1602, GlyphManager
+        lcd = LCD1602.begin_4bit(rs=2, e=3, db_7_to_4=[7, 6, 5, 4], rw=1)
+        glyphs = GlyphManager(lcd)
+        glyphs.define("bar1", [0b10000] * 7 + [0])
+        glyphs.define("bar2", [0b11000] * 7 + [0])
+        lcd.write_text(0, 0, glyphs.get_char("bar1") + glyphs.get_char("bar2"))
+        ```
+
+    Characters written with `write_text()` are translated using the character
+    mappings (see `LCD1602.map_character()`). Characters `chr(0)` to `chr(7)`
+    must not be mapped to other codes when using the glyph manager.
+    """
+
+    def __init__(self, lcd: LCD1602, lcdcharcodes: list[int] | None = None):
+        """Initializes a new instance of the GlyphManager class
+
+        Args:
+            lcd (LCD1602): The LCD whose custom characters are managed.
+            lcdcharcodes (list[int], optional): The custom character codes (0 to 7) available to the manager. Other codes can be used for static custom characters. Defaults to all 8 codes.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range.
+        """
+        if not isinstance(lcd, LCD1602):
+            raise TypeError("Invalid LCD.")
+
+        if lcdcharcodes is None:
+            lcdcharcodes = list(range(0, 8))
+        _Helper.validate_integer_list_arg("lcdcharcodes", lcdcharcodes, min_value=0, max_value=7)
+        if len(lcdcharcodes) == 0:
+            raise ValueError("Argument 'lcdcharcodes' must contain at least one character code")
+
+        self._lcd = lcd
+        self._bitmaps = {}
+        self._codes = {}  # Glyph name -> character code
+
+        # Character codes from the least recently used to the most recently used
+        self._lru = list(lcdcharcodes)
+        self._names = {}  # Character code -> glyph name
+
+    def define(self, name: str, bitmap: list[int]):
+        """Defines (or redefines) a named glyph
+
+        Defining a glyph does not load it. Redefining a loaded glyph updates the
+        corresponding custom character.
+
+        Args:
+            name (str): The glyph name.
+            bitmap (list[int]): The glyph's bitmap represented as a list of eight 5-bit integers.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range.
+        """
+        _Helper.validate_string_arg("name", name, min_length=1)
+        _Helper.validate_integer_list_arg("bitmap", bitmap, length=8, min_value=0b00000, max_value=0b11111)
+
+        self._bitmaps[name] = list(bitmap)
+        if name in self._codes:
+            self._lcd.create_character(self._codes[name], self._bitmaps[name])
+
+    def get_char(self, name: str) -> str:
+        """Loads a glyph if needed and returns the character to use in text
+
+        Args:
+            name (str): The glyph name.
+
+        Returns:
+            str: A single character string to use with `LCD1602.write_text()`.
+
+        Raises:
+            KeyError: The glyph has not been defined.
+            RuntimeError: All custom characters are in use by glyphs currently displayed.
+        """
+        return chr(self.get_code(name))
+
+    def get_code(self, name: str) -> int:
+        """Loads a glyph if needed and returns its character code
+
+        Args:
+            name (str): The glyph name.
+
+        Returns:
+            int: The custom character code (0 to 7) to use with `LCD1602.write_code()` or `LCD1602.write_codes()`.
+
+        Raises:
+            KeyError: The glyph has not been defined.
+            RuntimeError: All custom characters are in use by glyphs currently displayed.
+        """
+        bitmap = self._bitmaps[name]
+
+        code = self._codes.get(name)
+        if code is None:
+            code = self._evict()
+            self._codes[name] = code
+            self._names[code] = name
+
+        # Mark as most recently used
+        self._lru.remove(code)
+        self._lru.append(code)
+
+        # Nothing is sent when the custom character already holds the bitmap
+        self._lcd.create_character(code, bitmap)
+        return code
+
+    def _evict(self) -> int:
+        # Frees the least recently used character code that is not displayed
+        ddram = self._lcd._ddram_frame
+        for code in self._lru:
+            if code in self._names and bytes((code,)) in ddram:
+                continue
+
+            name = self._names.pop(code, None)
+            if name is not None:
+                del self._codes[name]
+            return code
+
+        raise RuntimeError("All custom characters are in use by glyphs currently displayed.")
@@ -25,10 +25,22 @@ class HD44780Bus:
     """Provides a base abstract implementation of a bus for the HD44780 controller
 
     This class needs to be inherited and the following methods need to be implemented:
-        * init()
         * write(command: int)
         * read(command: int) -> int
+        * _write_unchecked(command: int)
+        * _read_unchecked(command: int) -> int
+        * _init_steps()
     These base implementation of these methods raise a `NotImplementedError`.
+
+    The `_init_steps()` method is a generator performing the bus initialization
+    procedure. It yields each delay (in milliseconds) the procedure has to wait
+    for, instead of sleeping, so the delays can also be awaited by an asyncio
+    task (see `AsyncLCD1602`).
+
+    The `_write_unchecked()` and `_read_unchecked()` methods perform the same
+    operations as `write()` and `read()` without validating their argument. They
+    are used by the `LCD1602` class in hot paths, once arguments have been
+    validated by the public methods.
     """
 
     # ######################################################################## #
@@ -110,7 +122,8 @@ class HD44780Bus:
         This method is called from within the LCD initialization routine. It is
         not necessary to call this method manually.
         """
-        raise NotImplementedError()
+        for delay_ms in self._init_steps():
+            time.sleep_ms(delay_ms)
 
     def write(self, cmd: int):
         """Sends a write operation the the LCD
@@ -124,6 +137,32 @@ class HD44780Bus:
         """
         raise NotImplementedError()
 
+    def write_many(self, cmds: list[int], delay_us: int):
+        """Sends a sequence of write operations to the LCD
+
+        The bus makes sure at least `delay_us` microseconds elapse between two
+        consecutive operations, so the controller is done executing a command
+        before the next one is sent. The caller is responsible for waiting for
+        the last command to complete. This base implementation sends commands
+        one by one using `write()`. Subclasses may override this method to
+        send the whole sequence more efficiently.
+
+        Args:
+            cmds (list[int]): The commands as 10-bit unsigned integers.
+            delay_us (int): The minimum delay between two commands, in microseconds.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range --OR-- one of the commands is not a write command.
+        """
+        for cmd in cmds:
+            _Helper.validate_integer_arg("cmd", cmd, min_value=0, max_value=0b1111111111)
+            if cmd & HD44780Cmds.BITMASK_RW:
+                raise ValueError("Not a write command.")
+        _Helper.validate_integer_arg("delay_us", delay_us, min_value=0)
+
+        self._write_many_unchecked(cmds, delay_us)
+
     def read(self, cmd: int) -> int:
         """Sends a read operation to the LCD
 
@@ -151,3 +190,22 @@ class HD44780Bus:
             RuntimeError: The bus does not support controlling the backlight.
         """
         raise NotImplementedError()
+
+    def _init_steps(self):
+        # Same as `init()`, yielding the delays (in milliseconds) to wait for.
+        raise NotImplementedError()
+
+    def _write_unchecked(self, cmd: int):
+        # Same as `write()`, without argument validation.
+        raise NotImplementedError()
+
+    def _write_many_unchecked(self, cmds: list[int], delay_us: int):
+        # Same as `write_many()`, without argument validation.
+        for idx in range(len(cmds)):
+            if idx > 0:
+                time.sleep_us(delay_us)
+            self._write_unchecked(cmds[idx])
+
+    def _read_unchecked(self, cmd: int) -> int:
+        # Same as `read()`, without argument validation.
+        raise NotImplementedError()
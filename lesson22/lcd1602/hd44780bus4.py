@@ -16,6 +16,7 @@
 
 from lcd1602._helper import _Helper
 from lcd1602._datapin import _DataPin
+from lcd1602._sio import _SIO, mem32
 from lcd1602.hd44780cmds import HD44780Cmds
 from lcd1602.hd44780bus import HD44780Bus
 from machine import Pin
@@ -38,6 +39,11 @@ class HD44780Bus4(HD44780Bus):
     Pin BL (backlight control) is optional. When provided, it is assumed to be
     connected to some circuitry that controls the backlight. This circuitry
     should turn the backlight ON when the pin is HIGH and OFF when the pin is LOW.
+
+    On RP2040 boards, when the data pins are on consecutive GPIOs (DB7 to DB4
+    in decreasing order, e.g. [7, 6, 5, 4]), the data pins are written with
+    a single masked write and read with a single read of the GPIO registers,
+    rather than one pin at a time.
     """
 
     def __init__(self, rs: int, e: int, db_7_to_4: list[int], rw: int | None = None, bl: int | None = None):
@@ -72,68 +78,91 @@ class HD44780Bus4(HD44780Bus):
         self._bl_pin = None if bl is None else Pin(bl, value=0, mode=Pin.OUT)
         self._data_pins = [_DataPin(pin) for pin in db_7_to_4]
 
-    def init(self):
+        # When the data pins are on consecutive GPIOs of an RP2040, they are
+        # written and read at once through the SIO registers.
+        self._data_base = _SIO.get_data_base(db_7_to_4)
+        self._data_mask = 0 if self._data_base is None else 0x0F << self._data_base
+
+    def write(self, cmd: int):
+        _Helper.validate_integer_arg("cmd", cmd, min_value=0, max_value=0b1111111111)
+
+        # Command is a ***write*** operation when RW is low / false
+        # Command is a read operation when RW is high / true
+        if cmd & HD44780Cmds.BITMASK_RW:
+            raise ValueError("Not a write command.")
+
+        self._write_unchecked(cmd)
+
+    def read(self, cmd: int) -> int:
+        _Helper.validate_integer_arg("cmd", cmd, min_value=0, max_value=0b1111111111)
+
+        # Command is a write operation when RW is low / false
+        # Command is a ***read*** operation when RW is high / true
+        if not (cmd & HD44780Cmds.BITMASK_RW):
+            raise ValueError("Not a read command.")
+
+        if self._rw_pin is None:
+            raise RuntimeError("Read commands are not supported as no RW pin was provided (bus is write-only).")
+
+        return self._read_unchecked(cmd)
+
+    def set_backlight(self, enabled: bool):
+        if self._bl_pin is None:
+            raise RuntimeError("Backlight control is not available as no BL pin was provided.")
+        self._bl_pin.value(enabled)
+
+    def _init_steps(self):
         # See HD44780 datasheet, page 46, Table 24 for 4-bit initialization procedure.
 
         # 1. Wait for more than 40ms after VCC rises to 2.7V.
         #    As an abundance of caution, we wait 3x more.
-        time.sleep_ms(150)
+        yield 150
 
         # 2. The following instructions put the controller into 8-bit mode
         #    regardless of the current (unknown) mode. The bus length is contained
         #    in the high nibble of the command, so we don't care about the low nibble.
         self._write_nibble(0b0000110000, high_nibble=True)  # Function set (8-bit bus)
-        time.sleep_ms(5)  # Wait for >4.1ms (5ms)
+        yield 5  # Wait for >4.1ms (5ms)
         self._write_nibble(0b0000110000, high_nibble=True)  # Function set (8-bit bus)
-        time.sleep_ms(1)  # Wait for >100us (1ms)
+        yield 1  # Wait for >100us (1ms)
         self._write_nibble(0b0000110000, high_nibble=True)  # Function set (8-bit bus)
-        time.sleep_ms(1)  # Wait for >100us (1ms)
+        yield 1  # Wait for >100us (1ms)
 
         # 3. We are guaranteed that the controller is in 8-bit mode now. We can
         #    switch to 4-bit mode. As the controller is in 8-bit mode, it expects
         #    a single write operation. The bus length is contained in the high
         #    nibble of the command, so we don't care about the low nibble.
         self._write_nibble(0b0000100000, high_nibble=True)  # Function set (4-bit bus)
-        time.sleep_ms(1)  # Wait for >100us (1ms)
+        yield 1  # Wait for >100us (1ms)
 
         # The controller is now in 4-bit mode. The rest of the initialization
         # procedure is performed by the LCD class.
 
-    def write(self, cmd: int):
-        _Helper.validate_integer_arg("cmd", cmd, min_value=0, max_value=0b1111111111)
-
-        # Command is a ***write*** operation when RW is low / false
-        # Command is a read operation when RW is high / true
-        if cmd & HD44780Cmds.BITMASK_RW:
-            raise ValueError("Not a write command.")
-
+    def _write_unchecked(self, cmd: int):
         self._write_nibble(cmd, high_nibble=True)
         self._write_nibble(cmd, high_nibble=False)
 
-    def read(self, cmd: int) -> int:
-        _Helper.validate_integer_arg("cmd", cmd, min_value=0, max_value=0b1111111111)
-
-        # Command is a write operation when RW is low / false
-        # Command is a ***read*** operation when RW is high / true
-        if not (cmd & HD44780Cmds.BITMASK_RW):
-            raise ValueError("Not a read command.")
-
-        if self._rw_pin is None:
-            raise RuntimeError("Read commands are not supported as no RW pin was provided (bus is write-only).")
-
+    def _read_unchecked(self, cmd: int) -> int:
         # Set data pins to input mode
-        for pin in self._data_pins:
-            pin.mode(Pin.IN)
+        self._set_data_mode(Pin.IN)
 
         data = self._read_nibble(cmd, high_nibble=True)
         data = data | self._read_nibble(cmd, high_nibble=False)
 
         # Set data pins back to output mode
-        for pin in self._data_pins:
-            pin.mode(Pin.OUT)
+        self._set_data_mode(Pin.OUT)
 
         return data
 
+    def _set_data_mode(self, mode: int):
+        # Switches the data pins to input or output mode. With the SIO registers,
+        # all data pins are switched at once through the output enable register.
+        if self._data_base is not None:
+            mem32[_SIO.GPIO_OE_SET if mode == Pin.OUT else _SIO.GPIO_OE_CLR] = self._data_mask
+        else:
+            for pin in self._data_pins:
+                pin.mode(mode)
+
     def _read_nibble(self, command: int, high_nibble: bool) -> int:
         # Set command pins
         self._rs_pin.value(command & HD44780Cmds.BITMASK_RS)
@@ -149,7 +178,11 @@ class HD44780Bus4(HD44780Bus):
 
         # Read data pins while E is high and the controller is driving these pins.
         data = 0
-        if high_nibble:
+        if self._data_base is not None:
+            data = (mem32[_SIO.GPIO_IN] >> self._data_base) & 0x0F
+            if high_nibble:
+                data = data << 4
+        elif high_nibble:
             data = data | self._data_pins[0].value() << 7
             data = data | self._data_pins[1].value() << 6
             data = data | self._data_pins[2].value() << 5
@@ -176,7 +209,12 @@ class HD44780Bus4(HD44780Bus):
         if self._rw_pin is not None:
             self._rw_pin.value(command & HD44780Cmds.BITMASK_RW)
 
-        if high_nibble:
+        if self._data_base is not None:
+            data = ((command >> 4) if high_nibble else command) & 0x0F
+            data = data << self._data_base
+            mem32[_SIO.GPIO_OUT_SET] = data
+            mem32[_SIO.GPIO_OUT_CLR] = data ^ self._data_mask
+        elif high_nibble:
             self._data_pins[0].value(command & HD44780Cmds.BITMASK_DB7)
             self._data_pins[1].value(command & HD44780Cmds.BITMASK_DB6)
             self._data_pins[2].value(command & HD44780Cmds.BITMASK_DB5)
@@ -199,8 +237,3 @@ class HD44780Bus4(HD44780Bus):
         # Wait a full cycle. Half a cycle would be enough, but not all boards
         # support waiting nanoseconds or fractions of a unit.
         time.sleep_us(int(HD44780Bus.DELAYUS_TCYCE))
-
-    def set_backlight(self, enabled: bool):
-        if self._bl_pin is None:
-            raise RuntimeError("Backlight control is not available as no BL pin was provided.")
-        self._bl_pin.value(enabled)
@@ -16,6 +16,7 @@
 
 from lcd1602._helper import _Helper
 from lcd1602._datapin import _DataPin
+from lcd1602._sio import _SIO, mem32
 from lcd1602.hd44780cmds import HD44780Cmds
 from lcd1602.hd44780bus import HD44780Bus
 from machine import Pin
@@ -38,6 +39,11 @@ class HD44780Bus8(HD44780Bus):
     Pin BL (backlight control) is optional. When provided, it is assumed to be
     connected to some circuitry that controls the backlight. This circuitry
     should turn the backlight ON when the pin is HIGH and OFF when the pin is LOW.
+
+    On RP2040 boards, when the data pins are on consecutive GPIOs (DB7 to DB0
+    in decreasing order, e.g. [13, 12, 11, 10, 9, 8, 7, 6]), the data pins are written with
+    a single masked write and read with a single read of the GPIO registers,
+    rather than one pin at a time.
     """
 
     def __init__(self, rs: int, e: int, db_7_to_0: list[int], rw: int | None = None, bl: int | None = None):
@@ -72,47 +78,78 @@ class HD44780Bus8(HD44780Bus):
         self._bl_pin = None if bl is None else Pin(bl, value=0, mode=Pin.OUT)
         self._data_pins = [_DataPin(pin) for pin in db_7_to_0]
 
-    def init(self):
+        # When the data pins are on consecutive GPIOs of an RP2040, they are
+        # written and read at once through the SIO registers.
+        self._data_base = _SIO.get_data_base(db_7_to_0)
+        self._data_mask = 0 if self._data_base is None else 0xFF << self._data_base
+
+    def write(self, cmd: int):
+        _Helper.validate_integer_arg("cmd", cmd, min_value=0, max_value=0b1111111111)
+
+        # Command is a ***write*** operation when RW is low / false
+        # Command is a read operation when RW is high / true
+        if cmd & HD44780Cmds.BITMASK_RW:
+            raise ValueError("Not a write command.")
+
+        self._write_unchecked(cmd)
+
+    def read(self, cmd: int) -> int:
+        _Helper.validate_integer_arg("cmd", cmd, min_value=0, max_value=0b1111111111)
+
+        # Command is a write operation when RW is low / false
+        # Command is a ***read*** operation when RW is high / true
+        if not (cmd & HD44780Cmds.BITMASK_RW):
+            raise ValueError("Not a read command.")
+
+        if self._rw_pin is None:
+            raise RuntimeError("Read commands are not supported as no RW pin was provided (bus is write-only).")
+
+        return self._read_unchecked(cmd)
+
+    def set_backlight(self, enabled: bool):
+        if self._bl_pin is None:
+            raise RuntimeError("Backlight control is not available as no BL pin was provided.")
+        self._bl_pin.value(enabled)
+
+    def _init_steps(self):
         # See HD44780 datasheet, page 44, Table 23 for 8-bit initialization procedure.
 
         # 1. Wait for more than 40ms after VCC rises to 2.7V.
         #    As an abundance of caution, we wait 3x more.
-        time.sleep_ms(150)
+        yield 150
 
         # 2. The following instructions put the controller into 8-bit mode
         #    regardless of the current (unknown) mode.
         self.write(0b0000110000)  # Function set (8-bit bus)
-        time.sleep_ms(5)  # Wait for >4.1ms (5ms)
+        yield 5  # Wait for >4.1ms (5ms)
         self.write(0b0000110000)  # Function set (8-bit bus)
-        time.sleep_ms(1)  # Wait for >100us (1ms)
+        yield 1  # Wait for >100us (1ms)
         self.write(0b0000110000)  # Function set (8-bit bus)
-        time.sleep_ms(1)  # Wait for >100us (1ms)
+        yield 1  # Wait for >100us (1ms)
 
         # The controller is now in 8-bit mode. The rest of the initialization
         # procedure is performed by the LCD class.
 
-    def write(self, cmd: int):
-        _Helper.validate_integer_arg("cmd", cmd, min_value=0, max_value=0b1111111111)
-
-        # Command is a ***write*** operation when RW is low / false
-        # Command is a read operation when RW is high / true
-        if cmd & HD44780Cmds.BITMASK_RW:
-            raise ValueError("Not a write command.")
-
+    def _write_unchecked(self, cmd: int):
         # Set command pins
         self._rs_pin.value(cmd & HD44780Cmds.BITMASK_RS)
 
         if self._rw_pin is not None:
             self._rw_pin.value(cmd & HD44780Cmds.BITMASK_RW)
 
-        self._data_pins[0].value(cmd & HD44780Cmds.BITMASK_DB7)
-        self._data_pins[1].value(cmd & HD44780Cmds.BITMASK_DB6)
-        self._data_pins[2].value(cmd & HD44780Cmds.BITMASK_DB5)
-        self._data_pins[3].value(cmd & HD44780Cmds.BITMASK_DB4)
-        self._data_pins[4].value(cmd & HD44780Cmds.BITMASK_DB3)
-        self._data_pins[5].value(cmd & HD44780Cmds.BITMASK_DB2)
-        self._data_pins[6].value(cmd & HD44780Cmds.BITMASK_DB1)
-        self._data_pins[7].value(cmd & HD44780Cmds.BITMASK_DB0)
+        if self._data_base is not None:
+            data = (cmd & 0xFF) << self._data_base
+            mem32[_SIO.GPIO_OUT_SET] = data
+            mem32[_SIO.GPIO_OUT_CLR] = data ^ self._data_mask
+        else:
+            self._data_pins[0].value(cmd & HD44780Cmds.BITMASK_DB7)
+            self._data_pins[1].value(cmd & HD44780Cmds.BITMASK_DB6)
+            self._data_pins[2].value(cmd & HD44780Cmds.BITMASK_DB5)
+            self._data_pins[3].value(cmd & HD44780Cmds.BITMASK_DB4)
+            self._data_pins[4].value(cmd & HD44780Cmds.BITMASK_DB3)
+            self._data_pins[5].value(cmd & HD44780Cmds.BITMASK_DB2)
+            self._data_pins[6].value(cmd & HD44780Cmds.BITMASK_DB1)
+            self._data_pins[7].value(cmd & HD44780Cmds.BITMASK_DB0)
 
         time.sleep_us(HD44780Bus.DELAYUS_TAS)
 
@@ -127,20 +164,9 @@ class HD44780Bus8(HD44780Bus):
         # support waiting nanoseconds or fractions of a unit.
         time.sleep_us(int(HD44780Bus.DELAYUS_TCYCE))
 
-    def read(self, cmd: int) -> int:
-        _Helper.validate_integer_arg("cmd", cmd, min_value=0, max_value=0b1111111111)
-
-        # Command is a write operation when RW is low / false
-        # Command is a ***read*** operation when RW is high / true
-        if not (cmd & HD44780Cmds.BITMASK_RW):
-            raise ValueError("Not a read command.")
-
-        if self._rw_pin is None:
-            raise RuntimeError("Read commands are not supported as no RW pin was provided (bus is write-only).")
-
+    def _read_unchecked(self, cmd: int) -> int:
         # Set data pins to input mode
-        for pin in self._data_pins:
-            pin.mode(Pin.IN)
+        self._set_data_mode(Pin.IN)
 
         # Set command pins
         self._rs_pin.value(cmd & HD44780Cmds.BITMASK_RS)
@@ -155,15 +181,18 @@ class HD44780Bus8(HD44780Bus):
         time.sleep_us(HD44780Bus.DELAYUS_PWEH)
 
         # Read data pins while E is high and the controller is driving these pins.
-        data = 0
-        data = data | self._data_pins[0].value() << 7
-        data = data | self._data_pins[1].value() << 6
-        data = data | self._data_pins[2].value() << 5
-        data = data | self._data_pins[3].value() << 4
-        data = data | self._data_pins[4].value() << 3
-        data = data | self._data_pins[5].value() << 2
-        data = data | self._data_pins[6].value() << 1
-        data = data | self._data_pins[7].value() << 0
+        if self._data_base is not None:
+            data = (mem32[_SIO.GPIO_IN] >> self._data_base) & 0xFF
+        else:
+            data = 0
+            data = data | self._data_pins[0].value() << 7
+            data = data | self._data_pins[1].value() << 6
+            data = data | self._data_pins[2].value() << 5
+            data = data | self._data_pins[3].value() << 4
+            data = data | self._data_pins[4].value() << 3
+            data = data | self._data_pins[5].value() << 2
+            data = data | self._data_pins[6].value() << 1
+            data = data | self._data_pins[7].value() << 0
 
         # Set E low
         self._e_pin.off()
@@ -173,12 +202,15 @@ class HD44780Bus8(HD44780Bus):
         time.sleep_us(int(HD44780Bus.DELAYUS_TCYCE))
 
         # Set data pins back to output mode
-        for pin in self._data_pins:
-            pin.mode(Pin.OUT)
+        self._set_data_mode(Pin.OUT)
 
         return data
 
-    def set_backlight(self, enabled: bool):
-        if self._bl_pin is None:
-            raise RuntimeError("Backlight control is not available as no BL pin was provided.")
-        self._bl_pin.value(enabled)
+    def _set_data_mode(self, mode: int):
+        # Switches the data pins to input or output mode. With the SIO registers,
+        # all data pins are switched at once through the output enable register.
+        if self._data_base is not None:
+            mem32[_SIO.GPIO_OE_SET if mode == Pin.OUT else _SIO.GPIO_OE_CLR] = self._data_mask
+        else:
+            for pin in self._data_pins:
+                pin.mode(mode)
@@ -0,0 +1,103 @@
+# This file is part of the LCD1602 MicroPython LCD library
+# Copyright (C) 2023 Pascal Jobin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from lcd1602._helper import _Helper
+from lcd1602.hd44780buspio import HD44780BusPIO
+
+
+class HD44780BusPIO4(HD44780BusPIO):
+    """Provides a PIO-driven 4-bit bus implementation for the HD44780 controller
+
+    This bus requires the following LCD pins to be connected:
+
+        * RS
+        * E
+        * DB7 to DB4, on consecutive GPIOs (e.g. DB7 on GP7 and DB4 on GP4)
+
+    This bus is only available on RP2040 boards. It is write-only. Pin RW is
+    optional: when provided, it is kept low. RW MUST be connected to ground if
+    it is not provided so the controller is always in write mode.
+
+    Pin BL (backlight control) is optional. When provided, it is assumed to be
+    connected to some circuitry that controls the backlight. This circuitry
+    should turn the backlight ON when the pin is HIGH and OFF when the pin is LOW.
+    """
+
+    def __init__(
+        self,
+        rs: int,
+        e: int,
+        db_7_to_4: list[int],
+        rw: int | None = None,
+        bl: int | None = None,
+        sm_id: int = 0,
+    ):
+        """Initializes a new instance of the HD44780BusPIO4 class
+
+        Args:
+            rs (int): The pin number of the RS pin.
+            e (int): The pin number of the E pin.
+            db_7_to_4 (list[int]): The pin numbers of the DB7 to DB4 pins (consecutive GPIOs).
+            rw (int, optional): The pin number of the RW pin. Defaults to None.
+            bl (int, optional): The pin number of the BL (backlight control) pin. Defaults to None.
+            sm_id (int, optional): The id of the PIO state machine (0 to 7). Defaults to 0.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range --OR-- the data pins are not consecutive.
+        """
+        _Helper.validate_integer_arg("rs", rs)
+        _Helper.validate_integer_arg("e", e)
+        _Helper.validate_integer_list_arg("db_7_to_4", db_7_to_4, length=4)
+
+        if rw is not None:
+            _Helper.validate_integer_arg("rw", rw)
+
+        if bl is not None:
+            _Helper.validate_integer_arg("bl", bl)
+
+        super().__init__(4, rs, e, db_7_to_4, rw, bl, sm_id)
+
+    def _init_steps(self):
+        # See HD44780 datasheet, page 46, Table 24 for 4-bit initialization procedure.
+
+        # 1. Wait for more than 40ms after VCC rises to 2.7V.
+        #    As an abundance of caution, we wait 3x more.
+        yield 150
+
+        # 2. The following instructions put the controller into 8-bit mode
+        #    regardless of the current (unknown) mode. The bus length is contained
+        #    in the high nibble of the command, so a single word (nibble) is sent.
+        self._write_nibble(0b0011)  # Function set (8-bit bus)
+        yield 5  # Wait for >4.1ms (5ms)
+        self._write_nibble(0b0011)  # Function set (8-bit bus)
+        yield 1  # Wait for >100us (1ms)
+        self._write_nibble(0b0011)  # Function set (8-bit bus)
+        yield 1  # Wait for >100us (1ms)
+
+        # 3. We are guaranteed that the controller is in 8-bit mode now. We can
+        #    switch to 4-bit mode. As the controller is in 8-bit mode, it expects
+        #    a single write operation.
+        self._write_nibble(0b0010)  # Function set (4-bit bus)
+        yield 1  # Wait for >100us (1ms)
+
+        # The controller is now in 4-bit mode. The rest of the initialization
+        # procedure is performed by the LCD class.
+
+    def _write_nibble(self, nibble: int):
+        # Pushes a single word (RS low, no extra wait) into the FIFO
+        self._sm.put(nibble)
+        self._wait_for_strobe()
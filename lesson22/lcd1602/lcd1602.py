@@ -14,6 +14,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from array import array
 import utime as time
 from lcd1602._helper import _Helper
 from lcd1602.hd44780cmds import HD44780Cmds
@@ -52,6 +53,25 @@ class LCD1602:
     _EXECTIMEUS_LONG = 2161  # 1.52ms @ 270KHz, 2.16ms @ 190KHz
     _EXECTIMEUS_SHORT = 53  # 37us @ 270KHz, 52us @ 190KHz
 
+    # ######################################################################## #
+    # LCD commands execution time calibration
+    #
+    # Most modules run much faster than the minimum fOSC. When the bus supports
+    # read operations, `calibrate()` measures the execution time of a long
+    # command (HOME) using the busy flag. As all execution times are inversely
+    # proportional to fOSC, the short execution time is derived from the long
+    # one using the datasheet ratio (37us / 1.52ms). A safety margin is added to
+    # both times to cover variations of fOSC with temperature and voltage.
+    #
+    # The measured time is bounded by the execution time at the maximum fOSC
+    # supported by the HD44780 (350KHz as per page 49) and at the minimum fOSC.
+    # ######################################################################## #
+    _EXECTIMEUS_LONG_AT_270KHZ = 1520
+    _EXECTIMEUS_SHORT_AT_270KHZ = 37
+    _EXECTIMEUS_LONG_MIN = 1173  # 1.52ms @ 270KHz, 1.17ms @ 350KHz
+    _CALIBRATION_MARGIN_PERCENT = 10
+    _CALIBRATION_NUM_SAMPLES = 3
+
     # ######################################################################## #
     # LCD DDRAM address offsets and line length
     #
@@ -66,6 +86,40 @@ class LCD1602:
     _LINE_ADDR_OFFSETS = {0: 0x00, 1: 0x40}
     _LINE_LENGTH = 40
 
+    # ######################################################################## #
+    # Shadow DDRAM and CGRAM (buffered mode)
+    #
+    # See `set_buffering_on()` for more details about buffered mode.
+    #
+    # Both DDRAM lines are mirrored in a single array of 80 cells where the cell
+    # index is `line * 40 + col`. This matches the way the address counter moves
+    # in 2-line mode: it goes from the end of the first line (27H) to the start
+    # of the second line (40H), then from the end of the second line (67H) back
+    # to the start of the first line (00H). CGRAM is mirrored as 8 characters of
+    # 8 bytes each, in CGRAM address order.
+    # ######################################################################## #
+    _DDRAM_SIZE = 80
+
+    # Types of the codes accepted without validating them one by one (see
+    # `write_codes()`). A tuple written in the call would be built on each call.
+    _BYTES_TYPES = (bytes, bytearray, memoryview)
+    _CGRAM_SIZE = 64
+
+    # ######################################################################## #
+    # Text encoding
+    #
+    # Characters are translated to LCD character codes using a 256-entry table
+    # for Latin-1 characters (Unicode code points 0 to 255) and a dictionary for
+    # mapped characters outside of this range. Unmapped characters outside of
+    # this range are replaced with a blank (20H, see HD44780 datasheet, page 26).
+    #
+    # Recently encoded strings are kept in a small LRU cache, as the same labels
+    # are generally written over and over again. Only short strings are cached.
+    # ######################################################################## #
+    _BLANK_CHARCODE = 0x20
+    _TEXT_CACHE_SIZE = 16
+    _TEXT_CACHE_MAX_LENGTH = 40
+
     def __init__(self, bus: HD44780Bus):
         """Creates a new LCD1602 instance
 
@@ -89,11 +143,45 @@ class LCD1602:
         self._bus = bus
 
         # These fields are initialiazed in init()
+        self._charcode_table = bytearray(range(256))
         self._character_map = {}
+        self._clear_text_cache()
         self._display_control = 0
         self._entry_mode = 0
         self._function_set = 0
 
+        # Commands execution times. See `calibrate()`.
+        self._exectimeus_long = LCD1602._EXECTIMEUS_LONG
+        self._exectimeus_short = LCD1602._EXECTIMEUS_SHORT
+        self._is_calibrated = False
+
+        # Deferred wait. The last command sent to the LCD and the time it was
+        # sent at, or None when the LCD is known to be ready.
+        self._is_deferred = False
+        self._pending_cmd = None
+        self._pending_since = 0
+
+        # Address counter, as tracked in software. None when unknown.
+        self._address_counter = None
+        self._is_cgram_selected = False
+
+        # Buffered mode. The frames hold what the caller has drawn while the
+        # shadows hold what the controller's memory is known to contain.
+        self._is_buffered = False
+        self._ddram_frame = bytearray(b" " * LCD1602._DDRAM_SIZE)
+        self._ddram_shadow = bytearray(b" " * LCD1602._DDRAM_SIZE)
+        self._cgram_frame = bytearray(LCD1602._CGRAM_SIZE)
+        self._cgram_shadow = bytearray(LCD1602._CGRAM_SIZE)
+
+        # Commands sent by `_write_codes()` (a set address and a whole DDRAM
+        # of data writes), handed to the bus through views of the used length.
+        # Views are created on first use of a length and reused afterwards, so
+        # writing codes does not build a list or a slice of commands.
+        self._code_buffer = bytearray(1)
+        self._cmd_buffer = array("H", [0] * (LCD1602._DDRAM_SIZE + 1))
+        self._cmd_buffer_mv = memoryview(self._cmd_buffer)
+        self._cmd_views = [None] * (len(self._cmd_buffer) + 1)
+
     @classmethod
     def begin_4bit(
         cls,
@@ -185,7 +273,7 @@ class LCD1602:
         return lcd
 
     @classmethod
-    def begin_i2c(cls, bus_id: int, scl: int, sda: int, addr: int | None = None):
+    def begin_i2c(cls, bus_id: int, scl: int, sda: int, addr: int | None = None, freq: int = 400000):
         """Creates and initializes an instance for an I2C bus
 
         This method automatically calls `init()` after creating the LCD instance.
@@ -196,6 +284,7 @@ class LCD1602:
             scl (int): The pin number of the scl pin.
             sda (int): The pin number of the sda pin.
             addr (int, optional): The I2C address of the LCD. When not specified, the LCD is expected to be the only device on the I2C bus. Defaults to None.
+            freq (int, optional): The I2C clock frequency in Hz. Defaults to 400000.
 
         Raises:
             TypeError: One of the arguments is of the wrong type.
@@ -208,21 +297,93 @@ class LCD1602:
         _Helper.validate_integer_arg("scl", scl)
         _Helper.validate_integer_arg("sdc", sda)
 
+        _Helper.validate_integer_arg("freq", freq, min_value=1)
+
         if addr is not None:
             _Helper.validate_integer_arg("addr", addr, min_value=0)
 
-        lcd = cls(HD44780BusI2C(bus_id, scl=scl, sda=sda, addr=addr))
+        lcd = cls(HD44780BusI2C(bus_id, scl=scl, sda=sda, addr=addr, freq=freq))
         lcd.init()
         return lcd
 
+    def calibrate(self) -> tuple[int, int]:
+        """Measures the execution time of LCD commands
+
+        IMPORTANT: The availability of this function is dependent on the LCD bus
+        supporting read operations. The 4-bit and 8-bit buses support read
+        operations only when the RW pin is supplied. The I2C bus always supports
+        read operations.
+
+        By default, the library waits for the worst-case execution time of each
+        command, which corresponds to the slowest HD44780 clock (190KHz). Most
+        modules run near 270KHz. This method measures the actual speed of the
+        controller using the busy flag and adjusts the execution times
+        accordingly (with a safety margin). Once calibrated, commands are no
+        longer followed by busy flag polling: the library waits for the
+        calibrated execution time instead.
+
+        This method is called by `init()` when the bus supports read operations.
+        It can be called again at any time to recalibrate (for example, after a
+        significant change of temperature). The measured times can be applied to
+        another instance driving the same module over a write-only bus using
+        `set_execution_times()`.
+
+        IMPORTANT: Calibration sends the HOME command to the LCD. The cursor is
+        moved to the home position and scrolling is reset.
+
+        Returns:
+            tuple[int, int]: The calibrated execution times in microseconds, as a tuple (short, long).
+
+        Raises:
+            RuntimeError: The command is not supported. The bus does not support read operations.
+        """
+        if not self._bus.can_read:
+            raise RuntimeError("Command is not supported. Bus does not support read operations.")
+
+        self._wait_until_ready()
+
+        measured_long = 0
+        for _ in range(0, LCD1602._CALIBRATION_NUM_SAMPLES):
+            self._bus._write_unchecked(HD44780Cmds.C02_HOME)
+            started_at = time.ticks_us()
+            while self._bus._read_unchecked(HD44780Cmds.C09_READ_BUSY_FLAG_AND_ADDR) & HD44780Cmds.BITMASK_DB7:
+                if time.ticks_diff(time.ticks_us(), started_at) >= LCD1602._EXECTIMEUS_LONG:
+                    break
+            measured_long = max(measured_long, time.ticks_diff(time.ticks_us(), started_at))
+
+        self._address_counter = 0
+        self._is_cgram_selected = False
+
+        measured_long = min(max(measured_long, LCD1602._EXECTIMEUS_LONG_MIN), LCD1602._EXECTIMEUS_LONG)
+        exectimeus_long = measured_long * (100 + LCD1602._CALIBRATION_MARGIN_PERCENT) // 100 + 1
+        # fmt: off
+        exectimeus_short = exectimeus_long * LCD1602._EXECTIMEUS_SHORT_AT_270KHZ \
+            // LCD1602._EXECTIMEUS_LONG_AT_270KHZ + 1
+        # fmt: on
+
+        self._exectimeus_long = min(exectimeus_long, LCD1602._EXECTIMEUS_LONG)
+        self._exectimeus_short = min(exectimeus_short, LCD1602._EXECTIMEUS_SHORT)
+        self._is_calibrated = True
+        return (self._exectimeus_short, self._exectimeus_long)
+
     def clear(self):
         """Clears the display and sets the cursor position to home
 
         This command writes 20H (blank) to all DDRAM addresses (not only the
         ones that are displayed). It also resets any scrolling and sets the
         display entry mode to left to right.
+
+        In buffered mode, only the frame buffer is cleared. The display is
+        updated on the next call to `flush()`, without resetting scrolling nor
+        the cursor position.
         """
-        self.execute_command(HD44780Cmds.C01_CLEAR)
+        self._ddram_frame[:] = b" " * LCD1602._DDRAM_SIZE
+        if self._is_buffered:
+            return
+
+        self._execute_unchecked(HD44780Cmds.C01_CLEAR)
+        self._entry_mode = self._entry_mode | HD44780Cmds.C03_ARG_LEFT_TO_RIGHT
+        self._ddram_shadow[:] = self._ddram_frame
 
     def create_character(self, lcdcharcode: int, bitmap: list[int]):
         """Creates a custom character
@@ -239,6 +400,11 @@ class LCD1602:
         necessary to select the Data Display RAM (DDRAM) using the `set_cursor_position()`
         method before attempting any read or write operation.
 
+        Nothing is sent to the LCD when the custom character already holds the
+        given bitmap. In buffered mode, the bitmap is stored in the frame buffer
+        and uploaded to the CGRAM on the next call to `flush()` (only if it has
+        changed).
+
         Args:
             lcdcharcode (int): The custom character code (0 to 7).
             bitmap (list[int]): The character's bitmap represented as a list of eight 5-bit integers.
@@ -253,11 +419,21 @@ class LCD1602:
         # As per datasheet, page 19, Table 5
         # The CGRAM address is equals to the character code shifted by 3 bits to the left.
         custom_char_addr = lcdcharcode << 3
-        self.execute_command(HD44780Cmds.C07_SET_CGRAM_ADDRESS | custom_char_addr)
+        bitmap = bytes(bitmap)
+        self._cgram_frame[custom_char_addr : custom_char_addr + 8] = bitmap
+        if self._is_buffered or self._cgram_shadow[custom_char_addr : custom_char_addr + 8] == bitmap:
+            return
 
         # Write bitmap to the CGRAM.
+        cmds = [HD44780Cmds.C07_SET_CGRAM_ADDRESS | custom_char_addr]
         for byte in bitmap:
-            self.execute_command(HD44780Cmds.C10_WRITE_DATA | byte)
+            cmds.append(HD44780Cmds.C10_WRITE_DATA | byte)
+        self._execute_many(cmds)
+
+        self._cgram_shadow[custom_char_addr : custom_char_addr + 8] = bitmap
+        step = 1 if self._entry_mode & HD44780Cmds.C03_ARG_LEFT_TO_RIGHT else -1
+        self._address_counter = (custom_char_addr + 8 * step) & 0x3F
+        self._is_cgram_selected = True
 
     def execute_command(self, cmd: int) -> int | None:
         """Executes an LCD command
@@ -286,38 +462,53 @@ class LCD1602:
         if not self.is_command_supported(cmd):
             raise RuntimeError("Command is not supported.")
 
-        # Execute the command. The command is a read operation if the RW bit is set.
-        is_read_op = cmd & HD44780Cmds.BITMASK_RW
-        data = self._bus.read(cmd) if is_read_op else self._bus.write(cmd)
+        data = self._execute_unchecked(cmd)
 
-        # The HD44780 datasheet, page 24-25, provides two execution times: a
-        # long one for clear and home command and a short one for all other commands
-        is_long_cmd = (cmd == HD44780Cmds.C01_CLEAR) or (cmd == HD44780Cmds.C02_HOME)
-        exec_delay = LCD1602._EXECTIMEUS_LONG if is_long_cmd else LCD1602._EXECTIMEUS_SHORT
+        # The entry mode and display control registers are mirrored in
+        # software. The entry mode drives the address counter tracking.
+        if cmd & 0b1111111100 == HD44780Cmds.C03_ENTRY_MODE_SET:
+            self._entry_mode = cmd
+        elif cmd & 0b1111111000 == HD44780Cmds.C04_DISPLAY_CONTROL:
+            self._display_control = cmd
+        return data
 
-        # If the bus supports reading, we use the busy flag to determine when
-        # the command is done executing. Otherwise, we fallback on a fixed delay.
-        if self._bus.can_read:
-            busy_flag_check_started_at = time.ticks_ms()
+    def flush(self, force: bool = False):
+        """Sends the changes made to the frame buffer to the display
 
-            while True:
-                # Busy flag is db7. When high, the LCD is busy.
-                is_busy = self._bus.read(HD44780Cmds.C09_READ_BUSY_FLAG_AND_ADDR) & HD44780Cmds.BITMASK_DB7
-                if not is_busy:
-                    break
+        Only the characters and custom characters that differ from what the
+        display is known to contain are sent. Each run of consecutive changed
+        characters costs one set-address command followed by one data write per
+        character, as the controller increments its address counter after each
+        write. Custom characters are uploaded before text so that new glyphs are
+        in place when they become visible.
 
-                # We could enter in an infinite loop if the LCD is not responding.
-                # This conditional branch prevents this from happening by checking
-                # if we have exceeded the expected fixed delay for the command.
-                # If so, we print an error and break the loop.
-                if abs(time.ticks_diff(busy_flag_check_started_at, time.ticks_ms())) >= exec_delay:
-                    print("LCD ERROR! Cannot read busy flag.")
-                    break
-        else:
-            # Bus does not support reading. Using fixed delay
-            time.sleep_us(exec_delay)
+        The frame buffer tracks the changes made through the high-level methods
+        of this class only. When low-level commands sent with `execute_command()`
+        have altered the display memory, use `force=True` to rewrite the whole
+        display memory.
 
-        return data
+        This method does nothing useful when buffered mode is off, as the
+        display is then always up to date.
+
+        Args:
+            force (bool, optional): True to rewrite the whole DDRAM and CGRAM. Defaults to False.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+        """
+        _Helper.validate_boolean_arg("force", force)
+
+        self._execute_many(self._get_flush_cmds(force))
+
+    def get_execution_times(self) -> tuple[int, int]:
+        """Gets the execution times used to wait for LCD commands to complete
+
+        See `calibrate()` for more details.
+
+        Returns:
+            tuple[int, int]: The execution times in microseconds, as a tuple (short, long).
+        """
+        return (self._exectimeus_short, self._exectimeus_long)
 
     def get_cursor_position(self) -> tuple[int, int]:
         """Gets the cursor position as a tuple (col, line)
@@ -325,7 +516,10 @@ class LCD1602:
         IMPORTANT: The availability of this function is dependent on the LCD bus
         supporting read operations. The 4-bit and 8-bit buses support read
         operations only when the RW pin is supplied. The I2C bus always supports
-        read operations.
+        read operations. However, the library keeps track of the cursor position
+        in most cases (the position is unknown after some low-level commands
+        are sent with `execute_command()`). When the position is known, it is
+        returned without any bus operation, whatever the bus.
 
         Column and line numbers are 0-based. The LCD supports 40 columns (numbered
         from 0 to 39) and 2 lines (numbered from 0 to 1). However, only 16
@@ -339,10 +533,14 @@ class LCD1602:
         Raises:
             RuntimeError: The command is not supported. The bus does not support read operations.
         """
+        if self._address_counter is not None and not self._is_cgram_selected:
+            cell_idx = LCD1602._addr_to_cell(self._address_counter)
+            return (cell_idx % LCD1602._LINE_LENGTH, cell_idx // LCD1602._LINE_LENGTH)
+
         if not self._bus.can_read:
             raise RuntimeError("Command is not supported. Bus does not support read operations.")
 
-        data = self.execute_command(HD44780Cmds.C09_READ_BUSY_FLAG_AND_ADDR)
+        data = self._execute_unchecked(HD44780Cmds.C09_READ_BUSY_FLAG_AND_ADDR)
         assert data is not None
 
         # db7 is the busy flag indicator. We ignore it
@@ -368,7 +566,7 @@ class LCD1602:
 
     def home(self):
         """Sets the cursor position to (0, 0) and resets scrolling"""
-        self.execute_command(HD44780Cmds.C02_HOME)
+        self._execute_unchecked(HD44780Cmds.C02_HOME)
 
     def init(self):
         """Initializes the display
@@ -389,53 +587,8 @@ class LCD1602:
             * Character mappings have been cleared
             * Backlight is ON (if the bus supports backlight control)
         """
-        # 1. Clear character mappings
-        self._character_map = {}
-
-        # 2. Initialize the bus
-        self._bus.init()
-
-        # 3. Function set
-        # fmt: off
-        self._function_set = HD44780Cmds.C06_FUNCTION_SET \
-            | HD44780Cmds.C06_ARG_2LINES_DISPLAY \
-            | HD44780Cmds.C06_ARG_5X8_DOTS \
-            | (HD44780Cmds.C06_ARG_4BIT_BUS if self._bus.width == 4 else HD44780Cmds.C06_ARG_8BIT_BUS)
-        self.execute_command(self._function_set)
-        # fmt: on
-
-        # 4. Clear display
-        self.execute_command(HD44780Cmds.C01_CLEAR)
-
-        # 5. Entry mode set
-        # fmt: off
-        self._entry_mode = HD44780Cmds.C03_ENTRY_MODE_SET \
-            | HD44780Cmds.C03_ARG_LEFT_TO_RIGHT \
-            | HD44780Cmds.C03_ARG_AUTOSCROLL_OFF
-        self.execute_command(self._entry_mode)
-        # fmt: on
-
-        # 6. Display control
-         # fmt: off
-        self._display_control = (
-            HD44780Cmds.C04_DISPLAY_CONTROL
-            | HD44780Cmds.C04_ARG_DISPLAY_ON
-            | HD44780Cmds.C04_ARG_CURSOR_OFF
-            | HD44780Cmds.C04_ARG_CURSOR_BLINK_OFF
-        )
-        self.execute_command(self._display_control)
-        # fmt: on
-
-        # 7. Clear CGRAM (custom chars)
-        for i in range(0, 8):
-            self.create_character(0, [0, 0, 0, 0, 0, 0, 0, 0])
-
-        # 8. Set cursor position to home
-        self.home()
-
-        # 9. Turn backlight on
-        if self._bus.can_control_backlight:
-            self.set_backlight_on()
+        for delay_ms in self._init_steps():
+            time.sleep_ms(delay_ms)
 
     def is_command_supported(self, cmd: int) -> bool:
         """Indicates whether an LCD command is supported or not
@@ -486,7 +639,13 @@ class LCD1602:
         """
         _Helper.validate_string_arg("char", char, min_length=1, max_length=1)
         _Helper.validate_integer_arg("lcdcharcode", lcdcharcode, min_value=0, max_value=0xFF)
-        self._character_map[char] = lcdcharcode
+
+        codepoint = ord(char)
+        if codepoint <= 0xFF:
+            self._charcode_table[codepoint] = lcdcharcode
+        else:
+            self._character_map[char] = lcdcharcode
+        self._clear_text_cache()
 
     def move_cursor_left(self):
         """Moves the cursor left by one position
@@ -502,7 +661,7 @@ class LCD1602:
             | HD44780Cmds.C05_ARG_CURSOR \
             | HD44780Cmds.C05_ARG_LEFT
         # fmt: on
-        self.execute_command(cmd)
+        self._execute_unchecked(cmd)
 
     def move_cursor_right(self):
         """Moves the cursor to the right by one position
@@ -518,7 +677,7 @@ class LCD1602:
             | HD44780Cmds.C05_ARG_CURSOR \
             | HD44780Cmds.C05_ARG_RIGHT
         # fmt: on
-        self.execute_command(cmd)
+        self._execute_unchecked(cmd)
 
     def read_code(self, col: int, line: int) -> int:
         """Reads an LCD character code at a given position
@@ -553,7 +712,7 @@ class LCD1602:
             raise RuntimeError("Command is not supported. Bus does not support read operations.")
 
         self.set_cursor_position(col, line)
-        data = self.execute_command(HD44780Cmds.C11_READ_DATA)
+        data = self._execute_unchecked(HD44780Cmds.C11_READ_DATA)
         assert data is not None
         return data
 
@@ -568,7 +727,7 @@ class LCD1602:
             | HD44780Cmds.C05_ARG_CONTENT \
             | HD44780Cmds.C05_ARG_RIGHT # Scrolling left move content to the right
         # fmt: on
-        self.execute_command(cmd)
+        self._execute_unchecked(cmd)
 
     def scroll_display_right(self):
         """Scrolls the entire display right by one position
@@ -581,7 +740,7 @@ class LCD1602:
             | HD44780Cmds.C05_ARG_CONTENT \
             | HD44780Cmds.C05_ARG_LEFT
         # fmt: on
-        self.execute_command(cmd)
+        self._execute_unchecked(cmd)
 
     def set_autoscroll_on(self):
         """Turns auto-scroll ON
@@ -592,12 +751,12 @@ class LCD1602:
         the same time.
         """
         self._entry_mode = self._entry_mode | HD44780Cmds.C03_ARG_AUTOSCROLL_ON
-        self.execute_command(self._entry_mode)
+        self._execute_unchecked(self._entry_mode)
 
     def set_autoscroll_off(self):
         """Turns auto-scroll OFF"""
         self._entry_mode = self._entry_mode & ~HD44780Cmds.C03_ARG_AUTOSCROLL_ON
-        self.execute_command(self._entry_mode)
+        self._execute_unchecked(self._entry_mode)
 
     def set_backlight_on(self):
         """Turns the LCD backlight ON
@@ -610,6 +769,7 @@ class LCD1602:
         """
         if not self._bus.can_control_backlight:
             raise RuntimeError("Operation is not supported. Bus does not support backlight control.")
+        self._wait_until_ready()
         self._bus.set_backlight(True)
 
     def set_backlight_off(self):
@@ -623,8 +783,34 @@ class LCD1602:
         """
         if not self._bus.can_control_backlight:
             raise RuntimeError("Operation is not supported. Bus does not support backlight control.")
+        self._wait_until_ready()
         self._bus.set_backlight(False)
 
+    def set_buffering_on(self):
+        """Turns buffered mode ON
+
+        In buffered mode, the methods writing text, character codes and custom
+        characters (as well as `clear()`) only update an in-memory frame buffer
+        mirroring the display memory. Nothing is sent to the display until
+        `flush()` is called. `flush()` then sends only the characters that have
+        changed, which greatly reduces bus traffic when a few characters change
+        between two updates (for example, a dashboard refreshing some digits).
+
+        All other methods (cursor, scrolling, display control, etc.) still take
+        effect immediately.
+        """
+        self._is_buffered = True
+
+    def set_buffering_off(self):
+        """Turns buffered mode OFF
+
+        Pending changes are flushed to the display before buffered mode is
+        turned off.
+        """
+        if self._is_buffered:
+            self.flush()
+        self._is_buffered = False
+
     def set_cursor_position(self, col: int, line: int):
         """Sets the cursor position
 
@@ -650,7 +836,11 @@ class LCD1602:
         _Helper.validate_integer_arg("line", line, min_value=0, max_value=len(LCD1602._LINE_ADDR_OFFSETS), inclusive=False)
         # fmt: on
         addr = LCD1602._LINE_ADDR_OFFSETS[line] + col
-        self.execute_command(HD44780Cmds.C08_SET_DDRAM_ADDRESS | addr)
+
+        # Nothing to do when the address counter is already set to this address
+        if addr == self._address_counter and not self._is_cgram_selected:
+            return
+        self._execute_unchecked(HD44780Cmds.C08_SET_DDRAM_ADDRESS | addr)
 
     def set_cursor_type(self, cursor_type: int):
         """Sets the cursor type
@@ -675,39 +865,85 @@ class LCD1602:
         if cursor_type == LCDCursor.NONE:
             self._display_control = self._display_control & ~HD44780Cmds.C04_ARG_CURSOR_ON
             self._display_control = self._display_control & ~HD44780Cmds.C04_ARG_CURSOR_BLINK_ON
-            self.execute_command(self._display_control)
+            self._execute_unchecked(self._display_control)
         elif cursor_type == LCDCursor.UNDERSCORE:
             self._display_control = self._display_control | HD44780Cmds.C04_ARG_CURSOR_ON
             self._display_control = self._display_control & ~HD44780Cmds.C04_ARG_CURSOR_BLINK_ON
-            self.execute_command(self._display_control)
+            self._execute_unchecked(self._display_control)
         elif cursor_type == LCDCursor.BLINKING_BLOCK:
             self._display_control = self._display_control & ~HD44780Cmds.C04_ARG_CURSOR_ON
             self._display_control = self._display_control | HD44780Cmds.C04_ARG_CURSOR_BLINK_ON
-            self.execute_command(self._display_control)
+            self._execute_unchecked(self._display_control)
         elif cursor_type == LCDCursor.COMBINED:
             self._display_control = self._display_control | HD44780Cmds.C04_ARG_CURSOR_ON
             self._display_control = self._display_control | HD44780Cmds.C04_ARG_CURSOR_BLINK_ON
-            self.execute_command(self._display_control)
+            self._execute_unchecked(self._display_control)
+
+    def set_deferred_wait_on(self):
+        """Turns deferred wait ON
+
+        By default, each command returns once the LCD is done executing it.
+        When deferred wait is on, commands return as soon as they have been
+        sent. The wait for the command to complete happens at the start of the
+        next operation on the LCD, only for the part of the execution time that
+        has not elapsed yet. This lets the program do useful work (formatting
+        text, reading sensors, etc.) while the LCD executes commands, which is
+        especially valuable after the CLEAR and HOME commands (1.52ms at 270KHz).
+        """
+        self._is_deferred = True
+
+    def set_deferred_wait_off(self):
+        """Turns deferred wait OFF
+
+        This method returns once the last command sent to the LCD has completed.
+        """
+        self._is_deferred = False
+        self._wait_until_ready()
 
     def set_display_on(self):
         """Turns the display ON. This does not affect the LCD backlight"""
         self._display_control = self._display_control | HD44780Cmds.C04_ARG_DISPLAY_ON
-        self.execute_command(self._display_control)
+        self._execute_unchecked(self._display_control)
 
     def set_display_off(self):
         """Turns the display OFF. This does not affect the LCD backlight"""
         self._display_control = self._display_control & ~HD44780Cmds.C04_ARG_DISPLAY_ON
-        self.execute_command(self._display_control)
+        self._execute_unchecked(self._display_control)
+
+    def set_execution_times(self, short_us: int, long_us: int):
+        """Sets the execution times used to wait for LCD commands to complete
+
+        This method makes it possible to use execution times measured with
+        `calibrate()` on a bus that does not support read operations (for
+        example, a 4-bit bus without the RW pin connected to the board driving
+        the same LCD module). Once set, these times are used instead of the busy
+        flag, even when the bus supports read operations.
+
+        IMPORTANT: Execution times that are too short will corrupt the display.
+
+        Args:
+            short_us (int): The execution time of all commands but CLEAR and HOME, in microseconds.
+            long_us (int): The execution time of the CLEAR and HOME commands, in microseconds.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range.
+        """
+        _Helper.validate_integer_arg("short_us", short_us, min_value=1)
+        _Helper.validate_integer_arg("long_us", long_us, min_value=1)
+        self._exectimeus_short = short_us
+        self._exectimeus_long = long_us
+        self._is_calibrated = True
 
     def set_left_to_right(self):
         """Sets the entry mode to left to right"""
         self._entry_mode = self._entry_mode | HD44780Cmds.C03_ARG_LEFT_TO_RIGHT
-        self.execute_command(self._entry_mode)
+        self._execute_unchecked(self._entry_mode)
 
     def set_right_to_left(self):
         """Sets the entry mode to right to left"""
         self._entry_mode = self._entry_mode & ~HD44780Cmds.C03_ARG_LEFT_TO_RIGHT
-        self.execute_command(self._entry_mode)
+        self._execute_unchecked(self._entry_mode)
 
     def unmap_character(self, char: str):
         """Unmaps a Unicode character previously mapped using the `map_character()` function
@@ -720,8 +956,13 @@ class LCD1602:
             ValueError: One of the arguments is out of range.
         """
         _Helper.validate_string_arg("char", char, min_length=1, max_length=1)
-        if char in self._character_map:
+
+        codepoint = ord(char)
+        if codepoint <= 0xFF:
+            self._charcode_table[codepoint] = codepoint
+        elif char in self._character_map:
             del self._character_map[char]
+        self._clear_text_cache()
 
     def write_code(self, col: int, line: int, lcdcharcode: int):
         """Writes a single LCD character code at a given position
@@ -752,8 +993,8 @@ class LCD1602:
         _Helper.validate_integer_arg("lcdcharcode", lcdcharcode, min_value=0, max_value=0xFF)
         # fmt: on
 
-        self.set_cursor_position(col, line)
-        self.execute_command(HD44780Cmds.C10_WRITE_DATA | lcdcharcode)
+        self._code_buffer[0] = lcdcharcode
+        self._write_codes(col, line, self._code_buffer)
 
     def write_codes(self, col: int, line: int, lcdcharcodes: list[int]):
         """Writes a list of LCD char codes starting at a given position
@@ -769,10 +1010,14 @@ class LCD1602:
         about the character codes natively supported by the HD44780 display
         controller, please refer to the HD44780 Datasheet, page 18-19.
 
+        The codes can also be given as a bytes-like object (bytes, bytearray or
+        memoryview), such as a window over a preallocated buffer. The codes are
+        then not validated one by one, as bytes are always in range.
+
         Args:
             col (int): The column index (0 to 39).
             line (int): The line index (0 or 1).
-            lcdcharcodes (list[int]): A list of LCD character codes to write.
+            lcdcharcodes (list[int] | bytes | bytearray | memoryview): The LCD character codes to write.
 
         Raises:
             TypeError: One of the arguments is of the wrong type.
@@ -781,12 +1026,11 @@ class LCD1602:
         # fmt: off
         _Helper.validate_integer_arg("col", col, min_value=0, max_value=LCD1602._LINE_LENGTH, inclusive=False)
         _Helper.validate_integer_arg("line", line, min_value=0, max_value=len(LCD1602._LINE_ADDR_OFFSETS), inclusive=False)
-        _Helper.validate_integer_list_arg("lcdcharcodes", lcdcharcodes, min_value=0, max_value=0xFF)
+        if not isinstance(lcdcharcodes, LCD1602._BYTES_TYPES):
+            _Helper.validate_integer_list_arg("lcdcharcodes", lcdcharcodes, min_value=0, max_value=0xFF)
         # fmt: on
 
-        self.set_cursor_position(col, line)
-        for byte in lcdcharcodes:
-            self.execute_command(HD44780Cmds.C10_WRITE_DATA | byte)
+        self._write_codes(col, line, lcdcharcodes)
 
     def write_text(self, col: int, line: int, text: str):
         """Writes text starting at a given position
@@ -824,16 +1068,350 @@ class LCD1602:
         _Helper.validate_string_arg("text", text)
         # fmt: on
 
-        self.set_cursor_position(col, line)
+        self._write_codes(col, line, self._encode_text(text))
+
+    @staticmethod
+    def _addr_to_cell(addr: int) -> int:
+        # Converts a DDRAM address to a frame buffer cell index
+        return (addr >> 6) * LCD1602._LINE_LENGTH + (addr & 0x3F)
+
+    @staticmethod
+    def _cell_to_addr(idx: int) -> int:
+        # Converts a frame buffer cell index to a DDRAM address
+        idx = idx % LCD1602._DDRAM_SIZE
+        return LCD1602._LINE_ADDR_OFFSETS[idx // LCD1602._LINE_LENGTH] + idx % LCD1602._LINE_LENGTH
+
+    def _encode_text(self, text: str) -> bytes:
+        # Translates a string to LCD character codes. See "Text encoding" above.
+        cache = self._text_cache
+        lru = self._text_lru
+        charcodes = cache.get(text)
+        if charcodes is not None:
+            # Mark as most recently used
+            if lru[-1] != text:
+                lru.remove(text)
+                lru.append(text)
+            return charcodes
+
+        table = self._charcode_table
+        charcodes = bytearray(len(text))
+        for idx, char in enumerate(text):
+            codepoint = ord(char)
+            if codepoint <= 0xFF:
+                charcodes[idx] = table[codepoint]
+            else:
+                charcodes[idx] = self._character_map.get(char, LCD1602._BLANK_CHARCODE)
+        charcodes = bytes(charcodes)
+
+        if len(text) <= LCD1602._TEXT_CACHE_MAX_LENGTH:
+            # MicroPython dictionaries do not keep the insertion order: the
+            # order of use is kept in a separate list
+            if len(lru) >= LCD1602._TEXT_CACHE_SIZE:
+                del cache[lru.pop(0)]
+            cache[text] = charcodes
+            lru.append(text)
+        return charcodes
+
+    def _append_runs(self, cmds: list[int], frame: bytearray, shadow: bytearray, set_addr_cmd: int, force: bool):
+        # Appends the commands sending the cells that differ between a frame
+        # and its shadow. The address counter is set only at the start of each
+        # run of changed cells.
+        is_cgram = set_addr_cmd == HD44780Cmds.C07_SET_CGRAM_ADDRESS
+
+        # Start from the current address counter when the right RAM is selected
+        next_idx = -1
+        if self._address_counter is not None and self._is_cgram_selected == is_cgram:
+            next_idx = self._address_counter if is_cgram else LCD1602._addr_to_cell(self._address_counter)
+
+        num_cmds = len(cmds)
+        for idx in range(0, len(frame)):
+            code = frame[idx]
+            if not force and code == shadow[idx]:
+                continue
+
+            if idx != next_idx:
+                cmds.append(set_addr_cmd | (idx if is_cgram else LCD1602._cell_to_addr(idx)))
+
+            cmds.append(HD44780Cmds.C10_WRITE_DATA | code)
+            shadow[idx] = code
+            next_idx = idx + 1
+
+        if len(cmds) == num_cmds:
+            return
+
+        self._address_counter = next_idx & 0x3F if is_cgram else LCD1602._cell_to_addr(next_idx)
+        self._is_cgram_selected = is_cgram
+
+    def _clear_text_cache(self):
+        # Forgets the encoded strings, after the character mapping has changed
+        self._text_cache = {}
+
+        # Strings from the least recently used to the most recently used
+        self._text_lru = []
+
+    def _execute_many(self, cmds: list[int]):
+        # Executes a sequence of write commands having a short execution time
+        # (such as data writes and set address commands) in a single bus
+        # operation. The bus is responsible for spacing the commands. Commands
+        # are trusted: they must have been validated by the caller.
+        if not cmds:
+            return
+        self._wait_until_ready()
+        self._bus._write_many_unchecked(cmds, self._exectimeus_short)
+        self._wait_for_completion(cmds[-1])
+
+    def _execute_unchecked(self, cmd: int) -> int | None:
+        # Same as `execute_command()` without validating the command. Used
+        # internally by the high-level methods, which validate their arguments
+        # before building the commands.
+
+        self._wait_until_ready()
 
-        for char in text:
-            # If the character has been mapped, use the mapped value as the character
-            # code otherwise, use the character's Unicode code.
-            charcode = self._character_map[char] if char in self._character_map else ord(char)
+        # Execute the command. The command is a read operation if the RW bit is set.
+        is_read_op = cmd & HD44780Cmds.BITMASK_RW
+        data = self._bus._read_unchecked(cmd) if is_read_op else self._bus._write_unchecked(cmd)
+        self._wait_for_completion(cmd)
+        self._track_address_counter(cmd)
+        return data
 
-            # If the character code is greater than 0xFF, replace it with a blank.
-            # 0x20 is guaranteed to be a blank as per HD44780 datasheet, page 26,
-            if charcode > 0xFF:
-                charcode = 0x20
+    def _get_cmd_view(self, num_cmds: int) -> memoryview:
+        # Returns a view of the first `num_cmds` commands of the command buffer
+        view = self._cmd_views[num_cmds]
+        if view is None:
+            view = self._cmd_buffer_mv[:num_cmds]
+            self._cmd_views[num_cmds] = view
+        return view
+
+    def _get_flush_cmds(self, force: bool) -> list[int]:
+        # Returns the commands sending the changes made to the frame buffer
+        # (see `flush()`). The shadows and the address counter are updated as
+        # if the commands had been executed: the caller must execute them all.
+        cmds = []
+        is_cgram_dirty = force or self._cgram_frame != self._cgram_shadow
+        is_ddram_dirty = force or self._ddram_frame != self._ddram_shadow
+        if not (is_cgram_dirty or is_ddram_dirty):
+            return cmds
+
+        # Runs rely on the address counter being incremented after each write.
+        # Any other entry mode is restored once the display has been updated.
+        # fmt: off
+        flush_entry_mode = HD44780Cmds.C03_ENTRY_MODE_SET \
+            | HD44780Cmds.C03_ARG_LEFT_TO_RIGHT \
+            | HD44780Cmds.C03_ARG_AUTOSCROLL_OFF
+        # fmt: on
+        if self._entry_mode != flush_entry_mode:
+            cmds.append(flush_entry_mode)
 
-            self.execute_command(HD44780Cmds.C10_WRITE_DATA | charcode)
+        if is_cgram_dirty:
+            self._append_runs(cmds, self._cgram_frame, self._cgram_shadow, HD44780Cmds.C07_SET_CGRAM_ADDRESS, force)
+
+        if is_ddram_dirty:
+            self._append_runs(cmds, self._ddram_frame, self._ddram_shadow, HD44780Cmds.C08_SET_DDRAM_ADDRESS, force)
+
+        if self._entry_mode != flush_entry_mode:
+            cmds.append(self._entry_mode)
+        return cmds
+
+    def _get_exectime_us(self, cmd: int) -> int:
+        # The HD44780 datasheet, page 24-25, provides two execution times: a
+        # long one for clear and home command and a short one for all other commands
+        is_long_cmd = (cmd == HD44780Cmds.C01_CLEAR) or (cmd == HD44780Cmds.C02_HOME)
+        return self._exectimeus_long if is_long_cmd else self._exectimeus_short
+
+    def _get_remaining_us(self) -> int:
+        # Returns the time left (in microseconds) before the last command sent
+        # to the LCD completes, based on the fixed execution times.
+        cmd = self._pending_cmd
+        if cmd is None:
+            return 0
+        remaining = self._get_exectime_us(cmd) - time.ticks_diff(time.ticks_us(), self._pending_since)
+        return remaining if remaining > 0 else 0
+
+    def _init_steps(self):
+        # Same as `init()`, yielding the delays (in milliseconds) to wait for.
+        # In deferred wait mode, most of the execution time of the long
+        # commands (clear and home) is yielded as well.
+        # 1. Clear character mappings and frame buffers
+        self._charcode_table[:] = bytes(range(256))
+        self._character_map = {}
+        self._clear_text_cache()
+        self._ddram_frame[:] = b" " * LCD1602._DDRAM_SIZE
+        self._cgram_frame[:] = bytes(LCD1602._CGRAM_SIZE)
+
+        # 2. Initialize the bus
+        self._pending_cmd = None
+        self._address_counter = None
+        yield from self._bus._init_steps()
+
+        # 3. Function set
+        # fmt: off
+        self._function_set = HD44780Cmds.C06_FUNCTION_SET \
+            | HD44780Cmds.C06_ARG_2LINES_DISPLAY \
+            | HD44780Cmds.C06_ARG_5X8_DOTS \
+            | (HD44780Cmds.C06_ARG_4BIT_BUS if self._bus.width == 4 else HD44780Cmds.C06_ARG_8BIT_BUS)
+        self._execute_unchecked(self._function_set)
+        # fmt: on
+
+        # 4. Clear display
+        self._execute_unchecked(HD44780Cmds.C01_CLEAR)
+        self._ddram_shadow[:] = self._ddram_frame
+        yield self._get_remaining_us() // 1000
+
+        # 5. Entry mode set
+        # fmt: off
+        self._entry_mode = HD44780Cmds.C03_ENTRY_MODE_SET \
+            | HD44780Cmds.C03_ARG_LEFT_TO_RIGHT \
+            | HD44780Cmds.C03_ARG_AUTOSCROLL_OFF
+        self._execute_unchecked(self._entry_mode)
+        # fmt: on
+
+        # 6. Display control
+         # fmt: off
+        self._display_control = (
+            HD44780Cmds.C04_DISPLAY_CONTROL
+            | HD44780Cmds.C04_ARG_DISPLAY_ON
+            | HD44780Cmds.C04_ARG_CURSOR_OFF
+            | HD44780Cmds.C04_ARG_CURSOR_BLINK_OFF
+        )
+        self._execute_unchecked(self._display_control)
+        # fmt: on
+
+        # 7. Measure commands execution time
+        if self._bus.can_read:
+            self.calibrate()
+
+        # 8. Clear CGRAM (custom chars)
+        self._execute_many([HD44780Cmds.C07_SET_CGRAM_ADDRESS] + [HD44780Cmds.C10_WRITE_DATA] * LCD1602._CGRAM_SIZE)
+        self._address_counter = 0
+        self._is_cgram_selected = True
+        self._cgram_shadow[:] = self._cgram_frame
+
+        # 9. Set cursor position to home
+        self.home()
+        yield self._get_remaining_us() // 1000
+
+        # 10. Turn backlight on
+        if self._bus.can_control_backlight:
+            self.set_backlight_on()
+
+    def _track_address_counter(self, cmd: int):
+        # Updates the address counter tracked in software after a command has
+        # been executed. See HD44780 datasheet, page 24-25, Table 6.
+        addr = self._address_counter
+        if cmd & HD44780Cmds.BITMASK_RS:
+            # Data read or write: the address counter moves as per the entry mode
+            if addr is not None:
+                step = 1 if self._entry_mode & HD44780Cmds.C03_ARG_LEFT_TO_RIGHT else -1
+                if self._is_cgram_selected:
+                    self._address_counter = (addr + step) & 0x3F
+                else:
+                    self._address_counter = LCD1602._cell_to_addr(LCD1602._addr_to_cell(addr) + step)
+        elif cmd & HD44780Cmds.BITMASK_RW:
+            # Reading the busy flag and address does not change the address
+            pass
+        elif cmd & HD44780Cmds.C08_SET_DDRAM_ADDRESS:
+            addr = cmd & 0x7F
+            self._address_counter = addr if (addr & 0x3F) < LCD1602._LINE_LENGTH else None
+            self._is_cgram_selected = False
+        elif cmd & HD44780Cmds.C07_SET_CGRAM_ADDRESS:
+            self._address_counter = cmd & 0x3F
+            self._is_cgram_selected = True
+        elif cmd & HD44780Cmds.C06_FUNCTION_SET:
+            pass
+        elif cmd & HD44780Cmds.C05_CMD_SHIFT:
+            # Shifting the display content does not change the address
+            if not (cmd & HD44780Cmds.C05_ARG_CONTENT):
+                if addr is None or self._is_cgram_selected:
+                    self._address_counter = None
+                else:
+                    step = 1 if cmd & HD44780Cmds.C05_ARG_RIGHT else -1
+                    self._address_counter = LCD1602._cell_to_addr(LCD1602._addr_to_cell(addr) + step)
+        elif cmd & (HD44780Cmds.C04_DISPLAY_CONTROL | HD44780Cmds.C03_ENTRY_MODE_SET):
+            pass
+        elif cmd & (HD44780Cmds.C02_HOME | HD44780Cmds.C01_CLEAR):
+            self._address_counter = 0
+            self._is_cgram_selected = False
+
+    def _wait_for_completion(self, cmd: int):
+        # Records the command that has just been sent. In deferred mode, the
+        # wait happens at the start of the next bus operation.
+        self._pending_cmd = cmd
+        self._pending_since = time.ticks_us()
+        if not self._is_deferred:
+            self._wait_until_ready()
+
+    def _wait_until_ready(self):
+        # Waits for the last command sent to the LCD to complete.
+        cmd = self._pending_cmd
+        if cmd is None:
+            return
+        self._pending_cmd = None
+        exec_delay = self._get_exectime_us(cmd)
+
+        # The command is known to be done once its execution time has elapsed
+        # (in deferred mode, while the host was doing something else).
+        remaining = exec_delay - time.ticks_diff(time.ticks_us(), self._pending_since)
+        if remaining <= 0:
+            return
+
+        # If the bus supports reading and the execution times have not been
+        # calibrated, we use the busy flag to determine when the command is done
+        # executing. Otherwise, we fallback on a fixed delay.
+        if self._bus.can_read and not self._is_calibrated:
+            while True:
+                # Busy flag is db7. When high, the LCD is busy.
+                is_busy = self._bus._read_unchecked(HD44780Cmds.C09_READ_BUSY_FLAG_AND_ADDR) & HD44780Cmds.BITMASK_DB7
+                if not is_busy:
+                    break
+
+                # We could enter in an infinite loop if the LCD is not responding.
+                # This conditional branch prevents this from happening by checking
+                # if we have exceeded the expected fixed delay for the command.
+                # If so, we print an error and break the loop.
+                if time.ticks_diff(time.ticks_us(), self._pending_since) >= exec_delay:
+                    print("LCD ERROR! Cannot read busy flag.")
+                    break
+        else:
+            # Fixed delay (calibrated or worst case). Only the part of the delay
+            # that has not elapsed yet since the command was sent is waited for.
+            time.sleep_us(remaining)
+
+    def _write_codes(self, col: int, line: int, lcdcharcodes: list[int]):
+        # Stores the codes in the frame buffer, following the entry mode
+        # direction. Unless buffered mode is on, the codes are also sent to the
+        # display and the shadow is kept in sync. Codes are read by index, so
+        # that no iterator is allocated for them.
+        step = 1 if self._entry_mode & HD44780Cmds.C03_ARG_LEFT_TO_RIGHT else -1
+        idx = line * LCD1602._LINE_LENGTH + col
+        frame = self._ddram_frame
+
+        if self._is_buffered:
+            for code_idx in range(len(lcdcharcodes)):
+                frame[idx] = lcdcharcodes[code_idx]
+                idx = (idx + step) % LCD1602._DDRAM_SIZE
+            return
+
+        shadow = self._ddram_shadow
+        cmds = self._cmd_buffer
+        num_cmds = 0
+        addr = LCD1602._LINE_ADDR_OFFSETS[line] + col
+        if addr != self._address_counter or self._is_cgram_selected:
+            cmds[0] = HD44780Cmds.C08_SET_DDRAM_ADDRESS | addr
+            num_cmds = 1
+        for code_idx in range(len(lcdcharcodes)):
+            code = lcdcharcodes[code_idx]
+            frame[idx] = code
+            shadow[idx] = code
+            cmds[num_cmds] = HD44780Cmds.C10_WRITE_DATA | code
+            num_cmds += 1
+            idx = (idx + step) % LCD1602._DDRAM_SIZE
+
+            # More codes than the DDRAM holds: the address counter wraps
+            # around as the frame index does, so the rest follows on its own
+            if num_cmds == len(cmds):
+                self._execute_many(self._get_cmd_view(num_cmds))
+                num_cmds = 0
+
+        self._execute_many(self._get_cmd_view(num_cmds))
+        self._address_counter = LCD1602._cell_to_addr(idx)
+        self._is_cgram_selected = False
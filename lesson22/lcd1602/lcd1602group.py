@@ -0,0 +1,201 @@
+# This file is part of the LCD1602 MicroPython LCD library
+# Copyright (C) 2023 Pascal Jobin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from lcd1602._helper import _Helper
+from lcd1602.hd44780busI2C import HD44780BusI2C
+from lcd1602.lcd1602 import LCD1602
+from machine import Pin, I2C
+import utime as time
+
+
+class LCD1602Group:
+    """Drives several I2C LCDs sharing the same I2C bus
+
+    Each `HD44780BusI2C` instance creates its own I2C peripheral and scans the
+    bus when initialized, and `LCD1602.init()` waits 150ms for the LCD to power
+    up. With several LCDs on the same bus, these costs are paid once per LCD.
+    A group owns a single I2C instance, scans the bus once, and initializes
+    all its LCDs in parallel: each initialization step is performed on every
+    LCD before waiting for the longest delay of the step, so the power-up wait
+    and the mode-set sequence are paid once for the whole group.
+
+    The LCDs of a group are in deferred wait mode (see
+    `LCD1602.set_deferred_wait_on()`): the execution time of the last command
+    sent to an LCD elapses while the commands of the other LCDs are being
+    transferred, so a clear or home command sent to each LCD in turn only
+    waits once. `flush()` interleaves the changes of all the LCDs, one command
+    per LCD in turn: instead of padding the bus after each command, the
+    execution time of a command sent to an LCD is covered by the transfer of
+    the commands of the other LCDs. Each command then costs its own I2C
+    transaction, so this pays off when the padding is longer than an address
+    byte: about the same as flushing the LCDs one after the other at 400KHz,
+    and about a quarter faster at 1MHz.
+
+        ```
+        from lcd1602 import LCD1602Group
+        group = LCD1602Group.begin_i2c(bus_id=1, scl=27, sda=26, addrs=[0x20, 0x21, 0x22])
+        for idx, lcd in enumerate(group.lcds):
+            lcd.set_buffering_on()
+            lcd.write_text(0, 0, "Display #{}".format(idx))
+        group.flush()
+        ```
+    """
+
+    def __init__(self, bus_id: int, scl: int, sda: int, addrs: list[int], freq: int = 400000):
+        """Initializes a new instance of the LCD1602Group class
+
+        Creating a new group DOES NOT initialize the displays. `init()` must be
+        called before any other operation on the displays.
+
+        Args:
+            bus_id (int): The I2C peripheral/bus id. For example, a pin I2C1 SCL is the clock pin for I2C bus 1.
+            scl (int): The pin number of the scl pin.
+            sda (int): The pin number of the sda pin.
+            addrs (list[int]): The I2C addresses of the LCDs.
+            freq (int, optional): The I2C clock frequency in Hz. Defaults to 400000.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range.
+        """
+        _Helper.validate_integer_arg("bus_id", bus_id)
+        _Helper.validate_integer_arg("scl", scl)
+        _Helper.validate_integer_arg("sdc", sda)
+        _Helper.validate_integer_arg("freq", freq, min_value=1)
+        _Helper.validate_integer_list_arg("addrs", addrs, min_value=0)
+        if len(addrs) == 0:
+            raise ValueError("Argument 'addrs' must contain at least one address")
+        if len(set(addrs)) != len(addrs):
+            raise ValueError("Argument 'addrs' must not contain the same address twice")
+
+        self._i2c = I2C(bus_id, scl=Pin(scl), sda=Pin(sda), freq=freq)
+
+        # Result of the bus scan, shared by the buses of the LCDs and filled
+        # by `init()`
+        self._devices = []
+
+        self.lcds = []
+        """The LCDs of the group, in the order of `addrs`"""
+
+        for addr in addrs:
+            lcd = LCD1602(HD44780BusI2C(bus_id, scl, sda, addr, freq, i2c=self._i2c, devices=self._devices))
+            lcd.set_deferred_wait_on()
+            self.lcds.append(lcd)
+
+    @classmethod
+    def begin_i2c(cls, bus_id: int, scl: int, sda: int, addrs: list[int], freq: int = 400000):
+        """Creates and initializes a group of LCDs sharing an I2C bus
+
+        This method automatically calls `init()` after creating the group.
+        The LCDs of the group returned by this method are ready to use.
+
+        Args:
+            bus_id (int): The I2C peripheral/bus id. For example, a pin I2C1 SCL is the clock pin for I2C bus 1.
+            scl (int): The pin number of the scl pin.
+            sda (int): The pin number of the sda pin.
+            addrs (list[int]): The I2C addresses of the LCDs.
+            freq (int, optional): The I2C clock frequency in Hz. Defaults to 400000.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range.
+            RuntimeError: One of the LCDs does not respond.
+
+        Returns:
+            LCD1602Group: A new group whose LCDs have been initialized and are ready to use.
+        """
+        group = cls(bus_id, scl, sda, addrs, freq)
+        group.init()
+        return group
+
+    def flush(self, force: bool = False):
+        """Sends the changes made to the frame buffers to the displays
+
+        See `LCD1602.flush()`. The command streams of the displays are
+        interleaved, one command per display in turn, so that each command
+        executes while the commands of the other displays are transferred. Once
+        a single display has commands left, they are sent in batches.
+
+        Args:
+            force (bool, optional): True to rewrite the whole DDRAM and CGRAM of each display. Defaults to False.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+        """
+        _Helper.validate_boolean_arg("force", force)
+
+        streams = []
+        for lcd in self.lcds:
+            cmds = lcd._get_flush_cmds(force)
+            if cmds:
+                streams.append((lcd, cmds))
+
+        # The shadows and the address counters are already up to date: the
+        # commands are sent without tracking
+        pos = 0
+        while len(streams) > 1:
+            for lcd, cmds in streams:
+                cmd = cmds[pos]
+                lcd._wait_until_ready()
+                lcd._bus._write_unchecked(cmd)
+                lcd._wait_for_completion(cmd)
+            pos += 1
+            streams = [stream for stream in streams if len(stream[1]) > pos]
+
+        for lcd, cmds in streams:
+            lcd._execute_many(cmds[pos:])
+
+    def get_lcd(self, addr: int) -> LCD1602:
+        """Gets the LCD at the given I2C address
+
+        Args:
+            addr (int): The I2C address of the LCD.
+
+        Raises:
+            ValueError: No LCD of the group has this address.
+
+        Returns:
+            LCD1602: The LCD.
+        """
+        for lcd in self.lcds:
+            if lcd._bus._addr == addr:
+                return lcd
+        raise ValueError("No LCD at address 0x{:02X}.".format(addr))
+
+    def init(self):
+        """Initializes all the displays of the group
+
+        The I2C bus is scanned once, then the displays are initialized in
+        parallel. After initialization, each display is in the state described
+        in `LCD1602.init()`, and in deferred wait mode.
+
+        Raises:
+            RuntimeError: One of the LCDs does not respond.
+        """
+        self._devices[:] = self._i2c.scan()
+
+        # Each step is performed on all the LCDs, then the longest delay of the
+        # step is waited for once. The delay of the first LCD started elapsing
+        # before the others were done, so it is waited for long enough.
+        steps = [lcd._init_steps() for lcd in self.lcds]
+        while steps:
+            delay_ms = 0
+            for step in list(steps):
+                try:
+                    delay_ms = max(delay_ms, next(step))
+                except StopIteration:
+                    steps.remove(step)
+            time.sleep_ms(delay_ms)
@@ -0,0 +1,176 @@
+# This file is part of the LCD1602 MicroPython LCD library
+# Copyright (C) 2023 Pascal Jobin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from lcd1602._helper import _Helper
+from lcd1602.lcd1602 import LCD1602
+from lcd1602.lcdwidgets import LCDWidget
+import utime as time
+
+
+class _Region:
+    # A named area of the display, on a single line, showing a widget
+    def __init__(self, line: int, col: int, width: int, widget: LCDWidget, ddram_line: int, ddram_col: int):
+        self.line = line
+        self.col = col
+        self.width = width
+        self.widget = widget
+        self.ddram_line = ddram_line
+        self.ddram_col = ddram_col
+        self.text = None  # Last rendered text
+
+
+class LCDLayout:
+    """Arranges widgets in named regions of a character display
+
+    A region is a range of columns on one line of the display. Each region
+    shows a widget (see `lcdwidgets`): label, numeric field, bar graph, marquee,
+    blinking alert, etc. On each call to `render()`, only the widgets that have
+    changed are rendered, only the regions whose text has changed are written
+    to the frame buffer of the LCD, and the LCD sends only the characters that
+    differ from what is displayed (see `LCD1602.flush()`).
+
+        ```
+        from lcd1602 import LCD1602, LCDLayout, LabelWidget, NumericWidget
+        lcd = LCD1602.begin_4bit(rs=2, e=3, db_7_to_4=[7, 6, 5, 4], rw=1)
+        layout = LCDLayout(lcd)
+        layout.add_region("temp_label", 0, 0, 6, LabelWidget("Temp:"))
+        layout.add_region("temp", 0, 6, 5, NumericWidget(decimals=1, suffix="C"))
+        layout.get_widget("temp").set_value(21.5)
+        layout.render()
+        ```
+
+    The 16x2, 20x2, 16x4 and 20x4 geometries are supported. The HD44780 has 2
+    lines of 40 columns of display memory (see `LCD1602._LINE_ADDR_OFFSETS`).
+    On 4-line displays, lines 2 and 3 are the continuation of lines 0 and 1 in
+    the display memory (e.g. addresses 14H and 54H on a 20x4 display).
+
+    The layout turns buffered mode on (see `LCD1602.set_buffering_on()`). The
+    display MUST NOT be shifted while a layout is in use.
+    """
+
+    def __init__(self, lcd: LCD1602, num_cols: int = 16, num_lines: int = 2):
+        """Initializes a new instance of the LCDLayout class
+
+        Args:
+            lcd (LCD1602): The LCD on which the layout is displayed.
+            num_cols (int, optional): The number of columns of the display (16 or 20). Defaults to 16.
+            num_lines (int, optional): The number of lines of the display (2 or 4). Defaults to 2.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range.
+        """
+        if not isinstance(lcd, LCD1602):
+            raise TypeError("Invalid LCD.")
+        _Helper.validate_integer_arg("num_cols", num_cols, allowed_values=[16, 20])
+        _Helper.validate_integer_arg("num_lines", num_lines, allowed_values=[2, 4])
+
+        self._lcd = lcd
+        self._num_cols = num_cols
+        self._num_lines = num_lines
+        self._regions = {}
+
+        lcd.set_buffering_on()
+
+    def add_region(self, name: str, line: int, col: int, width: int, widget: LCDWidget):
+        """Adds a named region showing a widget
+
+        Args:
+            name (str): The name of the region.
+            line (int): The line index of the region.
+            col (int): The column index of the first character of the region.
+            width (int): The number of characters of the region.
+            widget (LCDWidget): The widget shown in the region.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range --OR-- the name is already used --OR-- the region overlaps another region --OR-- the widget does not fit in the region.
+        """
+        # fmt: off
+        _Helper.validate_string_arg("name", name, min_length=1)
+        _Helper.validate_integer_arg("line", line, min_value=0, max_value=self._num_lines, inclusive=False)
+        _Helper.validate_integer_arg("col", col, min_value=0, max_value=self._num_cols, inclusive=False)
+        _Helper.validate_integer_arg("width", width, min_value=1, max_value=self._num_cols - col)
+        # fmt: on
+        if not isinstance(widget, LCDWidget):
+            raise TypeError("Invalid widget.")
+        widget._validate_width(width)
+
+        if name in self._regions:
+            raise ValueError("Region '{}' already exists.".format(name))
+
+        for other_name, other in self._regions.items():
+            if other.line == line and col < other.col + other.width and other.col < col + width:
+                raise ValueError("Region '{}' overlaps region '{}'.".format(name, other_name))
+
+        # Lines 2 and 3 continue lines 0 and 1 in the display memory
+        ddram_line = line % 2
+        ddram_col = col + (line // 2) * self._num_cols
+        self._regions[name] = _Region(line, col, width, widget, ddram_line, ddram_col)
+
+    def get_next_render_ms(self) -> int | None:
+        """Gets the time at which a widget changes by itself (scrolling, blinking)
+
+        The main loop can sleep until then, unless a widget value is set.
+
+        Returns:
+            int | None: The time (see `time.ticks_ms()`), or None when nothing changes until a widget value is set.
+        """
+        deadline = None
+        for region in self._regions.values():
+            widget = region.widget
+            if widget._is_dirty:
+                return time.ticks_ms()
+            widget_deadline = widget.get_next_change_ms()
+            if widget_deadline is not None and (deadline is None or time.ticks_diff(widget_deadline, deadline) < 0):
+                deadline = widget_deadline
+        return deadline
+
+    def get_widget(self, name: str) -> LCDWidget:
+        """Gets the widget shown in a region
+
+        Args:
+            name (str): The name of the region.
+
+        Raises:
+            ValueError: No region has this name.
+
+        Returns:
+            LCDWidget: The widget.
+        """
+        region = self._regions.get(name)
+        if region is None:
+            raise ValueError("Region '{}' does not exist.".format(name))
+        return region.widget
+
+    def render(self):
+        """Renders the widgets that have changed and updates the display"""
+        now_ms = time.ticks_ms()
+        lcd = self._lcd
+        for region in self._regions.values():
+            widget = region.widget
+            if not widget._is_dirty:
+                deadline = widget.get_next_change_ms()
+                if deadline is None or time.ticks_diff(now_ms, deadline) < 0:
+                    continue
+
+            widget._is_dirty = False
+            text = widget._render(region.width, now_ms)
+            if text != region.text:
+                region.text = text
+                lcd.write_text(region.ddram_col, region.ddram_line, text)
+
+        lcd.flush()
@@ -0,0 +1,334 @@
+# This file is part of the LCD1602 MicroPython LCD library
+# Copyright (C) 2023 Pascal Jobin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from lcd1602._helper import _Helper
+import utime as time
+
+
+class LCDWidget:
+    """Provides a base implementation of a widget displayed by `LCDLayout`
+
+    A widget renders itself as a fixed number of characters (the width of the
+    region it is placed in). Widgets are only rendered again when they are
+    dirty (their value has changed) or when the time returned by
+    `get_next_change_ms()` has been reached (scrolling, blinking).
+
+    Subclasses implement `_render()` and call `_set_dirty()` when their value
+    changes.
+    """
+
+    def __init__(self):
+        self._is_dirty = True
+
+    def get_next_change_ms(self) -> int | None:
+        """Gets the time at which the widget changes by itself
+
+        Returns:
+            int | None: The time (see `time.ticks_ms()`), or None when the widget only changes when its value is set.
+        """
+        return None
+
+    def _render(self, width: int, now_ms: int) -> str:
+        # Returns the text of the widget, exactly `width` characters long.
+        raise NotImplementedError()
+
+    def _set_dirty(self):
+        self._is_dirty = True
+
+    def _validate_width(self, width: int):
+        # Raises a ValueError when the widget cannot be rendered in `width`
+        # characters. Called when the widget is placed in a region.
+        pass
+
+
+class LabelWidget(LCDWidget):
+    """Displays a text, truncated or padded to the width of its region"""
+
+    ALIGN_LEFT = 0
+    ALIGN_RIGHT = 1
+
+    def __init__(self, text: str = "", align: int = ALIGN_LEFT):
+        """Initializes a new instance of the LabelWidget class
+
+        Args:
+            text (str, optional): The text. Defaults to "".
+            align (int, optional): The alignment of the text (ALIGN_LEFT or ALIGN_RIGHT). Defaults to ALIGN_LEFT.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range.
+        """
+        _Helper.validate_integer_arg("align", align, allowed_values=[LabelWidget.ALIGN_LEFT, LabelWidget.ALIGN_RIGHT])
+        super().__init__()
+        self._align = align
+        self._text = ""
+        self.set_text(text)
+
+    def set_text(self, text: str):
+        """Sets the text
+
+        Args:
+            text (str): The text.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+        """
+        _Helper.validate_string_arg("text", text)
+        if text != self._text:
+            self._text = text
+            self._set_dirty()
+
+    def _render(self, width: int, now_ms: int) -> str:
+        if self._align == LabelWidget.ALIGN_RIGHT:
+            return "{:>{}}".format(self._text[-width:], width)
+        return "{:<{}}".format(self._text[:width], width)
+
+
+class NumericWidget(LCDWidget):
+    """Displays a number right-aligned in a fixed number of characters
+
+    A number that does not fit in the region is displayed as `#` characters,
+    so the widget never spills over its neighbours. An unknown value (None) is
+    displayed as `-` characters. The region must be wider than the suffix.
+    """
+
+    def __init__(self, decimals: int = 0, suffix: str = ""):
+        """Initializes a new instance of the NumericWidget class
+
+        Args:
+            decimals (int, optional): The number of decimals displayed. Defaults to 0.
+            suffix (str, optional): A text displayed after the number (for example, a unit). Defaults to "".
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range.
+        """
+        _Helper.validate_integer_arg("decimals", decimals, min_value=0)
+        _Helper.validate_string_arg("suffix", suffix)
+        super().__init__()
+        self._decimals = decimals
+        self._suffix = suffix
+        self._value = None
+
+    def set_value(self, value: int | float | None):
+        """Sets the number
+
+        Args:
+            value (int | float | None): The number, or None when unknown.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+        """
+        if value is not None and not isinstance(value, (int, float)):
+            raise TypeError("Argument 'value' must be a number or None")
+        if value != self._value:
+            self._value = value
+            self._set_dirty()
+
+    def _render(self, width: int, now_ms: int) -> str:
+        num_digits = width - len(self._suffix)
+        if self._value is None:
+            text = "-" * num_digits
+        else:
+            text = "{:>{}.{}f}".format(self._value, num_digits, self._decimals)
+            if len(text) > num_digits:
+                text = "#" * num_digits
+        return text + self._suffix
+
+    def _validate_width(self, width: int):
+        if width <= len(self._suffix):
+            raise ValueError("Region is too narrow for suffix '{}'.".format(self._suffix))
+
+
+class BarGraphWidget(LCDWidget):
+    """Displays a value as a horizontal bar
+
+    Each character of the region is either full (character code 0xFF, a full
+    block on the A00 character ROM) or empty. Partial characters, such as
+    custom characters made with `GlyphManager`, increase the resolution: with
+    4 partial characters (1/5 to 4/5 of a cell), a 16 characters bar has 80
+    steps.
+    """
+
+    def __init__(self, min_value: int | float, max_value: int | float, partial_chars: str = ""):
+        """Initializes a new instance of the BarGraphWidget class
+
+        Args:
+            min_value (int | float): The value of an empty bar.
+            max_value (int | float): The value of a full bar.
+            partial_chars (str, optional): The characters of partially filled cells, from the least to the most filled. Defaults to "".
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range.
+        """
+        if not isinstance(min_value, (int, float)) or not isinstance(max_value, (int, float)):
+            raise TypeError("Arguments 'min_value' and 'max_value' must be numbers")
+        if max_value <= min_value:
+            raise ValueError("Argument 'max_value' must be greater than 'min_value'")
+        _Helper.validate_string_arg("partial_chars", partial_chars)
+        super().__init__()
+        self._min_value = min_value
+        self._max_value = max_value
+        self._partial_chars = partial_chars
+        self._value = min_value
+
+    def set_value(self, value: int | float):
+        """Sets the value. Values out of range are clamped.
+
+        Args:
+            value (int | float): The value.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+        """
+        if not isinstance(value, (int, float)):
+            raise TypeError("Argument 'value' must be a number")
+        value = min(max(value, self._min_value), self._max_value)
+        if value != self._value:
+            self._value = value
+            self._set_dirty()
+
+    def _render(self, width: int, now_ms: int) -> str:
+        steps_per_cell = len(self._partial_chars) + 1
+        ratio = (self._value - self._min_value) / (self._max_value - self._min_value)
+        num_steps = int(ratio * width * steps_per_cell + 0.5)
+        num_full, partial = divmod(num_steps, steps_per_cell)
+        text = chr(0xFF) * num_full
+        if partial:
+            text = text + self._partial_chars[partial - 1]
+        return "{:<{}}".format(text, width)
+
+
+class MarqueeWidget(LCDWidget):
+    """Displays a text, scrolling it when it is longer than the region"""
+
+    def __init__(self, text: str = "", speed_ms: int = 300):
+        """Initializes a new instance of the MarqueeWidget class
+
+        Args:
+            text (str, optional): The text. Defaults to "".
+            speed_ms (int, optional): The delay between two scroll steps in milliseconds. Defaults to 300.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range.
+        """
+        _Helper.validate_integer_arg("speed_ms", speed_ms, min_value=1)
+        super().__init__()
+        self._speed_ms = speed_ms
+        self._text = ""
+        self._pos = 0
+        self._last_step_on = None  # Timestamp. None when not scrolling.
+        self.set_text(text)
+
+    def get_next_change_ms(self) -> int | None:
+        if self._last_step_on is None:
+            return None
+        return time.ticks_add(self._last_step_on, self._speed_ms)
+
+    def set_text(self, text: str):
+        """Sets the text. Scrolling restarts from the beginning of the text.
+
+        Args:
+            text (str): The text.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+        """
+        _Helper.validate_string_arg("text", text)
+        if text != self._text:
+            self._text = text
+            self._pos = 0
+            self._last_step_on = None
+            self._set_dirty()
+
+    def _render(self, width: int, now_ms: int) -> str:
+        text = self._text
+        if len(text) <= width:
+            self._last_step_on = None
+            return "{:<{}}".format(text, width)
+
+        # Scroll steps are counted from the last step (not from the render
+        # time) so the cadence does not drift when rendering is late.
+        if self._last_step_on is None:
+            self._last_step_on = now_ms
+        else:
+            num_steps = time.ticks_diff(now_ms, self._last_step_on) // self._speed_ms
+            if num_steps > 0:
+                self._pos = self._pos + num_steps
+                self._last_step_on = time.ticks_add(self._last_step_on, num_steps * self._speed_ms)
+
+        # A gap of 3 spaces separates the end of the text from its beginning
+        loop = text + "   "
+        pos = self._pos % len(loop)
+        window = loop[pos : pos + width]
+        if len(window) < width:
+            window = window + loop[: width - len(window)]
+        return window
+
+
+class AlertWidget(LCDWidget):
+    """Displays a blinking text while active, and blanks otherwise"""
+
+    def __init__(self, text: str, period_ms: int = 500):
+        """Initializes a new instance of the AlertWidget class
+
+        Args:
+            text (str): The text of the alert.
+            period_ms (int, optional): The time the text is shown, then hidden, in milliseconds. Defaults to 500.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range.
+        """
+        _Helper.validate_string_arg("text", text)
+        _Helper.validate_integer_arg("period_ms", period_ms, min_value=1)
+        super().__init__()
+        self._text = text
+        self._period_ms = period_ms
+        self._activated_on = None  # Timestamp. None when inactive.
+        self._next_change_on = None  # Timestamp of the next blink, set by `_render()`
+
+    def get_next_change_ms(self) -> int | None:
+        return self._next_change_on
+
+    def set_active(self, active: bool):
+        """Shows (blinking) or hides the alert
+
+        Args:
+            active (bool): True to show the alert, False to hide it.
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+        """
+        _Helper.validate_boolean_arg("active", active)
+        if active != (self._activated_on is not None):
+            self._activated_on = time.ticks_ms() if active else None
+            self._next_change_on = None
+            self._set_dirty()
+
+    def _render(self, width: int, now_ms: int) -> str:
+        if self._activated_on is None:
+            return " " * width
+
+        # Blinks are counted from the activation time, so the cadence does not
+        # drift when rendering is late.
+        num_periods = time.ticks_diff(now_ms, self._activated_on) // self._period_ms
+        self._next_change_on = time.ticks_add(self._activated_on, (num_periods + 1) * self._period_ms)
+        if num_periods % 2 == 0:
+            return "{:<{}}".format(self._text[:width], width)
+        return " " * width
@@ -0,0 +1,51 @@
+""" Host-side tools for the LCD1602 MicroPython LCD library
+
+This package makes it possible to run the `lcd1602` library on a regular
+computer (CPython), without a board nor a physical display. It is meant to
+measure, compare and verify the bus traffic generated by the library.
+
+Importing this package installs minimal stand-ins for the MicroPython `machine`
+and `utime` modules when they are not available (i.e. when not running on a
+MicroPython board). The `utime` stand-in uses a simulated clock: sleeping
+advances the clock instantly, so long delays do not slow down the host. A
+`uasyncio` stand-in (CPython asyncio) is installed as well. Its sleeps take
+real time and advance the simulated clock accordingly. An `rp2` stand-in
+interprets PIO programs written with the `rp2.asm_pio` syntax on the simulated
+clock, so the PIO buses can be connected to the emulated controller as well.
+A `dht` stand-in always reads the same values, so `main.py` can run too.
+
+    ```
+    import lcdsim
+    from lcd1602 import LCD1602
+    bus = lcdsim.CountingBus()
+    lcd = LCD1602(bus)
+    lcd.init()
+    lcd.write_text(0, 0, "Hello World!")
+    print(bus.num_commands)
+    ```
+
+`CountingBus` works at the command level. To exercise the real bus classes,
+connect an emulated `HD44780` controller to the simulated GPIOs or to the
+simulated I2C bus. The emulated controller counts operations and timing
+violations, and its memory can be inspected:
+
+    ```
+    import lcdsim
+    from lcd1602 import LCD1602
+    controller = lcdsim.HD44780(strict=True)
+    lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=[7, 6, 5, 4], rw=1)
+    #lcdsim.PCF8574(controller, addr=0x27)
+    lcd = LCD1602.begin_4bit(rs=2, e=3, db_7_to_4=[7, 6, 5, 4], rw=1)
+    #lcd = LCD1602.begin_i2c(bus_id=1, scl=27, sda=26)
+    lcd.write_text(0, 0, "Hello World!")
+    print(controller.get_visible_text(0))
+    ```
+"""
+
+from lcdsim import _host
+
+_host.install()
+
+from lcdsim.countingbus import CountingBus
+from lcdsim.hd44780 import HD44780
+from lcdsim.wiring import ParallelWiring, PCF8574
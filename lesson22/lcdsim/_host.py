@@ -0,0 +1,308 @@
+import sys
+
+
+# Simulated clock, in nanoseconds. Sleeping advances the clock instantly.
+_now_ns = 0
+
+# Emulated hardware running on the simulated clock (e.g. PIO state machines).
+# A ticker has a `next_ns` attribute (None when idle) and a `tick()` method
+# performing the step due at `next_ns`.
+CLOCK_TICKERS = []
+
+# Devices responding on the simulated I2C buses, by address. A device is an
+# object implementing `write_byte(byte: int)` and `read_byte() -> int`, or None
+# for a device that acknowledges everything and reads as zeros. 0x27 is the
+# default address of PCF8574-based LCD backpacks.
+I2C_DEVICES = {0x27: None}
+
+# Simulated GPIOs, by pin number. Levels are shared by all `Pin` objects using
+# the same pin number. Watchers are called with no argument when the level of
+# a pin changes. Drivers return the level an external device drives on a pin
+# (or None when the device does not drive the pin).
+PIN_LEVELS = {}
+PIN_WATCHERS = {}
+PIN_DRIVERS = {}
+
+# Number of GPIO accesses made by the program: `Pin` reads and writes, and
+# `mem32` accesses to the SIO registers.
+num_io_calls = 0
+
+
+def now_ns() -> int:
+    """Returns the simulated clock, in nanoseconds"""
+    return _now_ns
+
+
+def advance_ns(delta_ns: int):
+    """Advances the simulated clock, running the tickers due in the meantime"""
+    global _now_ns
+    target_ns = _now_ns + delta_ns
+    while CLOCK_TICKERS:
+        ticker = None
+        for candidate in CLOCK_TICKERS:
+            next_ns = candidate.next_ns
+            if next_ns is not None and next_ns <= target_ns and (ticker is None or next_ns < ticker.next_ns):
+                ticker = candidate
+        if ticker is None:
+            break
+        _now_ns = max(_now_ns, ticker.next_ns)
+        ticker.tick()
+    _now_ns = max(_now_ns, target_ns)
+
+
+class _UTime:
+    """Minimal stand-in for the MicroPython `utime` module"""
+
+    @staticmethod
+    def ticks_us() -> int:
+        return _now_ns // 1000
+
+    @staticmethod
+    def ticks_ms() -> int:
+        return _now_ns // 1000000
+
+    @staticmethod
+    def ticks_add(ticks: int, delta: int) -> int:
+        return ticks + delta
+
+    @staticmethod
+    def ticks_diff(ticks1: int, ticks2: int) -> int:
+        return ticks1 - ticks2
+
+    @staticmethod
+    def sleep_us(us: int):
+        advance_ns(int(us) * 1000)
+
+    @staticmethod
+    def sleep_ms(ms: int):
+        advance_ns(int(ms) * 1000000)
+
+    @staticmethod
+    def sleep(s: float):
+        advance_ns(int(s * 1000000000))
+
+    @staticmethod
+    def gmtime(secs: int | None = None) -> tuple:
+        import time
+
+        return tuple(time.gmtime(secs))[:8]
+
+
+class _Pin:
+    """Minimal stand-in for `machine.Pin`
+
+    Pins remember their level in `PIN_LEVELS`. Emulated devices can watch
+    level changes (`PIN_WATCHERS`) and drive input levels (`PIN_DRIVERS`).
+    """
+
+    IN = 0
+    OUT = 1
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_RISING = 4
+    IRQ_FALLING = 8
+
+    # Number of `Pin` objects created
+    num_instances = 0
+
+    def __init__(self, id: int, mode: int = -1, pull: int = -1, *, value: int | None = None):
+        _Pin.num_instances += 1
+        self.id = id
+        self._mode = mode
+        PIN_LEVELS.setdefault(id, 0)
+        if value is not None:
+            self.value(value)
+
+    def init(self, mode: int = -1, pull: int = -1, *, value: int | None = None):
+        if mode != -1:
+            self._mode = mode
+        if value is not None:
+            self.value(value)
+
+    def value(self, value: ... = None) -> ...:
+        global num_io_calls
+        num_io_calls += 1
+        if value is None:
+            return _get_level(self.id)
+        _set_level(self.id, 1 if value else 0)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def irq(self, handler=None, trigger: int = 0):
+        pass
+
+
+class _DHT11:
+    """Minimal stand-in for `dht.DHT11`, always reading the same values"""
+
+    def __init__(self, pin: _Pin):
+        self.pin = pin
+
+    def measure(self):
+        pass
+
+    def temperature(self) -> int:
+        return 21
+
+    def humidity(self) -> int:
+        return 45
+
+
+class _Mem32:
+    """Minimal stand-in for `machine.mem32`, limited to the RP2040 SIO GPIO registers"""
+
+    _GPIO_IN = 0xD0000004
+    _GPIO_OUT_SET = 0xD0000014
+    _GPIO_OUT_CLR = 0xD0000018
+    _GPIO_OE_SET = 0xD0000024
+    _GPIO_OE_CLR = 0xD0000028
+    _NUM_GPIOS = 30
+
+    def __getitem__(self, addr: int) -> int:
+        global num_io_calls
+        num_io_calls += 1
+        if addr != _Mem32._GPIO_IN:
+            raise NotImplementedError(hex(addr))
+        value = 0
+        for pin in range(0, _Mem32._NUM_GPIOS):
+            if pin in PIN_LEVELS:
+                value = value | (_get_level(pin) << pin)
+        return value
+
+    def __setitem__(self, addr: int, value: int):
+        global num_io_calls
+        num_io_calls += 1
+        if addr in (_Mem32._GPIO_OE_SET, _Mem32._GPIO_OE_CLR):
+            return
+        if addr not in (_Mem32._GPIO_OUT_SET, _Mem32._GPIO_OUT_CLR):
+            raise NotImplementedError(hex(addr))
+        level = 1 if addr == _Mem32._GPIO_OUT_SET else 0
+        for pin in range(0, _Mem32._NUM_GPIOS):
+            if value & (1 << pin):
+                PIN_LEVELS.setdefault(pin, 0)
+                _set_level(pin, level)
+
+
+def _get_level(pin: int) -> int:
+    # Level driven by an external device, or level set by the program
+    driver = PIN_DRIVERS.get(pin)
+    level = None if driver is None else driver()
+    return PIN_LEVELS[pin] if level is None else level
+
+
+def _set_level(pin: int, level: int):
+    if PIN_LEVELS[pin] != level:
+        PIN_LEVELS[pin] = level
+        watcher = PIN_WATCHERS.get(pin)
+        if watcher is not None:
+            watcher()
+
+
+class _I2C:
+    """Minimal stand-in for `machine.I2C`
+
+    Devices listed in `I2C_DEVICES` acknowledge every transaction. Each byte
+    (including the address byte) advances the simulated clock by 9 clock cycles
+    (8 data bits + ACK) before being handed to the device. Transactions and data
+    bytes are recorded in `num_transactions` and `num_bytes`, and scans in
+    `num_scans`.
+    """
+
+    def __init__(self, id: int, *, scl: _Pin | None = None, sda: _Pin | None = None, freq: int = 400000):
+        self.id = id
+        self.freq = freq
+        self.num_transactions = 0
+        self.num_bytes = 0
+        self.num_scans = 0
+
+    def scan(self) -> list[int]:
+        self.num_scans += 1
+        return list(I2C_DEVICES)
+
+    def writeto(self, addr: int, buf: bytes, stop: bool = True) -> int:
+        device = self._start(addr)
+        for byte in buf:
+            self._clock_byte()
+            self.num_bytes += 1
+            if device is not None:
+                device.write_byte(byte)
+        return len(buf)
+
+    def readfrom(self, addr: int, nbytes: int, stop: bool = True) -> bytes:
+        device = self._start(addr)
+        data = bytearray(nbytes)
+        for idx in range(nbytes):
+            self._clock_byte()
+            self.num_bytes += 1
+            if device is not None:
+                data[idx] = device.read_byte()
+        return bytes(data)
+
+    def _start(self, addr: int):
+        # Clocks the address byte and returns the addressed device
+        if addr not in I2C_DEVICES:
+            raise OSError(19)  # ENODEV
+        self.num_transactions += 1
+        self._clock_byte()
+        return I2C_DEVICES[addr]
+
+    def _clock_byte(self):
+        # 8 data bits + ACK
+        advance_ns(9 * 1000000000 // self.freq)
+
+
+def _make_module(name: str, attrs: dict):
+    module = type(sys)(name)
+    for key, value in attrs.items():
+        setattr(module, key, value)
+    return module
+
+
+def _make_uasyncio():
+    # The CPython asyncio module, with sleeps that also advance the simulated
+    # clock. A task sleeping for `s` seconds wakes up no earlier than `s`
+    # seconds later on the simulated clock.
+    import asyncio
+
+    async def sleep(s: float):
+        wake_ns = _now_ns + int(s * 1000000000)
+        await asyncio.sleep(s)
+        advance_ns(max(0, wake_ns - _now_ns))
+
+    async def sleep_ms(ms: int):
+        await sleep(ms / 1000)
+
+    attrs = {name: getattr(asyncio, name) for name in asyncio.__all__}
+    attrs.update(sleep=sleep, sleep_ms=sleep_ms)
+    return _make_module("uasyncio", attrs)
+
+
+def install():
+    """Installs the `machine`, `utime`, `uasyncio`, `rp2` and `dht` stand-ins unless the real ones are available"""
+    try:
+        import machine  # noqa: F401
+        import utime  # noqa: F401
+
+        return
+    except ImportError:
+        pass
+
+    utime = _make_module(
+        "utime",
+        {name: getattr(_UTime, name) for name in dir(_UTime) if not name.startswith("_")},
+    )
+    machine = _make_module("machine", {"Pin": _Pin, "I2C": _I2C, "mem32": _Mem32()})
+    sys.modules.setdefault("utime", utime)
+    sys.modules.setdefault("machine", machine)
+    sys.modules.setdefault("umachine", machine)
+    sys.modules.setdefault("uasyncio", _make_uasyncio())
+    sys.modules.setdefault("dht", _make_module("dht", {"DHT11": _DHT11}))
+
+    from lcdsim import pio
+
+    rp2 = _make_module("rp2", {"PIO": pio.PIO, "StateMachine": pio.StateMachine, "asm_pio": pio.asm_pio})
+    sys.modules.setdefault("rp2", rp2)
@@ -0,0 +1,701 @@
+""" Bus traffic benchmarks for the LCD1602 library
+
+Run from the lesson directory with: `python -m lcdsim.benchmarks`
+"""
+
+import gc
+import lcdsim
+from display import Display
+from display.displayline import DisplayLine
+import uasyncio as asyncio
+import utime as time
+from time import perf_counter
+from lcd1602 import AsyncLCD1602, LCD1602, HD44780Bus4, HD44780Bus8, HD44780BusI2C, HD44780BusPIO4, HD44780BusPIO8, HD44780Cmds, LCD1602Group, LCDProfiler
+from lcd1602 import LCDLayout, LabelWidget, NumericWidget, BarGraphWidget, MarqueeWidget, AlertWidget
+
+
+def bench_buffered_dashboard(num_frames: int = 100):
+    """Compares the bus traffic of a dashboard updating a couple of digits per frame"""
+    results = {}
+    for buffered in (False, True):
+        bus = lcdsim.CountingBus()
+        lcd = LCD1602(bus)
+        lcd.init()
+        if buffered:
+            lcd.set_buffering_on()
+
+        bus.reset()
+        for frame in range(num_frames):
+            lcd.write_text(0, 0, "Temp: {:>3}{}C    ".format(20 + frame % 3, chr(0xDF)))
+            lcd.write_text(0, 1, "Humidity: {:>3}%  ".format(40 + frame % 7))
+            lcd.flush()
+        results[buffered] = (bus.num_commands, bus.num_i2c_transactions)
+
+    print("Dashboard, {} frames:".format(num_frames))
+    print("  unbuffered: {:6} commands, {:6} I2C transactions".format(*results[False]))
+    print("  buffered:   {:6} commands, {:6} I2C transactions".format(*results[True]))
+    print("  reduction:  {:.1f}x".format(results[False][0] / results[True][0]))
+
+
+def bench_i2c_streaming(freq: int = 400000):
+    """Compares a full screen redraw on the I2C bus, one nibble per transaction vs streamed"""
+    controller = lcdsim.HD44780(strict=True)
+    backpack = lcdsim.PCF8574(controller)
+    bus = HD44780BusI2C(0, scl=1, sda=0, freq=freq)
+    lcd = LCD1602(bus)
+    lcd.init()
+    cmds = [0b1000000000 | (0x41 + idx % 26) for idx in range(32)]
+
+    # Legacy path: 3 transactions per nibble and a fixed delay between commands
+    i2c = bus._i2c
+    i2c.num_transactions = 0
+    started_at = time.ticks_us()
+    for cmd in cmds:
+        bus._write_nibble(cmd, high_nibble=True)
+        bus._write_nibble(cmd, high_nibble=False)
+        time.sleep_us(LCD1602._EXECTIMEUS_SHORT)
+    legacy = (time.ticks_diff(time.ticks_us(), started_at), i2c.num_transactions)
+
+    i2c.num_transactions = 0
+    started_at = time.ticks_us()
+    for line in (0, 1):
+        lcd.write_text(0, line, "ABCDEFGHIJKLMNOP")
+    streamed = (time.ticks_diff(time.ticks_us(), started_at), i2c.num_transactions)
+
+    print("Full screen redraw on I2C @ {}KHz (simulated bus time):".format(freq // 1000))
+    print("  per nibble: {:6} us, {:4} transactions".format(*legacy))
+    print("  streamed:   {:6} us, {:4} transactions".format(*streamed))
+    print("  speed-up:   {:.1f}x".format(legacy[0] / streamed[0]))
+    backpack.detach()
+
+
+def bench_i2c_delays(freq: int = 400000, num_cmds: int = 8):
+    """Reports the I2C traffic of a command sequence for delays padded in the batch vs slept"""
+    controller = lcdsim.HD44780(strict=True)
+    backpack = lcdsim.PCF8574(controller)
+    lcd = LCD1602.begin_i2c(bus_id=0, scl=1, sda=0, freq=freq)
+    i2c = lcd._bus._i2c
+    cmds = [HD44780Cmds.C08_SET_DDRAM_ADDRESS] + [HD44780Cmds.C10_WRITE_DATA | (0x41 + idx) for idx in range(num_cmds - 1)]
+
+    print("{} commands on I2C @ {}KHz, by delay between commands (simulated bus time):".format(num_cmds, freq // 1000))
+    for delay_us in (LCD1602._EXECTIMEUS_SHORT, LCD1602._EXECTIMEUS_LONG, 5000, 20000):
+        i2c.num_transactions = 0
+        i2c.num_bytes = 0
+        started_at = time.ticks_us()
+        lcd._bus.write_many(cmds, delay_us)
+        elapsed = time.ticks_diff(time.ticks_us(), started_at)
+        time.sleep_us(delay_us)
+        print(
+            "  {:5} us: {:6} us, {:2} transactions, {:4} bytes".format(delay_us, elapsed, i2c.num_transactions, i2c.num_bytes)
+        )
+    backpack.detach()
+
+
+def bench_emulated_buses():
+    """Reports the simulated time and bus traffic of a full screen redraw on each bus"""
+    print("Full screen redraw on an emulated HD44780 @ 270KHz:")
+    for name in ("4-bit", "8-bit", "I2C", "PIO4", "PIO8"):
+        controller = lcdsim.HD44780(strict=True)
+        if name == "4-bit":
+            wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=[7, 6, 5, 4], rw=1)
+            lcd = LCD1602.begin_4bit(rs=2, e=3, db_7_to_4=[7, 6, 5, 4], rw=1)
+        elif name == "8-bit":
+            wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=[7, 6, 5, 4, 13, 12, 11, 10], rw=1)
+            lcd = LCD1602.begin_8bit(rs=2, e=3, db_7_to_0=[7, 6, 5, 4, 13, 12, 11, 10], rw=1)
+        elif name == "I2C":
+            wiring = lcdsim.PCF8574(controller)
+            lcd = LCD1602.begin_i2c(bus_id=0, scl=1, sda=0)
+        elif name == "PIO4":
+            wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=[7, 6, 5, 4])
+            lcd = LCD1602(HD44780BusPIO4(rs=2, e=3, db_7_to_4=[7, 6, 5, 4]))
+            lcd.init()
+        else:
+            wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=[13, 12, 11, 10, 9, 8, 7, 6])
+            lcd = LCD1602(HD44780BusPIO8(rs=2, e=3, db_7_to_0=[13, 12, 11, 10, 9, 8, 7, 6]))
+            lcd.init()
+
+        started_at = time.ticks_us()
+        lcd.write_text(0, 0, "0123456789ABCDEF")
+        lcd.write_text(0, 1, "FEDCBA9876543210")
+        elapsed = time.ticks_diff(time.ticks_us(), started_at)
+        wiring.detach()
+        if name.startswith("PIO"):
+            lcd._bus._sm.active(0)
+
+        assert controller.get_visible_text(1) == "FEDCBA9876543210"
+        print("  {:6}: {:6} us".format(name, elapsed))
+
+
+def bench_validation_overhead(num_iterations: int = 2000):
+    """Measures the host CPU time spent per command, public (validating) vs unchecked command path"""
+    bus = lcdsim.CountingBus()
+    lcd = LCD1602(bus)
+    lcd.init()
+    text = "Humidity:  42%  "
+    cmds = [HD44780Cmds.C08_SET_DDRAM_ADDRESS] + [HD44780Cmds.C10_WRITE_DATA | ord(c) for c in text]
+
+    def write_text_public():
+        # What `write_text()` used to do: validate its arguments, then send
+        # each character with `execute_command()`, which validates it with
+        # `is_command_supported()` before the bus `write()` validates it again
+        lcd.set_cursor_position(0, 0)
+        for char in text:
+            lcd.execute_command(HD44780Cmds.C10_WRITE_DATA | ord(char))
+
+    def write_public():
+        for cmd in cmds:
+            bus.write(cmd)
+
+    def write_unchecked():
+        for cmd in cmds:
+            bus._write_unchecked(cmd)
+
+    results = []
+    for name, public, unchecked in (
+        ("bus, one command at a time", write_public, write_unchecked),
+        ("bus, sequence", lambda: bus.write_many(cmds, LCD1602._EXECTIMEUS_SHORT), lambda: bus._write_many_unchecked(cmds, LCD1602._EXECTIMEUS_SHORT)),
+        ("write_text()", write_text_public, lambda: lcd.write_text(0, 0, text)),
+    ):
+        # Best of 3 runs, alternating the paths
+        elapsed = [float("inf"), float("inf")]
+        for _ in range(3):
+            for idx, func in enumerate((public, unchecked)):
+                started_at = perf_counter()
+                for _ in range(num_iterations):
+                    func()
+                elapsed[idx] = min(elapsed[idx], (perf_counter() - started_at) / (num_iterations * len(cmds)) * 1000000)
+        results.append((name, elapsed[0], elapsed[1]))
+
+    print("Host CPU time per command (stub bus):")
+    for name, public, unchecked in results:
+        print("  {:27} public {:5.2f} us, unchecked {:5.2f} us ({:.1f}x)".format(name, public, unchecked, public / unchecked))
+
+
+def bench_text_encoding(num_iterations: int = 20000):
+    """Measures the host CPU time needed to translate a label to LCD character codes"""
+    lcd = LCD1602(lcdsim.CountingBus())
+    lcd.init()
+    lcd.map_character(chr(176), 0)
+    character_map = {chr(176): 0}
+    labels = ["Temp:", "Humidity:", "21{}C".format(chr(176)), "45%"]
+
+    # Per character lookup (what `write_text()` used to do)
+    started_at = perf_counter()
+    for idx in range(num_iterations):
+        charcodes = []
+        for char in labels[idx % len(labels)]:
+            charcode = character_map[char] if char in character_map else ord(char)
+            charcodes.append(0x20 if charcode > 0xFF else charcode)
+    legacy = (perf_counter() - started_at) / num_iterations
+
+    started_at = perf_counter()
+    for idx in range(num_iterations):
+        lcd._encode_text(labels[idx % len(labels)])
+    cached = (perf_counter() - started_at) / num_iterations
+
+    print("Host CPU time per label:")
+    print("  per character: {:6.2f} us".format(legacy * 1000000))
+    print("  table + cache: {:6.2f} us".format(cached * 1000000))
+
+
+def bench_deferred_wait(num_frames: int = 100, work_us: int = 1000):
+    """Compares the time per frame when host work overlaps the LCD execution time"""
+    print("Time per frame with {} us of host work between commands (emulated HD44780):".format(work_us))
+    for name in ("4-bit", "I2C"):
+        results = {}
+        for deferred in (False, True):
+            controller = lcdsim.HD44780(strict=True)
+            if name == "4-bit":
+                wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=[7, 6, 5, 4])
+                lcd = LCD1602.begin_4bit(rs=2, e=3, db_7_to_4=[7, 6, 5, 4])
+            else:
+                wiring = lcdsim.PCF8574(controller)
+                lcd = LCD1602.begin_i2c(bus_id=0, scl=1, sda=0)
+            if deferred:
+                lcd.set_deferred_wait_on()
+
+            started_at = time.ticks_us()
+            for frame in range(num_frames):
+                lcd.clear()
+                time.sleep_us(work_us)  # Simulated sensor read and text formatting
+                lcd.write_text(0, 0, "Frame {}".format(frame))
+                time.sleep_us(work_us)
+                lcd.home()
+            lcd.set_deferred_wait_off()
+            elapsed = time.ticks_diff(time.ticks_us(), started_at)
+            wiring.detach()
+
+            # A violation would have raised an AssertionError (strict controller)
+            assert controller.num_timing_violations == 0
+            assert controller.get_visible_text(0) == "Frame {}        ".format(num_frames - 1)
+            results[deferred] = elapsed // num_frames
+
+        print("  {:5}: blocking {:6} us, deferred {:6} us, 0 timing violations".format(name, results[False], results[True]))
+
+
+def bench_pio_buses():
+    """Compares the CPU-side bus operations of a full screen redraw, bit-banged vs PIO"""
+    print("Full screen redraw, CPU-side bus operations (pin level changes or FIFO words):")
+    for name in ("4-bit", "PIO4", "8-bit", "PIO8"):
+        controller = lcdsim.HD44780(strict=True)
+        db_pins = [7, 6, 5, 4] if "4" in name else [13, 12, 11, 10, 9, 8, 7, 6]
+        wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=db_pins)
+        if name == "4-bit":
+            lcd = LCD1602(HD44780Bus4(rs=2, e=3, db_7_to_4=db_pins))
+        elif name == "8-bit":
+            lcd = LCD1602(HD44780Bus8(rs=2, e=3, db_7_to_0=db_pins))
+        elif name == "PIO4":
+            lcd = LCD1602(HD44780BusPIO4(rs=2, e=3, db_7_to_4=db_pins))
+        else:
+            lcd = LCD1602(HD44780BusPIO8(rs=2, e=3, db_7_to_0=db_pins))
+        lcd.init()
+
+        sm = getattr(lcd._bus, "_sm", None)
+        num_pin_writes = wiring.num_pin_writes
+        num_words = 0 if sm is None else sm.num_words
+        lcd.write_text(0, 0, "0123456789ABCDEF")
+        lcd.write_text(0, 1, "FEDCBA9876543210")
+        wiring.detach()
+        if sm is not None:
+            sm.active(0)
+
+        assert controller.get_visible_text(1) == "FEDCBA9876543210"
+        if sm is None:
+            print("  {:6}: {:5} pin changes".format(name, wiring.num_pin_writes - num_pin_writes))
+        else:
+            print("  {:6}: {:5} FIFO words".format(name, sm.num_words - num_words))
+
+
+def bench_sio_data_pins():
+    """Counts the GPIO accesses per character, one pin at a time vs SIO registers (RP2040)"""
+    from lcd1602._sio import _SIO
+
+    print("GPIO accesses per character (Pin calls or mem32 accesses):")
+    text = "0123456789ABCDEF"
+    for width in (4, 8):
+        results = {}
+        for use_sio in (False, True):
+            _SIO.AVAILABLE = use_sio  # Emulate an RP2040 (SIO registers)
+            controller = lcdsim.HD44780(strict=True)
+            db_pins = [7, 6, 5, 4] if width == 4 else [13, 12, 11, 10, 9, 8, 7, 6]
+            wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=db_pins, rw=1)
+            if width == 4:
+                lcd = LCD1602.begin_4bit(rs=2, e=3, db_7_to_4=db_pins, rw=1)
+            else:
+                lcd = LCD1602.begin_8bit(rs=2, e=3, db_7_to_0=db_pins, rw=1)
+
+            num_io_calls = lcdsim._host.num_io_calls
+            lcd.write_text(0, 0, text)
+            results[use_sio] = (lcdsim._host.num_io_calls - num_io_calls) / len(text)
+            wiring.detach()
+            assert controller.get_visible_text(0) == text
+        _SIO.AVAILABLE = False
+
+        print("  {}-bit: per pin {:5.1f}, SIO {:5.1f}".format(width, results[False], results[True]))
+
+
+def bench_busy_flag_polling():
+    """Counts the Pin objects created per busy-flag poll, new Pin per mode switch vs reused Pin"""
+    from machine import Pin
+    from lcd1602._datapin import _DataPin
+
+    class _NewPinDataPin(_DataPin):
+        # Previous implementation: a new Pin object for each mode switch
+        def mode(self, mode: int):
+            self._pin = Pin(self._pin_num, mode)
+
+    print("Pin objects created per busy-flag poll (8-bit bus):")
+    for name in ("new Pin", "reused"):
+        controller = lcdsim.HD44780(strict=True)
+        db_pins = [13, 12, 11, 10, 9, 8, 7, 6]
+        wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=db_pins, rw=1)
+        lcd = LCD1602.begin_8bit(rs=2, e=3, db_7_to_0=db_pins, rw=1)
+        bus = lcd._bus
+        if name == "new Pin":
+            bus._data_pins = [_NewPinDataPin(pin) for pin in db_pins]
+
+        # Poll the busy flag instead of waiting fixed delays
+        lcd._is_calibrated = False
+        read_unchecked = bus._read_unchecked
+        num_polls = [0]
+
+        def counting_read_unchecked(cmd: int) -> int:
+            num_polls[0] += 1
+            return read_unchecked(cmd)
+
+        bus._read_unchecked = counting_read_unchecked
+        num_instances = Pin.num_instances
+        for _ in range(10):
+            lcd.clear()
+        wiring.detach()
+        print("  {:8}: {:4.1f} ({} polls)".format(name, (Pin.num_instances - num_instances) / num_polls[0], num_polls[0]))
+
+
+def bench_async_lcd(num_frames: int = 20):
+    """Counts the ticks of a 1ms task while the LCD initializes and clears, blocking vs async"""
+
+    async def ticker(counter: list):
+        while True:
+            await asyncio.sleep_ms(1)
+            counter[0] += 1
+
+    async def run(is_async: bool) -> tuple:
+        controller = lcdsim.HD44780(strict=True)
+        wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=[7, 6, 5, 4], rw=1)
+        bus = HD44780Bus4(rs=2, e=3, db_7_to_4=[7, 6, 5, 4], rw=1)
+        counter = [0]
+        task = asyncio.create_task(ticker(counter))
+        await asyncio.sleep_ms(0)
+
+        if is_async:
+            lcd = AsyncLCD1602(bus)
+            await lcd.init()
+            init_ticks = counter[0]
+            for frame in range(num_frames):
+                await lcd.clear()
+                await lcd.write_text(0, 0, "Frame {}".format(frame))
+                await lcd.flush()
+        else:
+            lcd = LCD1602(bus)
+            lcd.init()
+            init_ticks = counter[0]
+            for frame in range(num_frames):
+                lcd.clear()
+                lcd.write_text(0, 0, "Frame {}".format(frame))
+                await asyncio.sleep_ms(0)
+
+        task.cancel()
+        wiring.detach()
+        assert controller.get_visible_text(0) == "Frame {}        ".format(num_frames - 1)
+        return (init_ticks, counter[0] - init_ticks)
+
+    print("Ticks of a 1ms task, init + {} clear/write frames (emulated 4-bit bus):".format(num_frames))
+    print("  blocking: {:4} during init, {:4} during frames".format(*asyncio.run(run(False))))
+    print("  async:    {:4} during init, {:4} during frames".format(*asyncio.run(run(True))))
+
+
+def bench_i2c_group(addrs: tuple = (0x20, 0x21, 0x22, 0x23), freq: int = 400000):
+    """Compares the init, clear + redraw and buffered update of several LCDs on one I2C bus, separate buses vs group"""
+    results = {}
+    for is_group in (False, True):
+        saved_devices = dict(lcdsim._host.I2C_DEVICES)
+        lcdsim._host.I2C_DEVICES.clear()
+        controllers = [lcdsim.HD44780(strict=True) for _ in addrs]
+        backpacks = [lcdsim.PCF8574(controller, addr) for controller, addr in zip(controllers, addrs)]
+
+        started_at = time.ticks_us()
+        if is_group:
+            group = LCD1602Group.begin_i2c(bus_id=0, scl=1, sda=0, addrs=list(addrs), freq=freq)
+            lcds = group.lcds
+            num_scans = group._i2c.num_scans
+        else:
+            lcds = [LCD1602.begin_i2c(bus_id=0, scl=1, sda=0, addr=addr, freq=freq) for addr in addrs]
+            num_scans = sum(lcd._bus._i2c.num_scans for lcd in lcds)
+        init_us = time.ticks_diff(time.ticks_us(), started_at)
+
+        started_at = time.ticks_us()
+        for lcd in lcds:
+            lcd.clear()
+        for idx, lcd in enumerate(lcds):
+            lcd.write_text(0, 0, "Display #{}".format(idx))
+            lcd.write_text(0, 1, "0x{:02X}".format(addrs[idx]))
+        redraw_us = time.ticks_diff(time.ticks_us(), started_at)
+
+        # Buffered update of both lines: the group interleaves the displays,
+        # separate LCDs are flushed one after the other
+        for idx, lcd in enumerate(lcds):
+            lcd.set_buffering_on()
+            lcd.write_text(0, 0, "Frame 1 on #{}".format(idx))
+            lcd.write_text(0, 1, "Updated 0x{:02X}".format(addrs[idx]))
+        started_at = time.ticks_us()
+        if is_group:
+            group.flush()
+        else:
+            for lcd in lcds:
+                lcd.flush()
+        for lcd in lcds:
+            lcd.set_deferred_wait_off()
+        flush_us = time.ticks_diff(time.ticks_us(), started_at)
+
+        for idx, controller in enumerate(controllers):
+            assert controller.num_timing_violations == 0, controller.last_violation
+            assert controller.get_visible_text(0) == "Frame 1 on #{}   ".format(idx)
+            assert controller.get_visible_text(1) == "Updated 0x{:02X}    ".format(addrs[idx])
+        for backpack in backpacks:
+            backpack.detach()
+        lcdsim._host.I2C_DEVICES.update(saved_devices)
+        results[is_group] = (init_us, redraw_us, flush_us, num_scans)
+
+    print("{} LCDs on one I2C bus @ {}KHz (simulated time):".format(len(addrs), freq // 1000))
+    print("  separate buses: init {:7} us, clear + redraw {:6} us, flush {:6} us, {} scans".format(*results[False]))
+    print("  group:          init {:7} us, clear + redraw {:6} us, flush {:6} us, {} scans".format(*results[True]))
+
+
+def bench_profiler(num_iterations: int = 2000):
+    """Reports the profiler counters of a screen update on the emulated 4-bit bus, and its host CPU cost"""
+    controller = lcdsim.HD44780(strict=True)
+    wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=[7, 6, 5, 4], rw=1)
+    lcd = LCD1602.begin_4bit(rs=2, e=3, db_7_to_4=[7, 6, 5, 4], rw=1)
+    profiler = LCDProfiler(lcd, trace_size=8)
+
+    profiler.enable()
+    lcd.clear()
+    lcd.write_text(0, 0, "Temp:  21{}C".format(chr(0xDF)))
+    lcd.write_text(0, 1, "Humidity: 45%")
+    stats = profiler.stats(reset=True)
+    print("Profiler counters, clear + 2 lines (emulated 4-bit bus):")
+    for name in ("data_writes", "ddram_sets", "clear_home", "pin_writes", "bus_us", "sleep_us"):
+        print("  {:12} {:6}".format(name, stats[name]))
+
+    profiler.disable()
+    wiring.detach()
+
+    # Host CPU time per write_text() on a stub bus: never enabled vs disabled vs enabled
+    lcd = LCD1602(lcdsim.CountingBus())
+    lcd.init()
+    profiler = LCDProfiler(lcd, trace_size=8)
+    results = []
+    for state in ("never enabled", "disabled", "enabled"):
+        if state == "disabled":
+            profiler.enable()
+            profiler.disable()
+        elif state == "enabled":
+            profiler.enable()
+        started_at = perf_counter()
+        for _ in range(num_iterations):
+            lcd.write_text(0, 0, "Temp:  21 C")
+        results.append((state, (perf_counter() - started_at) / num_iterations * 1000000))
+    profiler.disable()
+
+    print("Host CPU time per write_text() (stub bus):")
+    for state, elapsed in results:
+        print("  {:13}: {:6.2f} us".format(state, elapsed))
+
+
+def bench_display_marquee(num_steps: int = 80):
+    """Compares the commands per scroll step of two long lines, software vs hardware scrolling"""
+    controller = lcdsim.HD44780(strict=True)
+    wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=[7, 6, 5, 4], rw=1)
+    lcd = LCD1602.begin_4bit(rs=2, e=3, db_7_to_4=[7, 6, 5, 4], rw=1)
+    profiler = LCDProfiler(lcd)
+    texts = ("SENSOR ERROR! Check the wiring", "[Errno 110] ETIMEDOUT: the sensor did not answer in time")
+
+    print("Commands per scroll step, {} and {} characters (emulated 4-bit bus):".format(*map(len, texts)))
+    for name, mode in (("software", Display.SCROLL_SOFTWARE), ("hardware", Display.SCROLL_HARDWARE)):
+        lcd.home()
+        display = Display(lcd, autoscroll_speed_ms=100, scroll_mode=mode)
+        display._lines[0].set_text(texts[0])
+        display._lines[1].set_text(texts[1])
+        display.refresh()
+
+        profiler.enable()
+        for _ in range(num_steps):
+            time.sleep_ms(100)
+            display.refresh()
+        stats = profiler.stats(reset=True)
+        profiler.disable()
+
+        num_cmds = sum(stats[name] for name in ("data_writes", "ddram_sets", "clear_home", "other_cmds"))
+        print("  {}: {:5.2f}".format(name, num_cmds / num_steps))
+    wiring.detach()
+
+
+def bench_display_wakeups(duration_ms: int = 60000):
+    """Compares the main loop wake-ups of a scrolling display, 10ms polling vs sleeping until the next deadline, and counts those of `main.py`"""
+    controller = lcdsim.HD44780(strict=True)
+    wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=[7, 6, 5, 4], rw=1)
+    lcd = LCD1602.begin_4bit(rs=2, e=3, db_7_to_4=[7, 6, 5, 4], rw=1)
+
+    results = {}
+    for name in ("polling", "deadline"):
+        display = Display(lcd, autoscroll_speed_ms=2000)
+        display._lines[0].set_text("Temp: 21C")
+        display._lines[1].set_text("Humidity: 45% (outdoor sensor)")
+        frames = []
+        num_wakeups = 0
+        started_at = time.ticks_ms()
+        while time.ticks_diff(time.ticks_ms(), started_at) < duration_ms:
+            num_wakeups += 1
+            display.refresh()
+            text = controller.get_visible_text(1)
+            if not frames or frames[-1][1] != text:
+                frames.append((time.ticks_diff(time.ticks_ms(), started_at), text))
+
+            if name == "polling":
+                time.sleep_ms(10)
+            else:
+                deadline = display.get_next_refresh_ms()
+                time.sleep_ms(max(0, time.ticks_diff(deadline, time.ticks_ms())))
+        results[name] = (num_wakeups, frames)
+    wiring.detach()
+
+    # Same frames, at the same times (polling is up to 10ms late)
+    assert [text for _, text in results["polling"][1]] == [text for _, text in results["deadline"][1]]
+    max_lag = max(p[0] - d[0] for p, d in zip(results["polling"][1], results["deadline"][1]))
+    print("Main loop wake-ups over {}s, one scrolling line:".format(duration_ms // 1000))
+    print("  polling:  {:5} wake-ups".format(results["polling"][0]))
+    print("  deadline: {:5} wake-ups, unsliced sleeps (polling lags by up to {}ms)".format(results["deadline"][0], max_lag))
+
+    # The loop of `main.py`, idle: a sensor read every 2s and nothing to
+    # scroll. Its sleeps are sliced so that a button push is handled quickly.
+    import main
+
+    controller = lcdsim.HD44780(strict=True)
+    wiring = lcdsim.ParallelWiring(controller, rs=main.LCD_RS_PIN, e=main.LCD_E_PIN, db_pins=main.LCD_DB_7_TO_4_PINS, rw=main.LCD_RW_PIN)
+    program = main.Program(main.BTN_TEMP_UNIT_TOGGLE_PIN, main.SENSOR_PIN)
+    program._serial_print = lambda msg: None
+    num_wakeups = 0
+    started_at = time.ticks_ms()
+
+    def counting_sleep_ms(ms: int):
+        nonlocal num_wakeups
+        num_wakeups += 1
+        time.sleep_ms(ms)
+        if time.ticks_diff(time.ticks_ms(), started_at) >= duration_ms:
+            program.stop()
+
+    program._sleep_ms = counting_sleep_ms
+    program.run()
+    wiring.detach()
+    assert controller.get_visible_text(1).startswith("Humidity: 45%")
+    print("  main.py:  {:5} wake-ups (idle, sleeps sliced to {}ms)".format(num_wakeups, program._max_sleep_ms))
+
+
+def bench_layout(num_frames: int = 50):
+    """Compares the commands of a 20x4 dashboard, full redraw vs layout, one sensor reading per frame"""
+    controller = lcdsim.HD44780(strict=True)
+    wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=[7, 6, 5, 4], rw=1)
+    lcd = LCD1602.begin_4bit(rs=2, e=3, db_7_to_4=[7, 6, 5, 4], rw=1)
+    profiler = LCDProfiler(lcd)
+    temps = [21.0 + (frame % 5) / 10 for frame in range(num_frames)]
+
+    # Full redraw: the 4 lines are formatted and written on each frame
+    profiler.enable()
+    for temp in temps:
+        lcd.write_text(0, 0, "Temp:  {:>5.1f}C      ".format(temp))
+        lcd.write_text(0, 1, "{:<20}".format(chr(0xFF) * int(temp / 2)))
+        lcd.write_text(20, 0, "Humidity:   45%     ")
+        lcd.write_text(20, 1, "                    ")
+    full = profiler.stats(reset=True)
+
+    layout = LCDLayout(lcd, num_cols=20, num_lines=4)
+    layout.add_region("temp_label", 0, 0, 6, LabelWidget("Temp:"))
+    layout.add_region("temp", 0, 6, 7, NumericWidget(decimals=1, suffix="C"))
+    layout.add_region("temp_bar", 1, 0, 20, BarGraphWidget(0, 40))
+    layout.add_region("humidity", 2, 0, 16, MarqueeWidget("Humidity:   45%"))
+    layout.add_region("alert", 3, 0, 20, AlertWidget("SENSOR ERROR!"))
+    for temp in temps:
+        layout.get_widget("temp").set_value(temp)
+        layout.get_widget("temp_bar").set_value(temp)
+        layout.render()
+    incremental = profiler.stats(reset=True)
+    profiler.disable()
+    wiring.detach()
+
+    print("20x4 dashboard, {} frames (emulated 4-bit bus):".format(num_frames))
+    print("  full redraw: {:5} data writes, {:4} set address".format(full["data_writes"], full["ddram_sets"]))
+    print("  layout:      {:5} data writes, {:4} set address".format(incremental["data_writes"], incremental["ddram_sets"]))
+
+
+def bench_render_governor(num_bursts: int = 20):
+    """Compares the frames rendered for bursts of posted states (button bounce + sensor), 1000fps vs 10fps"""
+    controller = lcdsim.HD44780(strict=True)
+    wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=[7, 6, 5, 4], rw=1)
+    lcd = LCD1602.begin_4bit(rs=2, e=3, db_7_to_4=[7, 6, 5, 4], rw=1)
+
+    print("{} bursts of 6 posted states, 2ms apart (emulated 4-bit bus):".format(num_bursts))
+    for max_fps in (1000, 10):
+        display = Display(lcd, max_fps=max_fps)
+        for burst in range(num_bursts):
+            # The button bounces (unit toggled back and forth), then the sensor is read
+            for post in range(5):
+                display.post_sensor_values(21, "CF"[(burst + post) % 2], 45)
+                display.refresh()
+                time.sleep_ms(2)
+            display.post_sensor_values(21, "CF"[(burst + 1) % 2], 45 + burst % 3)
+            for _ in range(100):
+                display.refresh()
+                time.sleep_ms(2)
+        stats = display.get_frame_stats()
+        print(
+            "  max {:4} fps: {:4} frames, {:4} coalesced, {:3} unchanged, {:5} us per frame".format(
+                max_fps, stats["frames"], stats["coalesced_posts"], stats["skipped_formats"], stats["avg_frame_us"]
+            )
+        )
+    wiring.detach()
+
+
+def _measure_alloc(func, num_iterations: int) -> float:
+    # Returns the bytes allocated per call. On MicroPython, gc.mem_alloc() is
+    # compared with the garbage collector disabled. On CPython, temporary
+    # objects are freed right away, so the peak traced by tracemalloc is used.
+    if hasattr(gc, "mem_alloc"):
+        gc.collect()
+        gc.disable()
+        before = gc.mem_alloc()
+        for _ in range(num_iterations):
+            func()
+        allocated = gc.mem_alloc() - before
+        gc.enable()
+        return allocated / num_iterations
+
+    import tracemalloc
+
+    func()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(num_iterations):
+        func()
+        tracemalloc.reset_peak()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - before
+
+
+def bench_displayline_alloc(num_iterations: int = 500):
+    """Measures the memory allocated per scroll step of a DisplayLine, string slicing vs preallocated codes"""
+    text = "Humidity: 45% (outdoor sensor)   "
+    head = [0]
+
+    def slice_step():
+        # What `DisplayLine.get_text()` used to do, including the clock reads
+        time.ticks_diff(time.ticks_ms(), 0)
+        head[0] = (head[0] + 1) % len(text)
+        tail = (head[0] + 15) % len(text)
+        if tail < head[0]:
+            return text[head[0] :] + text[: tail + 1]
+        return text[head[0] : tail + 1]
+
+    line = DisplayLine(16, 0)
+    line.set_text(text.strip())
+    line.get_codes()
+
+    print("Bytes allocated per scroll step ({}):".format("gc.mem_alloc" if hasattr(gc, "mem_alloc") else "tracemalloc peak"))
+    print("  string slicing:     {:6.1f}".format(_measure_alloc(slice_step, num_iterations)))
+    print("  preallocated codes: {:6.1f}".format(_measure_alloc(line.get_codes, num_iterations)))
+    if not hasattr(gc, "mem_alloc"):
+        # Unlike MicroPython, CPython allocates integers above 256 (such as
+        # ticks) and `range()` objects, so these figures are only indicative.
+        print("  (CPython figures include boxed integers and range objects, which MicroPython does not allocate)")
+
+
+if __name__ == "__main__":
+    bench_buffered_dashboard()
+    bench_i2c_streaming()
+    bench_i2c_delays()
+    bench_validation_overhead()
+    bench_text_encoding()
+    bench_deferred_wait()
+    bench_emulated_buses()
+    bench_pio_buses()
+    bench_sio_data_pins()
+    bench_busy_flag_polling()
+    bench_async_lcd()
+    bench_i2c_group()
+    bench_i2c_group(freq=1000000)
+    bench_profiler()
+    bench_display_marquee()
+    bench_display_wakeups()
+    bench_layout()
+    bench_render_governor()
+    bench_displayline_alloc()
@@ -0,0 +1,330 @@
+""" Behavior checks for the LCD1602 library
+
+Run from the lesson directory with: `python -m lcdsim.checks`
+
+Each check drives the library against the emulated HD44780 controller (or a
+stub bus) and asserts what the controller shows and that no timing constraint
+is violated. A failed check raises an AssertionError.
+"""
+
+import gc
+import lcdsim
+from display.display import Display
+import uasyncio as asyncio
+import utime as time
+from lcd1602 import AsyncLCD1602, HD44780Bus4, LCD1602, LCD1602Group, LCDLayout, NumericWidget, HD44780Cmds
+
+
+def _connect(name: str, controller: lcdsim.HD44780):
+    # Connects the controller to the bus named `name` and returns the wiring
+    # and the initialized LCD
+    if name == "4-bit":
+        wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=[7, 6, 5, 4], rw=1)
+        return wiring, LCD1602.begin_4bit(rs=2, e=3, db_7_to_4=[7, 6, 5, 4], rw=1)
+    if name == "4-bit, no RW":
+        wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=[7, 6, 5, 4])
+        return wiring, LCD1602.begin_4bit(rs=2, e=3, db_7_to_4=[7, 6, 5, 4])
+    if name == "I2C":
+        return lcdsim.PCF8574(controller), LCD1602.begin_i2c(bus_id=0, scl=1, sda=0)
+    raise ValueError(name)
+
+
+def _write_data(text: str) -> list[int]:
+    return [HD44780Cmds.C10_WRITE_DATA | ord(char) for char in text]
+
+
+def check_i2c_write_many_delays():
+    """Checks I2C batches for delays from none to longer than a batch buffer can pad"""
+    for freq in (100000, 400000):
+        controller = lcdsim.HD44780(strict=True)
+        backpack = lcdsim.PCF8574(controller)
+        lcd = LCD1602.begin_i2c(bus_id=0, scl=1, sda=0, freq=freq)
+        for delay_us in (LCD1602._EXECTIMEUS_SHORT, 1000, 10000, 100000):
+            started_at = time.ticks_us()
+            lcd._bus.write_many([HD44780Cmds.C08_SET_DDRAM_ADDRESS] + _write_data("AB"), delay_us)
+            assert time.ticks_diff(time.ticks_us(), started_at) >= 2 * delay_us, (freq, delay_us)
+            time.sleep_us(delay_us)
+            assert controller.get_visible_text(0).startswith("AB"), (freq, delay_us)
+        backpack.detach()
+    print("I2C write_many() delays: OK")
+
+
+def check_deferred_wait(num_frames: int = 20):
+    """Checks that deferred wait never sends a command while the controller is busy"""
+    for name in ("4-bit", "4-bit, no RW", "I2C"):
+        # From no host work at all to more than a clear command takes
+        for work_us in (0, 10, 100, 1000, 3000):
+            controller = lcdsim.HD44780(strict=True)
+            wiring, lcd = _connect(name, controller)
+            lcd.set_deferred_wait_on()
+            for frame in range(num_frames):
+                lcd.clear()
+                time.sleep_us(work_us)  # Host work while the controller executes
+                lcd.write_text(0, 0, "Frame {}".format(frame))
+                time.sleep_us(work_us)
+                lcd.home()
+                lcd.write_text(0, 1, "{} us".format(work_us))
+            lcd.set_deferred_wait_off()
+            wiring.detach()
+
+            assert controller.num_timing_violations == 0, (name, work_us, controller.last_violation)
+            assert controller.get_visible_text(0) == "{:<16}".format("Frame {}".format(num_frames - 1)), (name, work_us)
+            assert controller.get_visible_text(1) == "{:<16}".format("{} us".format(work_us)), (name, work_us)
+    print("Deferred wait: OK")
+
+
+def check_text_cache():
+    """Checks the LRU eviction of the encoded text cache"""
+    lcd = LCD1602(lcdsim.CountingBus())
+    lcd.init()
+    labels = ["Label {}".format(idx) for idx in range(LCD1602._TEXT_CACHE_SIZE)]
+    for label in labels:
+        lcd._encode_text(label)
+
+    # The first label is used again, so the second one is the least recently used
+    assert lcd._encode_text(labels[0]) == labels[0].encode()
+    lcd._encode_text("New label")
+    assert labels[1] not in lcd._text_cache and labels[0] in lcd._text_cache
+    assert sorted(lcd._text_lru) == sorted(lcd._text_cache) and lcd._text_lru[-2:] == [labels[0], "New label"]
+
+    # Long strings are not cached, and mapping a character empties the cache
+    assert lcd._encode_text("x" * 41) == b"x" * 41 and len(lcd._text_cache) == LCD1602._TEXT_CACHE_SIZE
+    lcd.map_character(chr(0x2103), 1)
+    assert lcd._text_cache == {} and lcd._text_lru == [] and lcd._encode_text("21" + chr(0x2103)) == b"21\x01"
+    print("Text cache: OK")
+
+
+def check_raw_commands():
+    """Checks the address counter tracking after raw commands sent with `execute_command()`"""
+    controller = lcdsim.HD44780(strict=True)
+    wiring, lcd = _connect("4-bit", controller)
+
+    def check_cursor_position():
+        cell_idx = LCD1602._addr_to_cell(controller.address_counter)
+        assert lcd.get_cursor_position() == (cell_idx % LCD1602._LINE_LENGTH, cell_idx // LCD1602._LINE_LENGTH)
+
+    # Right to left, then left to right again
+    lcd.execute_command(HD44780Cmds.C03_ENTRY_MODE_SET | HD44780Cmds.C03_ARG_RIGHT_TO_LEFT)
+    lcd.write_text(5, 0, "AB")
+    assert lcd.get_cursor_position() == (3, 0)
+    check_cursor_position()
+    lcd.write_text(3, 0, "CD")
+    check_cursor_position()
+    lcd.execute_command(HD44780Cmds.C03_ENTRY_MODE_SET | HD44780Cmds.C03_ARG_LEFT_TO_RIGHT)
+    lcd.write_text(6, 0, "EF")
+    check_cursor_position()
+    assert controller.get_visible_text(0) == "  DCBAEF        "
+
+    # Display control: the cursor is turned on by a raw command, and stays on
+    lcd.execute_command(HD44780Cmds.C04_DISPLAY_CONTROL | HD44780Cmds.C04_ARG_DISPLAY_ON | HD44780Cmds.C04_ARG_CURSOR_ON)
+    lcd.set_display_off()
+    lcd.set_display_on()
+    assert controller.is_display_on and controller.is_cursor_on
+    wiring.detach()
+    print("Raw commands: OK")
+
+
+def check_async_flush():
+    """Checks that `AsyncLCD1602.flush()` waits for commands queued meanwhile, and reports bus errors"""
+
+    async def run():
+        controller = lcdsim.HD44780(strict=True)
+        wiring = lcdsim.ParallelWiring(controller, rs=2, e=3, db_pins=[7, 6, 5, 4], rw=1)
+        lcd = AsyncLCD1602(HD44780Bus4(rs=2, e=3, db_7_to_4=[7, 6, 5, 4], rw=1))
+        await lcd.init()
+        lcd.lcd.scroll_display_left()
+
+        # Record whether flush() has already returned (or is about to) when
+        # the home command is executed
+        execute_unchecked = lcd.lcd._execute_unchecked
+        executed_when_idle = []
+
+        def recording_execute_unchecked(cmd: int) -> int | None:
+            if cmd == HD44780Cmds.C02_HOME:
+                executed_when_idle.append(lcd._is_idle.is_set())
+            return execute_unchecked(cmd)
+
+        lcd.lcd._execute_unchecked = recording_execute_unchecked
+
+        # The background task waits for the clear command to complete when
+        # the home command is queued
+        await lcd.clear()
+        flush = asyncio.create_task(lcd.flush())
+        for _ in range(3):
+            await asyncio.sleep_ms(0)
+        assert lcd.lcd._pending_cmd == HD44780Cmds.C01_CLEAR
+        await lcd.home()
+        await lcd.write_text(0, 0, "Hello")
+        await asyncio.wait_for(flush, 1)
+        assert executed_when_idle == [False], executed_when_idle
+        assert lcd._cmds == [] and controller.display_shift == 0
+        assert controller.get_visible_text(0) == "Hello           "
+        lcd.lcd._execute_unchecked = execute_unchecked
+
+        # A bus error is raised by flush(), once
+        write_many_unchecked = lcd.lcd._bus._write_many_unchecked
+
+        def failing_write_many_unchecked(cmds: list[int], delay_us: int):
+            raise OSError(5)  # EIO
+
+        lcd.lcd._bus._write_many_unchecked = failing_write_many_unchecked
+        await lcd.write_text(0, 1, "World")
+        try:
+            await asyncio.wait_for(lcd.flush(), 1)
+            raise AssertionError("flush() did not raise")
+        except OSError as ex:
+            assert ex.args[0] == 5
+
+        lcd.lcd._bus._write_many_unchecked = write_many_unchecked
+        await lcd.write_text(0, 1, "World")
+        await asyncio.wait_for(lcd.flush(), 1)
+        assert controller.get_visible_text(1) == "World           "
+        lcd._task.cancel()
+        wiring.detach()
+
+    asyncio.run(run())
+    print("Async flush: OK")
+
+
+def check_group_flush(addrs: tuple = (0x20, 0x21, 0x22)):
+    """Checks the interleaved flush of a group, with a different amount of changes per display"""
+    saved_devices = dict(lcdsim._host.I2C_DEVICES)
+    lcdsim._host.I2C_DEVICES.clear()
+    controllers = [lcdsim.HD44780(strict=True) for _ in addrs]
+    backpacks = [lcdsim.PCF8574(controller, addr) for controller, addr in zip(controllers, addrs)]
+    group = LCD1602Group.begin_i2c(bus_id=0, scl=1, sda=0, addrs=list(addrs), freq=1000000)
+    for lcd in group.lcds:
+        lcd.set_buffering_on()
+
+    # The first display has no changes, the last one has the most
+    texts = ["", "Short", "A longer line"]
+    for lcd, text in zip(group.lcds, texts):
+        lcd.write_text(0, 1, text)
+    group.flush()
+    for controller, text in zip(controllers, texts):
+        assert controller.get_visible_text(1) == "{:<16}".format(text)
+
+    # A forced flush rewrites everything, starting from the tracked address
+    # counters, and a right to left entry mode is restored
+    group.lcds[0].execute_command(HD44780Cmds.C03_ENTRY_MODE_SET | HD44780Cmds.C03_ARG_RIGHT_TO_LEFT)
+    group.lcds[2].write_text(3, 0, "XY")
+    group.flush(force=True)
+    for lcd in group.lcds:
+        lcd.set_deferred_wait_off()
+    assert controllers[2].get_visible_text(0) == "   XY           "
+    assert not controllers[0].is_increment and group.lcds[0]._address_counter == controllers[0].address_counter
+    for controller in controllers:
+        assert controller.num_timing_violations == 0, controller.last_violation
+    for backpack in backpacks:
+        backpack.detach()
+    lcdsim._host.I2C_DEVICES.update(saved_devices)
+    print("Group flush: OK")
+
+
+def check_numeric_widget():
+    """Checks that a numeric widget is only placed in a region wider than its suffix"""
+    lcd = LCD1602(lcdsim.CountingBus())
+    lcd.init()
+    layout = LCDLayout(lcd)
+    for width in (2, 3):
+        try:
+            layout.add_region("too narrow", 0, 0, width, NumericWidget(suffix="km/h"[:width]))
+            raise AssertionError("add_region() did not raise")
+        except ValueError:
+            pass
+
+    widget = NumericWidget(decimals=1, suffix="C")
+    layout.add_region("temp", 0, 0, 2, widget)
+    for value, text in ((None, "-C"), (5, "#C"), (5.25, "#C")):
+        widget.set_value(value)
+        assert widget._render(2, 0) == text, (value, widget._render(2, 0))
+    widget = NumericWidget(suffix="C")
+    layout.add_region("count", 0, 2, 2, widget)
+    widget.set_value(7)
+    assert widget._render(2, 0) == "7C"
+    print("Numeric widget: OK")
+
+
+def check_display_max_fps():
+    """Checks that the display rejects a frame rate cap below 1"""
+    lcd = LCD1602(lcdsim.CountingBus())
+    for max_fps in (0, -10):
+        try:
+            Display(lcd, max_fps=max_fps)
+            raise AssertionError("Display() did not raise")
+        except ValueError:
+            pass
+    assert Display(lcd, max_fps=1)._frame_interval_ms == 1000
+    print("Display frame rate cap: OK")
+
+
+def check_scroll_alloc(num_steps: int = 100):
+    """Checks that a software scroll step, from `Display._render()` to the bus, does not allocate memory"""
+    bus = lcdsim.CountingBus()
+    lcd = LCD1602(bus)
+    lcd.init()
+    display = Display(lcd, autoscroll_speed_ms=0)
+    display._lines[0].set_text("Temp: 21C (outdoor sensor, north side)")
+    display._lines[1].set_text("Humidity: 45% (outdoor sensor)")
+
+    # The first frames draw the lines, and create the views of the buffers
+    for _ in range(3):
+        display._render()
+    bus.reset()
+
+    # Only MicroPython provides `gc.mem_alloc()`. Elsewhere, only the commands
+    # sent are checked, and the allocations are reported as not verified.
+    can_measure = hasattr(gc, "mem_alloc")
+    if can_measure:
+        gc.collect()
+        gc.disable()
+        before = gc.mem_alloc()
+    for _ in range(num_steps):
+        display._render()
+    if can_measure:
+        allocated = gc.mem_alloc() - before
+        gc.enable()
+        assert allocated == 0, allocated
+
+    # Both lines scroll on each step
+    assert bus.num_data_writes == num_steps * 2 * 16 and bus.num_addr_sets == num_steps * 2
+    if can_measure:
+        print("Scroll step allocations: OK")
+    else:
+        print("Scroll step allocations: NOT VERIFIED (gc.mem_alloc() is only available on MicroPython), commands OK")
+
+
+def check_sio_detection():
+    """Checks that the SIO registers are only used on an RP2040, not on other rp2 chips"""
+    import importlib
+    import os
+    import sys
+    from lcd1602 import _sio
+
+    class uname_result:
+        def __init__(self, machine: str):
+            self.machine = machine
+
+    platform, uname = sys.platform, os.uname
+    try:
+        sys.platform = "rp2"
+        for machine, is_available in (("Raspberry Pi Pico with RP2040", True), ("Raspberry Pi Pico 2 with RP2350", False)):
+            os.uname = lambda: uname_result(machine)
+            assert importlib.reload(_sio)._SIO.AVAILABLE == is_available, machine
+    finally:
+        sys.platform, os.uname = platform, uname
+        importlib.reload(_sio)
+    print("SIO detection: OK")
+
+
+if __name__ == "__main__":
+    check_i2c_write_many_delays()
+    check_deferred_wait()
+    check_text_cache()
+    check_raw_commands()
+    check_async_flush()
+    check_group_flush()
+    check_numeric_widget()
+    check_display_max_fps()
+    check_scroll_alloc()
+    check_sio_detection()
@@ -0,0 +1,83 @@
+import utime as time
+from lcd1602._helper import _Helper
+from lcd1602.hd44780bus import HD44780Bus
+from lcd1602.hd44780cmds import HD44780Cmds
+
+
+class CountingBus(HD44780Bus):
+    """A fake HD44780 bus that counts the commands it receives
+
+    No display is attached to this bus: write operations are only counted and
+    read operations are not supported. Commands are classified so that changes
+    to the library can be compared in terms of bus traffic:
+
+        * `num_data_writes`: C10_WRITE_DATA commands (characters and bitmaps)
+        * `num_addr_sets`: C07_SET_CGRAM_ADDRESS and C08_SET_DDRAM_ADDRESS commands
+        * `num_other_cmds`: all other commands
+
+    The bus also models the execution time of each command for a controller
+    clocked at `fosc_khz`. A command received while the previous one is still
+    executing is counted in `num_timing_violations`.
+    """
+
+    I2C_TRANSACTIONS_PER_WRITE = 6
+    """Number of I2C transactions `HD44780BusI2C` needs to send one command
+    (two nibbles, each requiring a setup, an E high and an E low transaction)."""
+
+    def __init__(self, width: int = 4, fosc_khz: int = 270):
+        super().__init__(width=width, can_read=False, can_control_backlight=False)
+        self.fosc_khz = fosc_khz
+        self._busy_until = time.ticks_us()
+        self.reset()
+
+    @property
+    def num_commands(self) -> int:
+        """Total number of commands received since the last reset"""
+        return self.num_data_writes + self.num_addr_sets + self.num_other_cmds
+
+    @property
+    def num_i2c_transactions(self) -> int:
+        """Number of I2C transactions the commands would cost on an I2C backpack"""
+        return self.num_commands * CountingBus.I2C_TRANSACTIONS_PER_WRITE
+
+    def reset(self):
+        """Resets all counters"""
+        self.num_data_writes = 0
+        self.num_addr_sets = 0
+        self.num_other_cmds = 0
+        self.num_timing_violations = 0
+
+    def _init_steps(self):
+        # Nothing to wait for
+        yield from ()
+
+    def write(self, cmd: int):
+        _Helper.validate_integer_arg("cmd", cmd, min_value=0, max_value=0b1111111111)
+        if cmd & HD44780Cmds.BITMASK_RW:
+            raise ValueError("Not a write command.")
+        self._write_unchecked(cmd)
+
+    def read(self, cmd: int) -> int:
+        raise RuntimeError("Read commands are not supported (bus is write-only).")
+
+    def set_backlight(self, enabled: bool):
+        raise RuntimeError("Backlight control is not available.")
+
+    def _write_unchecked(self, cmd: int):
+        # See HD44780 datasheet, page 24-25, Table 6 for execution times at 270KHz
+        now = time.ticks_us()
+        if time.ticks_diff(self._busy_until, now) > 0:
+            self.num_timing_violations += 1
+        is_long_cmd = cmd == HD44780Cmds.C01_CLEAR or cmd == HD44780Cmds.C02_HOME
+        exec_time_us = 1520 if is_long_cmd else 37
+        self._busy_until = time.ticks_add(now, -(-exec_time_us * 270 // self.fosc_khz))
+
+        if cmd & HD44780Cmds.BITMASK_RS:
+            self.num_data_writes += 1
+        elif cmd & (HD44780Cmds.C07_SET_CGRAM_ADDRESS | HD44780Cmds.C08_SET_DDRAM_ADDRESS):
+            self.num_addr_sets += 1
+        else:
+            self.num_other_cmds += 1
+
+    def _read_unchecked(self, cmd: int) -> int:
+        raise RuntimeError("Read commands are not supported (bus is write-only).")
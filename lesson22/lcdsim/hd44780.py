@@ -0,0 +1,281 @@
+from lcdsim import _host
+from lcd1602.hd44780cmds import HD44780Cmds
+
+
+class HD44780:
+    """Software model of the HD44780 LCD controller
+
+    The model is driven through the controller's interface pins (RS, RW, E and
+    DB7 to DB0) using `set_pins()`, and implements the HD44780 instruction set:
+
+        * DDRAM (80 characters) and CGRAM (8 custom characters)
+        * Address counter, entry mode (increment/decrement, display shift)
+        * Cursor and display shift, display control, function set
+        * 4-bit and 8-bit bus modes (nibble assembly)
+        * Busy flag, based on the execution time of each instruction
+
+    Timing is based on the simulated clock of the `lcdsim` package. The model
+    checks the following constraints (see HD44780 datasheet, page 49 and 52):
+
+        * tcycE: at least 1000ns between two rising edges of E
+        * PWEH: E remains high for at least 450ns
+        * tAS: RS and RW are stable at least 60ns before E rises
+        * No instruction nor data access while the controller is busy (such
+          operations are ignored, like a real controller would)
+
+    Violations are counted in `num_timing_violations` and described in
+    `last_violation`. When `strict` is True, a violation raises an AssertionError.
+    """
+
+    # See HD44780 datasheet, page 24-25, Table 6. Times are in ns at 270KHz.
+    _EXECTIMENS_LONG = 1520000
+    _EXECTIMENS_SHORT = 37000
+    _EXECTIMENS_RAM = 41000  # 37us + tADD (4us)
+
+    _TCYCE_NS = 1000
+    _PWEH_NS = 450
+    _TAS_NS = 60
+
+    def __init__(self, fosc_khz: int = 270, num_cols: int = 16, strict: bool = False):
+        """Initializes a new controller in its power-on reset state (8-bit bus, 1 line)
+
+        Args:
+            fosc_khz (int, optional): The oscillator frequency in KHz. Defaults to 270.
+            num_cols (int, optional): The number of visible columns. Defaults to 16.
+            strict (bool, optional): True to raise an AssertionError on timing violations. Defaults to False.
+        """
+        self.fosc_khz = fosc_khz
+        self.num_cols = num_cols
+        self.strict = strict
+
+        # Memories, indexed by address. Only 00H-27H and 40H-67H are used in
+        # 2-line mode. Only 00H-4FH are used in 1-line mode.
+        self.ddram = bytearray(b" " * 0x80)
+        self.cgram = bytearray(64)
+
+        # Registers and flags (power-on reset state, see datasheet page 23)
+        self.address_counter = 0
+        self.is_cgram_selected = False
+        self.is_increment = True
+        self.is_display_shift = False
+        self.is_display_on = False
+        self.is_cursor_on = False
+        self.is_blink_on = False
+        self.is_8bit = True
+        self.is_2lines = False
+        self.is_5x10 = False
+        self.display_shift = 0
+        self.backlight = True
+
+        # Interface state
+        self._rs = 0
+        self._rw = 0
+        self._e = 0
+        self._db = 0
+        self._rs_rw_changed_at = -HD44780._TCYCE_NS
+        self._e_rose_at = -HD44780._TCYCE_NS
+        self._busy_until = 0
+        self._is_second_nibble = False
+        self._high_nibble = 0
+        self._read_value = 0
+
+        self.num_instructions = 0
+        self.num_data_writes = 0
+        self.num_reads = 0
+        self.num_timing_violations = 0
+        self.last_violation = None
+
+    # ######################################################################## #
+    # Interface
+    # ######################################################################## #
+
+    def set_pins(self, rs: int, rw: int, e: int, db: int):
+        """Updates the level of the interface pins
+
+        Args:
+            rs (int): RS level (0 or 1).
+            rw (int): RW level (0 or 1).
+            e (int): E level (0 or 1).
+            db (int): DB7 to DB0 levels as an 8-bit integer. In 4-bit mode, only DB7 to DB4 are used.
+        """
+        now = _host.now_ns()
+        if rs != self._rs or rw != self._rw:
+            if self._e:
+                self._violation("RS/RW changed while E is high")
+            self._rs_rw_changed_at = now
+        self._rs = rs
+        self._rw = rw
+        self._db = db
+
+        if e and not self._e:
+            if now - self._e_rose_at < HD44780._TCYCE_NS:
+                self._violation("Enable cycle time (tcycE) is too short")
+            if now - self._rs_rw_changed_at < HD44780._TAS_NS:
+                self._violation("Address set-up time (tAS) is too short")
+            self._e_rose_at = now
+            if rw:
+                self._start_read()
+        elif not e and self._e:
+            if now - self._e_rose_at < HD44780._PWEH_NS:
+                self._violation("Enable pulse width (PWEH) is too short")
+            if not rw:
+                self._end_write(db)
+            else:
+                self._is_second_nibble = not self._is_second_nibble and not self.is_8bit
+        self._e = e
+
+    def get_output(self) -> int | None:
+        """Gets the levels the controller drives on DB7 to DB0
+
+        Returns:
+            int | None: DB7 to DB0 levels as an 8-bit integer or None when the controller does not drive the data pins.
+        """
+        if not (self._e and self._rw):
+            return None
+        if self.is_8bit:
+            return self._read_value
+        return (self._read_value << 4) & 0xF0 if self._is_second_nibble else self._read_value & 0xF0
+
+    # ######################################################################## #
+    # Display content
+    # ######################################################################## #
+
+    def get_visible_codes(self, line: int) -> bytes:
+        """Gets the character codes visible on a line, accounting for display shift"""
+        base = 0x40 * line if self.is_2lines else self.num_cols * line
+        line_length = 40 if self.is_2lines else 80
+        codes = bytearray(self.num_cols)
+        for col in range(self.num_cols):
+            codes[col] = self.ddram[base + (col + self.display_shift) % line_length]
+        return bytes(codes)
+
+    def get_visible_text(self, line: int) -> str:
+        """Gets the text visible on a line, accounting for display shift"""
+        return self.get_visible_codes(line).decode("latin-1")
+
+    def is_busy(self) -> bool:
+        """Indicates whether the controller is executing an instruction"""
+        return _host.now_ns() < self._busy_until
+
+    # ######################################################################## #
+    # Internals
+    # ######################################################################## #
+
+    def _violation(self, message: str):
+        self.num_timing_violations += 1
+        self.last_violation = message
+        if self.strict:
+            raise AssertionError(message)
+
+    def _set_busy(self, exectime_ns: int):
+        self._busy_until = _host.now_ns() + exectime_ns * 270 // self.fosc_khz
+
+    def _start_read(self):
+        # The whole byte is read on the first nibble in 4-bit mode
+        if self._is_second_nibble:
+            return
+
+        self.num_reads += 1
+        if not self._rs:
+            self._read_value = (0x80 if self.is_busy() else 0) | self.address_counter
+            return
+
+        if self.is_busy():
+            self._violation("Data read while busy")
+            return
+        self._read_value = self._ram_read()
+        self._move_address_counter(1 if self.is_increment else -1)
+        self._set_busy(HD44780._EXECTIMENS_RAM)
+
+    def _end_write(self, db: int):
+        if not self.is_8bit:
+            if not self._is_second_nibble:
+                self._high_nibble = db & 0xF0
+                self._is_second_nibble = True
+                return
+            self._is_second_nibble = False
+            db = self._high_nibble | (db >> 4)
+
+        if self.is_busy():
+            self._violation("Write while busy (0x{:02X} ignored)".format(db))
+            return
+
+        if self._rs:
+            self.num_data_writes += 1
+            self._ram_write(db)
+            self._move_address_counter(1 if self.is_increment else -1)
+            if self.is_display_shift and not self.is_cgram_selected:
+                self.display_shift = (self.display_shift + (1 if self.is_increment else -1)) % 40
+            self._set_busy(HD44780._EXECTIMENS_RAM)
+        else:
+            self.num_instructions += 1
+            self._execute(db)
+
+    def _execute(self, ir: int):
+        exectime_ns = HD44780._EXECTIMENS_SHORT
+        if ir & HD44780Cmds.C08_SET_DDRAM_ADDRESS:
+            self.address_counter = ir & 0x7F
+            self.is_cgram_selected = False
+        elif ir & HD44780Cmds.C07_SET_CGRAM_ADDRESS:
+            self.address_counter = ir & 0x3F
+            self.is_cgram_selected = True
+        elif ir & HD44780Cmds.C06_FUNCTION_SET:
+            self.is_8bit = bool(ir & HD44780Cmds.C06_ARG_8BIT_BUS)
+            self.is_2lines = bool(ir & HD44780Cmds.C06_ARG_2LINES_DISPLAY)
+            self.is_5x10 = bool(ir & HD44780Cmds.C06_ARG_5X11_DOTS)
+            self._is_second_nibble = False
+        elif ir & HD44780Cmds.C05_CMD_SHIFT:
+            step = 1 if ir & HD44780Cmds.C05_ARG_RIGHT else -1
+            if ir & HD44780Cmds.C05_ARG_CONTENT:
+                self.display_shift = (self.display_shift - step) % 40
+            else:
+                self._move_address_counter(step)
+        elif ir & HD44780Cmds.C04_DISPLAY_CONTROL:
+            self.is_display_on = bool(ir & HD44780Cmds.C04_ARG_DISPLAY_ON)
+            self.is_cursor_on = bool(ir & HD44780Cmds.C04_ARG_CURSOR_ON)
+            self.is_blink_on = bool(ir & HD44780Cmds.C04_ARG_CURSOR_BLINK_ON)
+        elif ir & HD44780Cmds.C03_ENTRY_MODE_SET:
+            self.is_increment = bool(ir & HD44780Cmds.C03_ARG_LEFT_TO_RIGHT)
+            self.is_display_shift = bool(ir & HD44780Cmds.C03_ARG_AUTOSCROLL_ON)
+        elif ir & HD44780Cmds.C02_HOME:
+            self.address_counter = 0
+            self.is_cgram_selected = False
+            self.display_shift = 0
+            exectime_ns = HD44780._EXECTIMENS_LONG
+        elif ir & HD44780Cmds.C01_CLEAR:
+            self.ddram[:] = b" " * len(self.ddram)
+            self.address_counter = 0
+            self.is_cgram_selected = False
+            self.is_increment = True
+            self.display_shift = 0
+            exectime_ns = HD44780._EXECTIMENS_LONG
+        self._set_busy(exectime_ns)
+
+    def _ram_read(self) -> int:
+        if self.is_cgram_selected:
+            return self.cgram[self.address_counter]
+        return self.ddram[self.address_counter]
+
+    def _ram_write(self, data: int):
+        if self.is_cgram_selected:
+            self.cgram[self.address_counter] = data & 0x1F
+        else:
+            self.ddram[self.address_counter] = data
+
+    def _move_address_counter(self, step: int):
+        addr = self.address_counter
+        if self.is_cgram_selected:
+            self.address_counter = (addr + step) & 0x3F
+        elif self.is_2lines:
+            # 00H-27H, then 40H-67H, then back to 00H
+            line = addr & 0x40
+            col = (addr & 0x3F) + step
+            if col >= 40:
+                col = 0
+                line = line ^ 0x40
+            elif col < 0:
+                col = 39
+                line = line ^ 0x40
+            self.address_counter = line | col
+        else:
+            self.address_counter = (addr + step) % 80
@@ -0,0 +1,225 @@
+from lcdsim import _host
+
+
+class PIO:
+    """Constants of the MicroPython `rp2.PIO` class used by `asm_pio()`"""
+
+    OUT_LOW = 0
+    OUT_HIGH = 1
+    IN_LOW = 2
+    IN_HIGH = 3
+    SHIFT_LEFT = 0
+    SHIFT_RIGHT = 1
+    JOIN_NONE = 0
+    JOIN_TX = 1
+    JOIN_RX = 2
+
+
+class _Emitter:
+    # Records the instructions of a program written with the `rp2.asm_pio`
+    # syntax. Each instruction is a list [opcode, args, side, delay].
+
+    def __init__(self):
+        self.instructions = []
+        self.labels = {}
+        self.wrap_target = 0
+        self.wrap = None
+
+    def make_globals(self) -> dict:
+        # Names available to the body of a program
+        names = {name: name for name in ("pins", "x", "y", "null", "osr", "isr", "pindirs", "block", "noblock")}
+        names.update({name: name for name in ("not_x", "x_dec", "not_y", "y_dec", "x_not_y", "not_osre")})
+        names.update(
+            wrap_target=self._wrap_target,
+            wrap=self._wrap,
+            label=self._label,
+            nop=lambda: self._emit("nop"),
+            jmp=lambda cond, label=None: self._emit("jmp", (None, cond) if label is None else (cond, label)),
+            pull=lambda mode="block": self._emit("pull", (mode,)),
+            out=lambda dest, count: self._emit("out", (dest, count)),
+            set=lambda dest, value: self._emit("set", (dest, value)),
+            mov=lambda dest, src: self._emit("mov", (dest, src)),
+        )
+        return names
+
+    def side(self, value: int):
+        self.instructions[-1][2] = value
+        return self
+
+    def __getitem__(self, delay: int):
+        self.instructions[-1][3] = delay
+        return self
+
+    def _emit(self, opcode: str, args: tuple = ()):
+        self.instructions.append([opcode, args, None, 0])
+        return self
+
+    def _label(self, name: str):
+        self.labels[name] = len(self.instructions)
+
+    def _wrap_target(self):
+        self.wrap_target = len(self.instructions)
+
+    def _wrap(self):
+        self.wrap = len(self.instructions) - 1
+
+
+class _Program:
+    # A program recorded by `asm_pio()`, with its configuration
+    def __init__(self, emitter: _Emitter, config: dict):
+        self.instructions = emitter.instructions
+        self.labels = emitter.labels
+        self.wrap_target = emitter.wrap_target
+        self.wrap = len(emitter.instructions) - 1 if emitter.wrap is None else emitter.wrap
+        self.config = config
+
+
+def asm_pio(**config):
+    """Stand-in for the MicroPython `rp2.asm_pio` decorator
+
+    The body of the decorated function is run once with the PIO instructions
+    injected in its globals (like MicroPython does), and the instructions are
+    recorded for `StateMachine` to interpret.
+    """
+
+    def decorator(func):
+        emitter = _Emitter()
+        func_globals = func.__globals__
+        saved_globals = dict(func_globals)
+        func_globals.clear()
+        func_globals.update(emitter.make_globals())
+        try:
+            func()
+        finally:
+            func_globals.clear()
+            func_globals.update(saved_globals)
+        return _Program(emitter, config)
+
+    return decorator
+
+
+class StateMachine:
+    """Stand-in for the MicroPython `rp2.StateMachine` class
+
+    The state machine interprets a program recorded by `asm_pio()` on the
+    simulated clock: each instruction takes 1 cycle (plus its delay) at the
+    given frequency, and drives the simulated pins. Supported instructions are
+    `nop`, `jmp`, `pull`, `out`, `set` and `mov`, with side-set. Output shifts
+    to the right. The TX FIFO holds 4 words.
+
+    Executed instructions are counted in `num_instructions` and words
+    received in `num_words`.
+    """
+
+    FIFO_DEPTH = 4
+
+    def __init__(self, id: int, program: _Program, freq: int = 125000000, *, out_base=None, set_base=None, sideset_base=None):
+        self.id = id
+        self.num_instructions = 0
+        self.num_words = 0
+        self.next_ns = None
+        self._program = program
+        self._cycle_ns = 1000000000 // freq
+        self._fifo = []
+        self._pc = program.wrap_target
+        self._regs = {"x": 0, "y": 0, "osr": 0}
+        self._out_pins = self._make_pins(out_base, program.config.get("out_init"))
+        self._set_pins = self._make_pins(set_base, program.config.get("set_init"))
+        self._sideset_pins = self._make_pins(sideset_base, program.config.get("sideset_init"))
+        _host.CLOCK_TICKERS.append(self)
+
+    def active(self, value: int | None = None) -> bool:
+        if value is None:
+            return self in _host.CLOCK_TICKERS and self.next_ns is not None
+        if value:
+            self.next_ns = _host.now_ns()
+            if self not in _host.CLOCK_TICKERS:
+                _host.CLOCK_TICKERS.append(self)
+        else:
+            self.next_ns = None
+        return bool(value)
+
+    def put(self, value: int):
+        # Blocks (i.e. lets the simulated clock run) while the FIFO is full
+        while len(self._fifo) >= StateMachine.FIFO_DEPTH:
+            _host.advance_ns(self._cycle_ns)
+        self._fifo.append(value & 0xFFFFFFFF)
+        self.num_words += 1
+        if self.next_ns is None and self in _host.CLOCK_TICKERS:
+            # Stalled on pull: wake up now
+            self.next_ns = _host.now_ns()
+        _host.advance_ns(0)
+
+    def tx_fifo(self) -> int:
+        return len(self._fifo)
+
+    def tick(self):
+        # Executes the instruction at the program counter
+        opcode, args, side, delay = self._program.instructions[self._pc]
+        if self._sideset_pins:
+            # Side-set is mandatory: instructions without `.side()` set 0
+            self._write_pins(self._sideset_pins, side or 0)
+
+        regs = self._regs
+        next_pc = self._pc + 1 if self._pc != self._program.wrap else self._program.wrap_target
+        if opcode == "pull":
+            if not self._fifo:
+                if args[0] == "block":
+                    self.next_ns = None  # Stall until `put()`
+                    return
+                regs["osr"] = regs["x"]
+            else:
+                regs["osr"] = self._fifo.pop(0)
+        elif opcode == "out":
+            dest, count = args
+            value = regs["osr"] & ((1 << count) - 1)
+            regs["osr"] = regs["osr"] >> count
+            self._write(dest, value, self._out_pins)
+        elif opcode == "set":
+            self._write(args[0], args[1], self._set_pins)
+        elif opcode == "mov":
+            self._write(args[0], regs[args[1]], self._out_pins)
+        elif opcode == "jmp":
+            cond, label = args
+            if self._is_condition_true(cond):
+                next_pc = self._program.labels[label]
+
+        self.num_instructions += 1
+        self._pc = next_pc
+        self.next_ns = _host.now_ns() + (1 + delay) * self._cycle_ns
+
+    def _is_condition_true(self, cond: str | None) -> bool:
+        regs = self._regs
+        if cond is None:
+            return True
+        if cond == "not_x":
+            return regs["x"] == 0
+        if cond == "not_y":
+            return regs["y"] == 0
+        if cond == "x_not_y":
+            return regs["x"] != regs["y"]
+        if cond == "not_osre":
+            return regs["osr"] != 0
+        if cond in ("x_dec", "y_dec"):
+            reg = cond[0]
+            value = regs[reg]
+            regs[reg] = (value - 1) & 0xFFFFFFFF
+            return value != 0
+        raise NotImplementedError(cond)
+
+    def _write(self, dest: str, value: int, pins: list):
+        if dest == "pins":
+            self._write_pins(pins, value)
+        elif dest != "null":
+            self._regs[dest] = value
+
+    def _write_pins(self, pins: list, value: int):
+        for idx, pin in enumerate(pins):
+            pin.value((value >> idx) & 1)
+
+    def _make_pins(self, base, init) -> list:
+        # Consecutive pins starting at `base`, one per entry of `init`
+        if base is None or init is None:
+            return []
+        count = len(init) if isinstance(init, tuple) else 1
+        return [_host._Pin(base.id + idx, _host._Pin.OUT) for idx in range(count)]
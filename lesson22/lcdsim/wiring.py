@@ -0,0 +1,106 @@
+from lcdsim import _host
+from lcdsim.hd44780 import HD44780
+
+
+class ParallelWiring:
+    """Connects an emulated HD44780 to simulated GPIOs (4-bit or 8-bit bus)
+
+    The wiring watches the simulated pins used by `HD44780Bus4` and
+    `HD44780Bus8` and drives the data pins when the controller outputs data.
+    Pin level changes are counted in `num_pin_writes`.
+    """
+
+    def __init__(self, controller: HD44780, rs: int, e: int, db_pins: list[int], rw: int | None = None):
+        """Connects a controller to simulated GPIOs
+
+        Args:
+            controller (HD44780): The emulated controller.
+            rs (int): The pin number of the RS pin.
+            e (int): The pin number of the E pin.
+            db_pins (list[int]): The pin numbers of the DB7 to DB4 pins (4-bit bus) or DB7 to DB0 pins (8-bit bus).
+            rw (int, optional): The pin number of the RW pin. When not provided, RW is tied to ground. Defaults to None.
+        """
+        self.controller = controller
+        self.num_pin_writes = 0
+        self._rs = rs
+        self._e = e
+        self._rw = rw
+        self._db_pins = db_pins
+        self._pins = [rs, e] + db_pins + ([] if rw is None else [rw])
+
+        for pin in self._pins:
+            _host.PIN_LEVELS.setdefault(pin, 0)
+            _host.PIN_WATCHERS[pin] = self._on_pin_changed
+        for idx, pin in enumerate(db_pins):
+            _host.PIN_DRIVERS[pin] = self._make_driver(7 - idx)
+
+    def detach(self):
+        """Disconnects the controller from the simulated GPIOs"""
+        for pin in self._pins:
+            _host.PIN_WATCHERS.pop(pin, None)
+            _host.PIN_DRIVERS.pop(pin, None)
+
+    def _make_driver(self, bit: int):
+        def driver():
+            output = self.controller.get_output()
+            return None if output is None else (output >> bit) & 1
+
+        return driver
+
+    def _on_pin_changed(self):
+        self.num_pin_writes += 1
+        levels = _host.PIN_LEVELS
+        db = 0
+        for idx, pin in enumerate(self._db_pins):
+            db = db | (levels[pin] << (7 - idx))
+        rw = 0 if self._rw is None else levels[self._rw]
+        self.controller.set_pins(levels[self._rs], rw, levels[self._e], db)
+
+
+class PCF8574:
+    """Emulated PCF8574-based I2C backpack connected to an emulated HD44780
+
+    The backpack is registered on the simulated I2C buses at the given address.
+    Its P0 to P7 pins are connected to RS, RW, E, the backlight, and DB4 to DB7.
+    """
+
+    _RS = 0b0001
+    _RW = 0b0010
+    _E = 0b0100
+    _BACKLIGHT = 0b1000
+
+    def __init__(self, controller: HD44780, addr: int = 0x27):
+        """Connects a controller to the simulated I2C buses
+
+        Args:
+            controller (HD44780): The emulated controller.
+            addr (int, optional): The I2C address of the backpack. Defaults to 0x27.
+        """
+        self.controller = controller
+        self.addr = addr
+        self._latch = 0xFF  # The PCF8574 pins are high at power-on
+        _host.I2C_DEVICES[addr] = self
+
+    def detach(self):
+        """Disconnects the backpack from the simulated I2C buses"""
+        _host.I2C_DEVICES.pop(self.addr, None)
+
+    def write_byte(self, byte: int):
+        self._latch = byte
+        self.controller.backlight = bool(byte & PCF8574._BACKLIGHT)
+        # fmt: off
+        self.controller.set_pins(
+            1 if byte & PCF8574._RS else 0,
+            1 if byte & PCF8574._RW else 0,
+            1 if byte & PCF8574._E else 0,
+            byte & 0xF0,
+        )
+        # fmt: on
+
+    def read_byte(self) -> int:
+        # Quasi-bidirectional pins: a pin reads low when either the latch or
+        # the LCD pulls it low.
+        output = self.controller.get_output()
+        if output is None:
+            return self._latch
+        return self._latch & (output | 0x0F)
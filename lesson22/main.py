@@ -1,6 +1,7 @@
 import sys
 import utime as time
 import dht
+import machine
 from display import Display
 from machine import Pin
 
@@ -24,6 +25,8 @@ class Program:
         is_celsius=True,
         button_debounce_ms=100,
         sensor_read_interval_ms=2000,
+        max_sleep_ms=50,
+        use_lightsleep=False,
     ):
         # When false, the unit is Fahrenheit.
         self._is_celsius = is_celsius
@@ -55,6 +58,14 @@ class Program:
         # Indicates whether the display should be updated
         self._should_update_display = False
 
+        # The main loop sleeps until the next sensor read or display refresh.
+        # Sleeps are cut in slices of at most `max_sleep_ms` so a button push
+        # (signalled by its IRQ handler) is handled within that delay. With
+        # `use_lightsleep`, the CPU is put in light sleep mode instead of
+        # idling, which saves power but may disconnect the USB serial port.
+        self._max_sleep_ms = max_sleep_ms
+        self._sleep_ms = machine.lightsleep if use_lightsleep else time.sleep_ms
+
         # Not running until run() is called
         self._is_running = False
 
@@ -68,7 +79,9 @@ class Program:
         lcd.create_character(0, [0b01110, 0b01110, 0b01110, 0b00000, 0b00000, 0b00000, 0b00000, 0b00000])
         lcd.map_character(chr(176), 0)
 
-        self._lcd = Display(lcd)
+        # Long texts (such as sensor errors) scroll using the display shift of
+        # the LCD, unless the other line is static.
+        self._lcd = Display(lcd, scroll_mode=Display.SCROLL_HARDWARE)
 
     def _on_btn_cf_deg_toggle_interrupt(self, pin):
         # This code is executed each time the Celsius/Fahrenheit button is pushed.
@@ -103,15 +116,32 @@ class Program:
             self._should_update_display = True
 
     def _update_display(self):
+        # The display renders the posted values on its next frame. Values
+        # posted in between are coalesced (e.g. a button bounce followed by a
+        # new sensor reading).
         if self._sensor_error:
-            self._lcd.update_sensor_error(self._sensor_error)
+            self._lcd.post_sensor_error(self._sensor_error)
         else:
             unit = "C" if self._is_celsius else "F"
             unit_value = int(round(self._temp_celsius if self._is_celsius else (self._temp_celsius * 9 / 5) + 32))
-            self._lcd.update_sensor_values(unit_value, unit, self._humidity)
+            self._lcd.post_sensor_values(unit_value, unit, self._humidity)
 
         self._should_update_display = False
 
+    def _sleep_until_next_event(self):
+        # Sleeps until the next sensor read or display refresh, whichever comes
+        # first, or until the display has to be updated.
+        deadline = time.ticks_add(self._sensor_last_read_on, self._sensor_read_interval_ms)
+        display_deadline = self._lcd.get_next_refresh_ms()
+        if display_deadline is not None and time.ticks_diff(display_deadline, deadline) < 0:
+            deadline = display_deadline
+
+        while not self._should_update_display:
+            remaining = time.ticks_diff(deadline, time.ticks_ms())
+            if remaining <= 0:
+                break
+            self._sleep_ms(min(remaining, self._max_sleep_ms))
+
     def _serial_print(self, msg):
         sys.stdout.write(f"{time.ticks_ms()} {msg}\n")
 
@@ -134,7 +164,7 @@ class Program:
                     self._update_display()
                 self._lcd.refresh()
 
-                time.sleep(0.01)
+                self._sleep_until_next_event()
         finally:
             self._serial_print("Program stopped by user")
 
@@ -1,5 +1,5 @@
 from umachine import Pin
-from tinyhttpserver import HttpRequest, HttpResponse, HttpRequestHandler
+from tinyhttpserver import HttpRequest, HttpResponse, HttpRequestHandler, StaticFileCache
 
 
 class RequestHandler(HttpRequestHandler):
@@ -8,28 +8,33 @@ class RequestHandler(HttpRequestHandler):
         self.red_led = red_led
         self.green_led = green_led
         self.blue_led = blue_led
+        self.color = "off"
+        self.static_files = StaticFileCache()
 
     def handle_request(self, request: HttpRequest) -> HttpResponse | None:
         if request.method == "GET":
-            if request.target == "/" or request.target.startswith("/?"):
-                with open("index.html", "r") as f:
-                    index_page = f.read()
-                if request.target == "/?color=red":
+            if request.path == "/":
+                color = request.query.get("color")
+                if color == "red":
+                    self.color = "red"
                     self.red_led.on()
                     self.green_led.off()
                     self.blue_led.off()
-                elif request.target == "/?color=green":
+                elif color == "green":
+                    self.color = "green"
                     self.red_led.off()
                     self.green_led.on()
                     self.blue_led.off()
-                elif request.target == "/?color=blue":
+                elif color == "blue":
+                    self.color = "blue"
                     self.red_led.off()
                     self.green_led.off()
                     self.blue_led.on()
-                elif request.target == "/?color=off":
+                elif color == "off":
+                    self.color = "off"
                     self.red_led.off()
                     self.green_led.off()
                     self.blue_led.off()
 
-                return HttpResponse(200, "OK", index_page, "text/html")
+                return self.static_files.get_response(request, "index.html", "text/html")
         return None
@@ -0,0 +1,25 @@
+""" Host-side tools for the TinyHttpServer
+
+This package makes it possible to run the `tinyhttpserver` package and the
+request handlers of this lesson on a regular computer (CPython), without a
+board nor a Wi-Fi connection, in order to measure the server against clients
+running on the same computer.
+
+Importing this package installs minimal stand-ins for the MicroPython
+`usocket`, `utime`, `uasyncio`, `umachine`, `uos`, `ubinascii`, `uerrno` and
+`uselect` modules when they are not available (i.e. when not running on a MicroPython board). Unlike the `lcdsim`
+package of lesson 22, the clock is not simulated: the network is real, so
+`utime` uses the real clock.
+
+    ```
+    import httpsim
+    from tinyhttpserver import AsyncTinyHttpServer
+    ```
+
+Benchmarks are run from the lesson directory with:
+`python -m httpsim.loadtest`
+"""
+
+from httpsim import _host
+
+_host.install()
@@ -0,0 +1,131 @@
+import sys
+
+
+class _UTime:
+    """Minimal stand-in for the MicroPython `utime` module, using the real clock"""
+
+    @staticmethod
+    def ticks_us() -> int:
+        import time
+
+        return time.monotonic_ns() // 1000
+
+    @staticmethod
+    def ticks_ms() -> int:
+        import time
+
+        return time.monotonic_ns() // 1000000
+
+    @staticmethod
+    def ticks_add(ticks: int, delta: int) -> int:
+        return ticks + delta
+
+    @staticmethod
+    def ticks_diff(ticks1: int, ticks2: int) -> int:
+        return ticks1 - ticks2
+
+    @staticmethod
+    def sleep_us(us: int):
+        import time
+
+        time.sleep(us / 1000000)
+
+    @staticmethod
+    def sleep_ms(ms: int):
+        import time
+
+        time.sleep(ms / 1000)
+
+    @staticmethod
+    def sleep(s: float):
+        import time
+
+        time.sleep(s)
+
+    @staticmethod
+    def time() -> int:
+        import time
+
+        return int(time.time())
+
+    @staticmethod
+    def gmtime(secs: int | None = None) -> tuple:
+        # (year, month, mday, hour, minute, second, weekday, yearday)
+        import time
+
+        return tuple(time.gmtime(secs))[:8]
+
+
+class _Pin:
+    """Minimal stand-in for `machine.Pin`, remembering its level"""
+
+    IN = 0
+    OUT = 1
+    PULL_UP = 1
+    PULL_DOWN = 2
+
+    def __init__(self, id: int, mode: int = -1, pull: int = -1, *, value: int | None = None):
+        self.id = id
+        self._value = 0 if value is None else value
+
+    def value(self, value: ... = None) -> ...:
+        if value is None:
+            return self._value
+        self._value = 1 if value else 0
+
+    def on(self):
+        self._value = 1
+
+    def off(self):
+        self._value = 0
+
+
+def _make_module(name: str, attrs: dict):
+    module = type(sys)(name)
+    for key, value in attrs.items():
+        setattr(module, key, value)
+    return module
+
+
+def _make_uasyncio():
+    # The CPython asyncio module, with the MicroPython millisecond sleep
+    import asyncio
+
+    async def sleep_ms(ms: int):
+        await asyncio.sleep(ms / 1000)
+
+    attrs = {name: getattr(asyncio, name) for name in asyncio.__all__}
+    attrs.update(sleep_ms=sleep_ms)
+    return _make_module("uasyncio", attrs)
+
+
+def install():
+    """Installs the `usocket`, `utime`, `uasyncio`, `umachine`, `uos`, `ubinascii`, `uerrno` and `uselect` stand-ins unless the real ones are available"""
+    try:
+        import umachine  # noqa: F401
+        import utime  # noqa: F401
+
+        return
+    except ImportError:
+        pass
+
+    import binascii
+    import errno
+    import os
+    import select
+    import socket
+
+    utime = _make_module(
+        "utime",
+        {name: getattr(_UTime, name) for name in dir(_UTime) if not name.startswith("_")},
+    )
+    machine = _make_module("machine", {"Pin": _Pin})
+    sys.modules.setdefault("ubinascii", binascii)
+    sys.modules.setdefault("uerrno", errno)
+    sys.modules.setdefault("uos", os)
+    sys.modules.setdefault("uselect", select)
+    sys.modules.setdefault("usocket", socket)
+    sys.modules.setdefault("utime", utime)
+    sys.modules.setdefault("machine", machine)
+    sys.modules.setdefault("umachine", machine)
+    sys.modules.setdefault("uasyncio", _make_uasyncio())
@@ -0,0 +1,159 @@
+""" Fuzz tests for the HttpRequestParser
+
+Run from the lesson directory with: `python -m httpsim.fuzz`
+
+Valid requests are fed in random pieces and must be parsed the same way as
+when fed at once. Mutated requests and random bytes must either be parsed or
+rejected with an HttpRequestError, without exceeding the parser's limits.
+"""
+
+import httpsim
+import random
+from tinyhttpserver import HttpRequestError, HttpRequestParser
+
+_MAX_HEADER_SIZE = 256
+_MAX_BODY_SIZE = 128
+
+_VALID_REQUESTS = [
+    b"GET / HTTP/1.1\r\nHost: pico\r\n\r\n",
+    b"GET /?color=red HTTP/1.1\r\nHost: pico\r\nConnection: keep-alive\r\n\r\n",
+    b"GET /a%20b?x=1+2&y=%C3%A9&flag&=z HTTP/1.0\r\n\r\n",
+    b"\r\nGET / HTTP/1.1\nHost: pico\n\n",
+    b"POST /form HTTP/1.1\r\nContent-Length: 11\r\nContent-Type: text/plain\r\n\r\nhello world",
+    b"POST /form HTTP/1.1\r\nContent-Length: 0\r\n\r\n",
+    b"POST /upload HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n6;ext=1\r\n world\r\n0\r\nX-Trailer: 1\r\n\r\n",
+    b"PUT /x HTTP/1.1\r\nTransfer-Encoding: Chunked\r\n\r\nA\r\n0123456789\r\n0\r\n\r\n",
+]
+
+
+def _parse(data: bytes, pieces: list[int] | None = None) -> tuple:
+    # Feeds `data` in pieces of the given sizes (at once by default). Returns
+    # the parsed requests and the error, if any.
+    parser = HttpRequestParser(_MAX_HEADER_SIZE, _MAX_BODY_SIZE)
+    buffer = memoryview(bytearray(len(data) + 1))
+    requests = []
+    pos = 0
+    sizes = iter(pieces if pieces is not None else [len(data)])
+    try:
+        while pos < len(data):
+            size = min(next(sizes, len(data)), len(data) - pos)
+
+            # Simulate recv_into() on a reusable buffer, then feed what was received
+            buffer[:size] = data[pos : pos + size]
+            used = 0
+            while used < size:
+                used += parser.feed(buffer[used:size])
+                if parser.is_done():
+                    request = parser.get_request()
+                    assert len(request.body if request.body is not None else b"") <= _MAX_BODY_SIZE
+                    requests.append(
+                        (
+                            request.method,
+                            request.target,
+                            request.version,
+                            request.path,
+                            request.query,
+                            request.headers,
+                            None if request.body is None else bytes(request.body),
+                        )
+                    )
+                    parser.reset()
+            pos += size
+    except HttpRequestError as ex:
+        assert ex.code in (400, 413, 431, 501), ex.code
+        return requests, ex.code
+    return requests, None
+
+
+def _random_pieces(rng: random.Random, length: int) -> list[int]:
+    pieces = []
+    while length > 0:
+        size = rng.choice((1, 1, 2, 3, rng.randint(1, 64)))
+        pieces.append(size)
+        length -= size
+    return pieces
+
+
+def _mutate(rng: random.Random, data: bytes) -> bytes:
+    data = bytearray(data)
+    for _ in range(rng.randint(1, 4)):
+        operation = rng.randrange(6)
+        pos = rng.randrange(len(data) + 1)
+        if operation == 0 and pos < len(data):
+            data[pos] = rng.randrange(256)
+        elif operation == 1:
+            data[pos:pos] = bytes(rng.choice((b"\r", b"\n", b":", b" ", b"%", b"0", b"\r\n", b"\r\n\r\n", b"\xff")))
+        elif operation == 2:
+            del data[pos : pos + rng.randint(1, 8)]
+        elif operation == 3:
+            data[pos:pos] = bytes(rng.randrange(256) for _ in range(rng.randint(1, 300)))
+        elif operation == 4:
+            # A non-ASCII digit (superscript two) in place of an ASCII one
+            digits = [idx for idx in range(len(data)) if 0x30 <= data[idx] <= 0x39]
+            if digits:
+                idx = rng.choice(digits)
+                data[idx : idx + 1] = "\u00b2".encode()
+        else:
+            data = data[:pos]
+    return bytes(data)
+
+
+def check_limits():
+    """Checks the limits and the error responses on hand-written requests"""
+    head = b"GET / HTTP/1.1\r\nX: " + b"a" * (_MAX_HEADER_SIZE - 23) + b"\r\n\r\n"
+    requests, error = _parse(head)
+    assert len(head) == _MAX_HEADER_SIZE and error is None and len(requests) == 1
+    assert _parse(head[:19] + b"a" + head[19:])[1] == 431
+    assert _parse(b"GET / HTTP/1.1\r\n" + b"X: 1\r\n" * 17 + b"\r\n")[1] == 431
+    assert _parse(b"POST / HTTP/1.1\r\nContent-Length: 129\r\n\r\n")[1] == 413
+    assert _parse(b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n80\r\n" + b"a" * 128 + b"\r\n1\r\n")[1] == 413
+    assert _parse(b"POST / HTTP/1.1\r\nTransfer-Encoding: gzip\r\n\r\n")[1] == 501
+    assert _parse(b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\nContent-Length: 1\r\n\r\n")[1] == 400
+    assert _parse(b"POST / HTTP/1.1\r\nContent-Length: 1\r\nContent-Length: 2\r\n\r\n")[1] == 400
+    assert _parse(b"POST / HTTP/1.1\r\nContent-Length: -1\r\n\r\n")[1] == 400
+    assert _parse("POST / HTTP/1.1\r\nContent-Length: \u00b2\r\n\r\n".encode())[1] == 400
+    assert _parse("POST / HTTP/1.1\r\nContent-Length: 1\u0663\r\n\r\n".encode())[1] == 400
+    assert _parse(b"GET /%zz HTTP/1.1\r\n\r\n")[1] == 400
+    assert _parse(b"GET / HTTP/1.1\r\n folded\r\n\r\n")[1] == 400
+    assert _parse(b"GET /\r\n\r\n")[1] == 400
+
+    # Pipelined requests are split where each request ends
+    pipelined = _VALID_REQUESTS[0] + _VALID_REQUESTS[4] + _VALID_REQUESTS[6]
+    requests, error = _parse(pipelined)
+    assert error is None and [request[6] for request in requests] == [None, b"hello world", b"hello world"]
+    assert requests[0][4] == {} and _parse(_VALID_REQUESTS[2])[0][0][3:5] == ("/a b", {"x": "1 2", "y": "é", "flag": "", "": "z"})
+    print("Limits and error responses: OK")
+
+
+def fuzz(num_iterations: int = 20000, seed: int = 28):
+    """Feeds valid, mutated and random requests in random pieces"""
+    rng = random.Random(seed)
+    expected = {data: _parse(data) for data in _VALID_REQUESTS}
+    for data, (requests, error) in expected.items():
+        assert error is None and len(requests) == 1, data
+
+    num_parsed = 0
+    errors = {}
+    for iteration in range(num_iterations):
+        kind = iteration % 3
+        if kind == 0:
+            # The same requests, whatever the pieces they are received in
+            data = b"".join(rng.choice(_VALID_REQUESTS) for _ in range(rng.randint(1, 3)))
+            requests, error = _parse(data, _random_pieces(rng, len(data)))
+            assert error is None and requests == _parse(data)[0], data
+        else:
+            data = _mutate(rng, rng.choice(_VALID_REQUESTS)) if kind == 1 else bytes(rng.randrange(256) for _ in range(rng.randint(1, 400)))
+            requests, error = _parse(data, _random_pieces(rng, len(data)))
+
+            # Pieces must not change the outcome
+            assert (requests, error) == _parse(data), data
+        num_parsed += len(requests)
+        if error is not None:
+            errors[error] = errors.get(error, 0) + 1
+
+    print("Fuzzing, {} inputs: {} requests parsed, errors {}: OK".format(num_iterations, num_parsed, dict(sorted(errors.items()))))
+
+
+if __name__ == "__main__":
+    check_limits()
+    fuzz()
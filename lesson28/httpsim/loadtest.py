@@ -0,0 +1,353 @@
+""" Load tests for the TinyHttpServer
+
+Run from the lesson directory with: `python -m httpsim.loadtest`
+
+The servers listen on localhost and serve the lesson's `RequestHandler`.
+Clients are threads sending requests over real sockets. The logs printed by
+the servers are discarded while the clients run.
+"""
+
+import httpsim
+import contextlib
+import os
+import socket
+import tempfile
+import threading
+import tracemalloc
+import uasyncio as asyncio
+from time import perf_counter
+from umachine import Pin
+from httphandlers import RequestHandler
+from tinyhttpserver import AsyncTinyHttpServer, HttpRequest, HttpResponse, HttpResponseWriter, TinyHttpServer
+
+_ADDR = "127.0.0.1"
+
+
+def _get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((_ADDR, 0))
+        return sock.getsockname()[1]
+
+
+def _make_request_handler() -> RequestHandler:
+    return RequestHandler(Pin(18, mode=Pin.OUT), Pin(19, mode=Pin.OUT), Pin(20, mode=Pin.OUT))
+
+
+def _get(port: int, target: str, timeout_s: float) -> int:
+    # Sends a GET request on a new connection and reads the response until the
+    # server closes the connection. Returns the status code.
+    with socket.create_connection((_ADDR, port), timeout=timeout_s) as sock:
+        sock.sendall("GET {} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".format(target).encode("utf-8"))
+        response = b""
+        while True:
+            data = sock.recv(4096)
+            if not data:
+                break
+            response += data
+    return int(response.split(b" ", 2)[1]) if response else 0
+
+
+def _read_response(stream) -> tuple[int, bool]:
+    # Reads a response framed by its Content-Length header from a socket file.
+    # Returns the status code and whether the server keeps the connection open.
+    status_line = stream.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed by the server")
+    content_length = 0
+    keep_alive = False
+    while True:
+        line = stream.readline().strip().lower()
+        if not line:
+            break
+        if line.startswith(b"content-length:"):
+            content_length = int(line[15:])
+        elif line.startswith(b"connection:"):
+            keep_alive = line[11:].strip() == b"keep-alive"
+    stream.read(content_length)
+    return int(status_line.split(b" ", 2)[1]), keep_alive
+
+
+class _KeepAliveClient:
+    # Sends requests on a persistent connection, reconnecting when the server closes it
+
+    def __init__(self, port: int, timeout_s: float):
+        self._port = port
+        self._timeout_s = timeout_s
+        self._sock = None
+        self._stream = None
+        self.num_connections = 0
+
+    def close(self):
+        if self._sock is not None:
+            self._stream.close()
+            self._sock.close()
+            self._sock = None
+
+    def get(self, target: str, num_pipelined: int = 1) -> list[int]:
+        # Sends `num_pipelined` requests without waiting for the responses,
+        # then reads the responses. Returns the status codes.
+        if self._sock is None:
+            self._sock = socket.create_connection((_ADDR, self._port), timeout=self._timeout_s)
+            self._stream = self._sock.makefile("rb")
+            self.num_connections += 1
+        request = "GET {} HTTP/1.1\r\nHost: localhost\r\n\r\n".format(target).encode("utf-8")
+        self._sock.sendall(request * num_pipelined)
+        codes = []
+        keep_alive = True
+        for _ in range(num_pipelined):
+            code, keep_alive = _read_response(self._stream)
+            codes.append(code)
+        if not keep_alive:
+            self.close()
+        return codes
+
+
+def _run_clients(
+    port: int, num_clients: int, num_requests: int, target: str = "/?color=red", timeout_s: float = 10, keep_alive: bool = False
+) -> dict:
+    # Runs `num_clients` clients sending `num_requests` requests each, one after the other
+    latencies = []
+    codes = {}
+    lock = threading.Lock()
+
+    def client():
+        keep_alive_client = _KeepAliveClient(port, timeout_s)
+        for _ in range(num_requests):
+            started_at = perf_counter()
+            try:
+                if keep_alive:
+                    code = keep_alive_client.get(target)[0]
+                else:
+                    code = _get(port, target, timeout_s)
+            except OSError:
+                keep_alive_client.close()
+                code = 0
+            elapsed = perf_counter() - started_at
+            with lock:
+                latencies.append(elapsed)
+                codes[code] = codes.get(code, 0) + 1
+        keep_alive_client.close()
+
+    threads = [threading.Thread(target=client) for _ in range(num_clients)]
+    started_at = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(0.99 * (len(latencies) - 1))] * 1000,
+        "codes": codes,
+    }
+
+
+def _print_results(name: str, results: dict):
+    codes = ", ".join("{}: {}".format(code if code else "error", count) for code, count in sorted(results["codes"].items()))
+    print("  {:<30} {:7.0f} req/s, p50 {:7.1f} ms, p99 {:7.1f} ms ({})".format(name, results["rps"], results["p50_ms"], results["p99_ms"], codes))
+
+
+def _load_blocking_server(num_clients: int, num_requests: int) -> dict:
+    port = _get_free_port()
+    server = TinyHttpServer(_ADDR, port, _make_request_handler())
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        thread = threading.Thread(target=server.start)
+        thread.start()
+        while server.status != 2:  # ServerStatus.RUNNING
+            pass
+        results = _run_clients(port, num_clients, num_requests)
+
+        # The server thread is blocked in accept(): connect once to wake it up
+        # after the server has been stopped
+        server.stop()
+        with contextlib.suppress(OSError):
+            socket.create_connection((_ADDR, port), timeout=1).close()
+        thread.join()
+    return results
+
+
+@contextlib.contextmanager
+def _run_async_server(max_connections: int):
+    # Runs an AsyncTinyHttpServer in a thread. Yields its port.
+    port = _get_free_port()
+    server = AsyncTinyHttpServer(_ADDR, port, _make_request_handler(), max_connections)
+    loop = asyncio.new_event_loop()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        thread = threading.Thread(target=loop.run_until_complete, args=(server.start(),))
+        thread.start()
+        while server.status != 2:  # ServerStatus.RUNNING
+            pass
+        try:
+            yield port
+        finally:
+            loop.call_soon_threadsafe(server.stop)
+            thread.join()
+
+            # Let the connection tasks close their sockets
+            loop.run_until_complete(asyncio.sleep(0.1))
+            loop.close()
+
+
+def _load_async_server(num_clients: int, num_requests: int, max_connections: int, num_idle_clients: int = 0, keep_alive: bool = False) -> dict:
+    with _run_async_server(max_connections) as port:
+        # Idle clients open a connection and never send their request
+        idle_sockets = [socket.create_connection((_ADDR, port)) for _ in range(num_idle_clients)]
+        results = _run_clients(port, num_clients, num_requests, keep_alive=keep_alive)
+        for sock in idle_sockets:
+            sock.close()
+    return results
+
+
+def bench_concurrent_clients(num_clients: int = 20, num_requests: int = 25):
+    """Compares the blocking and the asyncio servers under concurrent clients"""
+    print("{} concurrent clients, {} requests each, one connection per request:".format(num_clients, num_requests))
+    _print_results("TinyHttpServer (blocking)", _load_blocking_server(num_clients, num_requests))
+    _print_results("AsyncTinyHttpServer", _load_async_server(num_clients, num_requests, max_connections=num_clients + 1))
+    _print_results(
+        "AsyncTinyHttpServer, 1 idle", _load_async_server(num_clients, num_requests, max_connections=num_clients + 1, num_idle_clients=1)
+    )
+    _print_results("AsyncTinyHttpServer, cap 4", _load_async_server(num_clients, num_requests, max_connections=4))
+
+
+
+def bench_keep_alive(num_clients: int = 20, num_requests: int = 100, num_pipelined: int = 10):
+    """Compares one connection per request with persistent and pipelined connections"""
+    print("Keep-alive, {} requests per client:".format(num_requests))
+    for clients in (1, num_clients):
+        name = "{} client{}".format(clients, "" if clients == 1 else "s")
+        _print_results(name + ", close", _load_async_server(clients, num_requests, max_connections=clients + 1))
+        _print_results(name + ", keep-alive", _load_async_server(clients, num_requests, max_connections=clients + 1, keep_alive=True))
+
+    with _run_async_server(max_connections=2) as port:
+        client = _KeepAliveClient(port, timeout_s=10)
+        started_at = perf_counter()
+        codes = []
+        for _ in range(num_requests * num_pipelined // num_pipelined):
+            codes += client.get("/?color=red", num_pipelined)
+        elapsed = perf_counter() - started_at
+        client.close()
+    print(
+        "  1 client, pipelined by {:<9} {:7.0f} req/s, {:.2f} ms per request, {} connections ({} x 200)".format(
+            num_pipelined, len(codes) / elapsed, elapsed * 1000 / len(codes), client.num_connections, codes.count(200)
+        )
+    )
+
+
+
+class _ClientSocket:
+    # Stands for a client socket: accepts at most `max_bytes_per_send` bytes
+    # per send() call, like a socket whose send buffer is nearly full, and
+    # counts (or keeps) the bytes sent
+
+    def __init__(self, max_bytes_per_send: int = 1 << 30, keep_data: bool = False):
+        self.max_bytes_per_send = max_bytes_per_send
+        self.data = bytearray() if keep_data else None
+        self.num_bytes = 0
+        self.num_sends = 0
+
+    def send(self, data) -> int:
+        num_bytes = min(len(data), self.max_bytes_per_send)
+        if self.data is not None:
+            self.data += data[:num_bytes]
+        self.num_bytes += num_bytes
+        self.num_sends += 1
+        return num_bytes
+
+
+def _encode_in_memory(response: HttpResponse) -> bytes:
+    # What `TinyHttpServer._encode_response()` used to do: format the headers
+    # as text, and concatenate them to the content
+    content = response.content.encode("utf-8") if isinstance(response.content, str) else response.content
+    headers = "HTTP/1.1 {} {}\r\nContent-Type: {}\r\nContent-Length: {}\r\nServer: TinyHttpServer\r\n".format(
+        response.code, response.status_message, response.content_type, len(content)
+    )
+    for name, value in response.headers.items():
+        headers += "{}: {}\r\n".format(name, value)
+    return (headers + "Connection: close\r\n\r\n").encode("utf-8") + content
+
+
+def bench_static_files(num_requests: int = 20000):
+    """Compares reading the page on every request with the static file cache"""
+    handler = _make_request_handler()
+    writer = HttpResponseWriter()
+    client_socket = _ClientSocket()
+
+    def read_page():
+        # What `RequestHandler` used to do: read the page as text, and encode it twice
+        with open("index.html", "r") as f:
+            page = f.read()
+        len(page.encode("utf-8"))
+        return len(_encode_in_memory(HttpResponse(200, "OK", page, "text/html")))
+
+    request = HttpRequest("GET", "/", "HTTP/1.1")
+    etag = handler.handle_request(request).headers["ETag"]
+    conditional_request = HttpRequest("GET", "/", "HTTP/1.1", {"if-none-match": etag})
+
+    print("Serving index.html, {} requests:".format(num_requests))
+    for name, func in (
+        ("read and encode", read_page),
+        ("cached", lambda: writer.send(client_socket, handler.handle_request(request))),
+        ("cached, If-None-Match", lambda: writer.send(client_socket, handler.handle_request(conditional_request))),
+    ):
+        started_at = perf_counter()
+        for _ in range(num_requests):
+            num_bytes = func()
+        elapsed = perf_counter() - started_at
+        print("  {:<22} {:6.1f} us per response, {:5} bytes".format(name, elapsed * 1000000 / num_requests, num_bytes))
+
+
+def bench_response_writer(file_size: int = 65536, num_requests: int = 200, max_bytes_per_send: int = 1460):
+    """Compares building large responses in memory with the response writer"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "large.bin")
+        with open(path, "wb") as f:
+            f.write(os.urandom(file_size))
+        with open(path, "rb") as f:
+            content = f.read()
+
+        def in_memory(client_socket):
+            # Read the file, build the response, and send it in a single call
+            with open(path, "rb") as f:
+                response = HttpResponse(200, "OK", f.read(), "application/octet-stream")
+            return client_socket.send(_encode_in_memory(response))
+
+        writer = HttpResponseWriter()
+        print("Sending a {} bytes file, at most {} bytes accepted per send():".format(file_size, max_bytes_per_send))
+        for name, func in (
+            ("in memory, one send()", in_memory),
+            ("writer, bytes", lambda client_socket: writer.send(client_socket, HttpResponse(200, "OK", content, "application/octet-stream"))),
+            ("writer, file", lambda client_socket: writer.send(client_socket, HttpResponse(200, "OK", None, "application/octet-stream", file_path=path))),
+        ):
+            # Check what the client receives
+            client_socket = _ClientSocket(max_bytes_per_send, keep_data=True)
+            func(client_socket)
+            complete = bytes(client_socket.data).endswith(content)
+
+            tracemalloc.start()
+            started_at = perf_counter()
+            client_socket = _ClientSocket(max_bytes_per_send)
+            for _ in range(num_requests):
+                func(client_socket)
+            elapsed = perf_counter() - started_at
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                "  {:<22} {:7.1f} us per response, {:6} bytes received{}, {:3} sends, peak {:6} bytes allocated".format(
+                    name,
+                    elapsed * 1000000 / num_requests,
+                    client_socket.num_bytes // num_requests,
+                    "" if complete else " (truncated)",
+                    client_socket.num_sends // num_requests,
+                    peak,
+                )
+            )
+
+
+if __name__ == "__main__":
+    bench_concurrent_clients()
+    bench_keep_alive()
+    bench_static_files()
+    bench_response_writer()
@@ -22,6 +22,7 @@ Display (LCD) from a MicroPython board. The following bus types are supported:
     * 4-bit bus (using the LCD pins) - `hd44780bus4`
     * 8-bit bus (using the LCD pins) - `hd44780bus8`
     * I2C bus - `hd44780busI2C`
+    * 4-bit and 8-bit buses driven by the RP2040 PIO - `hd44780buspio4` and `hd44780buspio8`
 
 The core class is `LCD1602`. This class provides high-level methods to perform
 common LCD operations, such as writing text. For example, to write "Hello World!"
@@ -48,6 +49,24 @@ to the display:
     data = lcd.send_command(HD44780Cmds.C09_READ_BUSY_FLAG_AND_ADDR)
     print(bin(data))
     ```
+
+When more than 8 custom characters are needed over time (big digits, bar
+graphs, etc.), the `GlyphManager` class loads named glyphs into the custom
+character slots on demand.
+
+Programs built on asyncio (uasyncio) can use the `AsyncLCD1602` class, which
+sends the commands from a background task and lets the other tasks run while
+the LCD is busy (for example, during the 150ms initialization).
+
+Several I2C LCDs sharing the same I2C bus can be driven by the `LCD1602Group`
+class, which scans the bus once and initializes all the LCDs in parallel.
+
+The `LCDProfiler` class counts the commands sent to an LCD and measures the
+time spent on the bus and waiting for the LCD. It costs nothing when disabled.
+
+Dashboards are built with the `LCDLayout` class, which shows widgets (labels,
+numeric fields, bar graphs, marquees, blinking alerts - see `lcdwidgets`) in
+named regions of 16x2 to 20x4 displays, and only sends what has changed.
 """
 
 from lcd1602.lcdcursor import LCDCursor
@@ -56,4 +75,13 @@ from lcd1602.hd44780bus import HD44780Bus
 from lcd1602.hd44780bus4 import HD44780Bus4
 from lcd1602.hd44780bus8 import HD44780Bus8
 from lcd1602.hd44780busI2C import HD44780BusI2C
+from lcd1602.hd44780buspio import HD44780BusPIO
+from lcd1602.hd44780buspio4 import HD44780BusPIO4
+from lcd1602.hd44780buspio8 import HD44780BusPIO8
 from lcd1602.lcd1602 import LCD1602
+from lcd1602.glyphmanager import GlyphManager
+from lcd1602.asynclcd1602 import AsyncLCD1602
+from lcd1602.lcd1602group import LCD1602Group
+from lcd1602.lcdprofiler import LCDProfiler
+from lcd1602.lcdwidgets import LCDWidget, LabelWidget, NumericWidget, BarGraphWidget, MarqueeWidget, AlertWidget
+from lcd1602.lcdlayout import LCDLayout
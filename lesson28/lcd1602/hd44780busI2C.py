@@ -30,6 +30,11 @@ class HD44780BusI2C(HD44780Bus):
         * sda
 
     The I2C bus supports read operations and can control the backlight.
+
+    Write operations are streamed: the whole E strobe sequence of one or more
+    commands is packed into a single buffer and sent in a single I2C transaction.
+    The time it takes to clock each byte on the I2C bus is used to satisfy the
+    controller's timing constraints instead of sleeping between bytes.
     """
 
     _BACKLIGHT = 0b1000
@@ -38,14 +43,38 @@ class HD44780BusI2C(HD44780Bus):
     _RS = 0b0001
     _DB_7_to_4 = 0b11110000
 
-    def __init__(self, bus_id: int, scl: int, sda: int, addr: int | None = None):
+    # Each written command is sent as 2 nibbles, each nibble requiring 3 bytes:
+    # data setup (E low), E high, E low. An I2C byte takes 9 clock cycles (8
+    # data bits + ACK) which is 22.5us at 400KHz, well above the address setup
+    # time (tAS, 60ns) and the enable pulse width (PWEH, 450ns).
+    _BYTES_PER_WRITE = 6
+    _BATCH_BUFFER_SIZE = 256
+
+    def __init__(
+        self,
+        bus_id: int,
+        scl: int,
+        sda: int,
+        addr: int | None = None,
+        freq: int = 400000,
+        i2c: I2C | None = None,
+        devices: list[int] | None = None,
+    ):
         """Initializes a new instance of the HD44780BusI2C class
 
+        Several buses can share the same I2C peripheral (see `LCD1602Group`):
+        pass the shared `I2C` instance and, optionally, the list of devices
+        found by scanning it. The list is read when the bus is initialized, so
+        it can be filled after the bus is created.
+
         Args:
             id (int):  The I2C peripheral/bus id. For example, a pin I2C1 SCL is the clock pin for I2C bus 1.
             scl (int): The pin number of the scl pin.
             sda (int): The pin number of the sda pin.
             addr (int, optional): The I2C address of the LCD. When not specified, the LCD is expected to be the only device on the I2C bus. Defaults to None.
+            freq (int, optional): The I2C clock frequency in Hz. Defaults to 400000.
+            i2c (I2C, optional): An existing I2C instance to use instead of creating one. Defaults to None.
+            devices (list[int], optional): The devices found on the shared I2C bus. When not specified, the bus is scanned by `init()`. Defaults to None.
 
         Raises:
             TypeError: One of the arguments is of the wrong type.
@@ -54,19 +83,63 @@ class HD44780BusI2C(HD44780Bus):
         _Helper.validate_integer_arg("bus_id", bus_id)
         _Helper.validate_integer_arg("scl", scl)
         _Helper.validate_integer_arg("sdc", sda)
+        _Helper.validate_integer_arg("freq", freq, min_value=1)
 
         if addr is not None:
             _Helper.validate_integer_arg("addr", addr, min_value=0)
 
+        if devices is not None:
+            if i2c is None:
+                raise ValueError("Argument 'devices' requires argument 'i2c'")
+            _Helper.validate_integer_list_arg("devices", devices, min_value=0)
+
         super().__init__(width=4, can_read=True, can_control_backlight=True)
 
-        self._i2c = I2C(bus_id, scl=Pin(scl), sda=Pin(sda))
+        self._i2c = I2C(bus_id, scl=Pin(scl), sda=Pin(sda), freq=freq) if i2c is None else i2c
+
+        # Result of a scan of the shared bus, so that initializing the bus does
+        # not scan it again
+        self._devices = devices
         self._addr = addr
+        self._freq = freq
         self._is_backlight_on = True
+        self._write_buffer = bytearray(HD44780BusI2C._BYTES_PER_WRITE)
+        self._batch_buffer = bytearray(HD44780BusI2C._BATCH_BUFFER_SIZE)
+        self._batch_buffer_mv = memoryview(self._batch_buffer)
+
+        # Views of the batch buffer, by length. A view is created on first use
+        # of a length and reused afterwards, so that sending a batch does not
+        # slice the batch buffer.
+        self._batch_views = [None] * (len(self._batch_buffer) + 1)
+
+    def read(self, cmd: int) -> int:
+        _Helper.validate_integer_arg("cmd", cmd, min_value=0, max_value=0b1111111111)
+
+        # Command is a write operation when RW is low / false
+        # Command is a ***read*** operation when RW is high / true
+        if not (cmd & HD44780Cmds.BITMASK_RW):
+            raise ValueError("Not a read command.")
+
+        return self._read_unchecked(cmd)
+
+    def write(self, cmd: int):
+        _Helper.validate_integer_arg("cmd", cmd, min_value=0, max_value=0b1111111111)
+
+        # Command is a ***write*** operation when RW is low / false
+        # Command is a read operation when RW is high / true
+        if cmd & HD44780Cmds.BITMASK_RW:
+            raise ValueError("Not a write command.")
+
+        self._write_unchecked(cmd)
+
+    def set_backlight(self, enabled: bool):
+        self._is_backlight_on = enabled
+        self.write(0)
 
-    def init(self):
-        # Scan the I2C bus for LCD device
-        devices = self._i2c.scan()
+    def _init_steps(self):
+        # Scan the I2C bus for LCD device, unless the bus is shared and has
+        # already been scanned
+        devices = self._i2c.scan() if self._devices is None else self._devices
 
         # If no device was found, something is wrong with the wiring.
         if len(devices) == 0:
@@ -93,55 +166,81 @@ class HD44780BusI2C(HD44780Bus):
 
         # 1. Wait for more than 40ms after VCC rises to 2.7V.
         #    As an abundance of caution, we wait 3x more.
-        time.sleep_ms(150)
+        yield 150
 
         # 2. The following instructions put the controller into 8-bit mode
         #    regardless of the current (unknown) mode. The bus length is contained
         #    in the high nibble of the command, so we don't care about the low nibble.
         self._write_nibble(0b0000110000, high_nibble=True)  # Function set (8-bit bus)
-        time.sleep_ms(5)  # Wait for >4.1ms (5ms)
+        yield 5  # Wait for >4.1ms (5ms)
         self._write_nibble(0b0000110000, high_nibble=True)  # Function set (8-bit bus)
-        time.sleep_ms(1)  # Wait for >100us (1ms)
+        yield 1  # Wait for >100us (1ms)
         self._write_nibble(0b0000110000, high_nibble=True)  # Function set (8-bit bus)
-        time.sleep_ms(1)  # Wait for >100us (1ms)
+        yield 1  # Wait for >100us (1ms)
 
         # 3. We are guaranteed that the controller is in 8-bit mode now. We can
         #    switch to 4-bit mode. As the controller is in 8-bit mode, it expects
         #    a single write operation. The bus length is contained in the high
         #    nibble of the command, so we don't care about the low nibble.
         self._write_nibble(0b0000100000, high_nibble=True)  # Function set (4-bit bus)
-        time.sleep_ms(1)  # Wait for >100us (1ms)
+        yield 1  # Wait for >100us (1ms)
 
         # The controller is now in 4-bit mode. The rest of the initialization
         # procedure is performed by the LCD class.
 
-    def read(self, cmd: int) -> int:
-        _Helper.validate_integer_arg("cmd", cmd, min_value=0, max_value=0b1111111111)
-
-        # Command is a write operation when RW is low / false
-        # Command is a ***read*** operation when RW is high / true
-        if not (cmd & HD44780Cmds.BITMASK_RW):
-            raise ValueError("Not a read command.")
-
+    def _read_unchecked(self, cmd: int) -> int:
         data = self._read_nibble(cmd, high_nibble=True)
         data = data | self._read_nibble(cmd, high_nibble=False)
-
         return data
 
-    def write(self, cmd: int):
-        _Helper.validate_integer_arg("cmd", cmd, min_value=0, max_value=0b1111111111)
+    def _write_unchecked(self, cmd: int):
+        if self._addr is None:
+            raise RuntimeError("Bus has not been initialized. Please call init() first.")
 
-        # Command is a ***write*** operation when RW is low / false
-        # Command is a read operation when RW is high / true
-        if cmd & HD44780Cmds.BITMASK_RW:
-            raise ValueError("Not a write command.")
+        self._fill_write(self._write_buffer, 0, cmd, 0)
+        self._i2c.writeto(self._addr, self._write_buffer)
 
-        self._write_nibble(cmd, high_nibble=True)
-        self._write_nibble(cmd, high_nibble=False)
+    def _write_many_unchecked(self, cmds: list[int], delay_us: int):
+        if self._addr is None:
+            raise RuntimeError("Bus has not been initialized. Please call init() first.")
 
-    def set_backlight(self, enabled: bool):
-        self._is_backlight_on = enabled
-        self.write(0)
+        # After the last E low of a command, the controller receives at least
+        # 2 bytes (data setup, E high) before the next command is latched. Pad
+        # each command with idle bytes (E low) until these bytes take at least
+        # `delay_us` to be clocked on the bus.
+        num_padding_bytes = max(0, -((-delay_us * self._freq) // 9000000) - 2)
+        stride = HD44780BusI2C._BYTES_PER_WRITE + num_padding_bytes
+
+        # When the delay is too long for a single command to fit in the batch
+        # buffer (a few ms at 400KHz), sleeping is cheaper than clocking idle
+        # bytes: send the commands one by one.
+        if stride > len(self._batch_buffer):
+            super()._write_many_unchecked(cmds, delay_us)
+            return
+
+        cmds_per_batch = len(self._batch_buffer) // stride
+
+        buf = self._batch_buffer
+        num_cmds = len(cmds)
+        for start in range(0, num_cmds, cmds_per_batch):
+            end = min(start + cmds_per_batch, num_cmds)
+            pos = 0
+            for idx in range(start, end):
+                self._fill_write(buf, pos, cmds[idx], num_padding_bytes)
+                pos += stride
+
+            # Padding is not needed after the last command of the sequence.
+            if end == num_cmds:
+                pos -= num_padding_bytes
+            self._i2c.writeto(self._addr, self._get_batch_view(pos))
+
+    def _get_batch_view(self, length: int) -> memoryview:
+        # Returns a view of the first `length` bytes of the batch buffer
+        view = self._batch_views[length]
+        if view is None:
+            view = self._batch_buffer_mv[:length]
+            self._batch_views[length] = view
+        return view
 
     def _read_nibble(self, cmd: int, high_nibble: bool) -> int:
         # See I2C Serial Interface 1602 LCD Module, page 3.
@@ -196,6 +295,25 @@ class HD44780BusI2C(HD44780Bus):
 
         return data
 
+    def _fill_write(self, buf: bytearray, pos: int, cmd: int, num_padding_bytes: int):
+        # Writes the E strobe sequence of both nibbles of a write command into
+        # `buf`, starting at `pos`. See `_write_nibble()` for the payload format.
+        # fmt: off
+        payload = (HD44780BusI2C._BACKLIGHT if self._is_backlight_on else 0) \
+            | (HD44780BusI2C._RS if (cmd & HD44780Cmds.BITMASK_RS) else 0)
+        # fmt: on
+        high = payload | (cmd & HD44780Cmds.BITMASK_DB7_TO_DB4)
+        low = payload | ((cmd & HD44780Cmds.BITMASK_DB3_TO_DB0) << 4)
+
+        buf[pos] = high
+        buf[pos + 1] = high | HD44780BusI2C._E
+        buf[pos + 2] = high
+        buf[pos + 3] = low
+        buf[pos + 4] = low | HD44780BusI2C._E
+        buf[pos + 5] = low
+        for idx in range(pos + 6, pos + 6 + num_padding_bytes):
+            buf[idx] = low
+
     def _write_nibble(self, cmd: int, high_nibble: bool):
         # See I2C Serial Interface 1602 LCD Module, page 3.
         # The PCF8574-based piggy-back board connects the LCD's DB4-DB7 pins to
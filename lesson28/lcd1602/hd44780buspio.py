@@ -0,0 +1,182 @@
+# This file is part of the LCD1602 MicroPython LCD library
+# Copyright (C) 2023 Pascal Jobin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from lcd1602._helper import _Helper
+from lcd1602.hd44780cmds import HD44780Cmds
+from lcd1602.hd44780bus import HD44780Bus
+from machine import Pin
+import utime as time
+
+
+def _make_pio_program(width: int):
+    # Builds the PIO program driving a `width`-bit bus. `rp2` is only available
+    # on RP2040 boards, hence the import is done here rather than at module level.
+    #
+    # Each word pushed into the TX FIFO holds one write operation, LSB first:
+    #
+    #   * bits 0 to width-1: the data bits (DB0 to DB7, or DB4 to DB7)
+    #   * bit width: RS
+    #   * bits width+1 to 31: the number of extra cycles to wait after E falls
+    #
+    # The state machine runs at 1MHz (1 cycle = 1us), which satisfies tAS,
+    # PWEH and tcycE (see `HD44780Bus` delays). The data and RS pins are set
+    # 1 cycle before E rises, E stays high 1 cycle, and the data and RS pins
+    # are held until the next word is pulled.
+    #
+    # The program is written with the `rp2.asm_pio` syntax: the instructions
+    # are functions injected by the decorator. The host-side simulator in
+    # `lcdsim` provides the same decorator to interpret the program.
+    import rp2
+
+    # fmt: off
+    @rp2.asm_pio(
+        out_init=(rp2.PIO.OUT_LOW,) * width,
+        set_init=rp2.PIO.OUT_LOW,
+        sideset_init=rp2.PIO.OUT_LOW,
+        out_shiftdir=rp2.PIO.SHIFT_RIGHT,
+    )
+    def hd44780_write():
+        wrap_target()
+        pull(block)                     # E low. Wait for the next word
+        out(pins, width)                # Data pins
+        out(x, 1)                       # RS
+        jmp(not_x, "rs_low")
+        set(pins, 1)
+        jmp("strobe")
+        label("rs_low")
+        set(pins, 0)
+        label("strobe")
+        nop().side(1)                   # E high for 1 cycle
+        out(x, 31 - width)              # E low. Extra cycles to wait
+        label("wait")
+        jmp(x_dec, "wait")
+        wrap()
+    # fmt: on
+
+    return hd44780_write
+
+
+class HD44780BusPIO(HD44780Bus):
+    """Provides a base implementation of a PIO-driven bus for the HD44780 controller
+
+    The timing of the RS and E pins is handled by a state machine of the
+    RP2040 PIO. Sending a command only pushes one word (8-bit bus) or two words
+    (4-bit bus) into the FIFO of the state machine. When sending a sequence of
+    commands, the state machine also waits between two commands, so the CPU
+    only has to enqueue the words.
+
+    The data pins MUST be consecutive GPIOs, DB0 (or DB4) being the lowest one.
+    RW MUST be connected to ground, or to a GPIO which is kept low by this bus,
+    so the controller is always in write mode. Read operations are not
+    supported.
+
+    See `HD44780BusPIO4` and `HD44780BusPIO8`.
+    """
+
+    # Cycles between a falling edge of E and the next rising edge, excluding
+    # the extra wait cycles (see `_make_pio_program()`)
+    _CYCLES_BETWEEN_STROBES = 7
+
+    # Cycles between the pull of a word and the falling edge of E
+    _CYCLES_TO_STROBE = 7
+
+    # State machine frequency. 1 cycle = 1us.
+    _FREQ = 1000000
+
+    def __init__(self, width: int, rs: int, e: int, db_pins: list[int], rw: int | None, bl: int | None, sm_id: int):
+        """Initializes a new instance of the HD44780BusPIO class
+
+        Args:
+            width (int): The bus width in bits.
+            rs (int): The pin number of the RS pin.
+            e (int): The pin number of the E pin.
+            db_pins (list[int]): The pin numbers of the data pins, DB7 first.
+            rw (int | None): The pin number of the RW pin, or None.
+            bl (int | None): The pin number of the BL (backlight control) pin, or None.
+            sm_id (int): The id of the PIO state machine (0 to 7).
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range --OR-- the data pins are not consecutive.
+        """
+        _Helper.validate_integer_arg("sm_id", sm_id, min_value=0, max_value=7)
+        if list(db_pins) != list(range(db_pins[-1] + width - 1, db_pins[-1] - 1, -1)):
+            raise ValueError("Data pins must be consecutive GPIOs, in decreasing order (DB7 first).")
+
+        super().__init__(width=width, can_read=False, can_control_backlight=bl is not None)
+
+        import rp2
+
+        self._rw_pin = None if rw is None else Pin(rw, value=0, mode=Pin.OUT)
+        self._bl_pin = None if bl is None else Pin(bl, value=0, mode=Pin.OUT)
+        self._sm = rp2.StateMachine(
+            sm_id,
+            _make_pio_program(width),
+            freq=HD44780BusPIO._FREQ,
+            out_base=Pin(db_pins[-1]),
+            set_base=Pin(rs),
+            sideset_base=Pin(e),
+        )
+        self._sm.active(1)
+
+    def write(self, cmd: int):
+        _Helper.validate_integer_arg("cmd", cmd, min_value=0, max_value=0b1111111111)
+
+        # Command is a ***write*** operation when RW is low / false
+        # Command is a read operation when RW is high / true
+        if cmd & HD44780Cmds.BITMASK_RW:
+            raise ValueError("Not a write command.")
+
+        self._write_unchecked(cmd)
+
+    def read(self, cmd: int) -> int:
+        raise RuntimeError("Read commands are not supported (bus is write-only).")
+
+    def set_backlight(self, enabled: bool):
+        if self._bl_pin is None:
+            raise RuntimeError("Backlight control is not available as no BL pin was provided.")
+        self._bl_pin.value(enabled)
+
+    def _write_unchecked(self, cmd: int):
+        self._put(cmd, 0)
+        self._wait_for_strobe()
+
+    def _write_many_unchecked(self, cmds: list[int], delay_us: int):
+        # The state machine waits `delay_us` after each command, before
+        # writing the next one. The extra cycles are computed once.
+        wait_cycles = max(0, delay_us - HD44780BusPIO._CYCLES_BETWEEN_STROBES)
+        for cmd in cmds:
+            self._put(cmd, wait_cycles)
+        self._wait_for_strobe()
+
+    def _read_unchecked(self, cmd: int) -> int:
+        raise RuntimeError("Read commands are not supported (bus is write-only).")
+
+    def _put(self, cmd: int, wait_cycles: int):
+        # Pushes the words of a command into the FIFO. Blocks when it is full.
+        rs = 1 if cmd & HD44780Cmds.BITMASK_RS else 0
+        if self.width == 8:
+            self._sm.put((cmd & 0xFF) | (rs << 8) | (wait_cycles << 9))
+        else:
+            self._sm.put(((cmd >> 4) & 0x0F) | (rs << 4))
+            self._sm.put((cmd & 0x0F) | (rs << 4) | (wait_cycles << 5))
+
+    def _wait_for_strobe(self):
+        # Returns once the last word pushed has been written to the LCD, so the
+        # execution time of the command can be measured from now.
+        while self._sm.tx_fifo():
+            time.sleep_us(1)
+        time.sleep_us(HD44780BusPIO._CYCLES_TO_STROBE)
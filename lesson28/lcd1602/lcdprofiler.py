@@ -0,0 +1,317 @@
+# This file is part of the LCD1602 MicroPython LCD library
+# Copyright (C) 2023 Pascal Jobin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from lcd1602._helper import _Helper
+from lcd1602.hd44780cmds import HD44780Cmds
+from lcd1602.lcd1602 import LCD1602
+import utime as time
+
+
+class _CountingPin:
+    # Stands in for a pin of a parallel bus while profiling, counting writes.
+    # Implements the subset of the `Pin` interface used by the buses.
+    def __init__(self, pin, counters: dict):
+        self._pin = pin
+        self._counters = counters
+
+    def on(self):
+        self._counters["pin_writes"] += 1
+        self._pin.on()
+
+    def off(self):
+        self._counters["pin_writes"] += 1
+        self._pin.off()
+
+    def value(self, value: ... = None) -> ...:
+        if value is None:
+            return self._pin.value()
+        self._counters["pin_writes"] += 1
+        return self._pin.value(value)
+
+    def mode(self, mode: int):
+        self._pin.mode(mode)
+
+
+class _CountingI2C:
+    # Stands in for the I2C instance of an I2C bus while profiling, counting
+    # transactions and bytes (excluding the address byte).
+    def __init__(self, i2c, counters: dict):
+        self._i2c = i2c
+        self._counters = counters
+
+    def readfrom(self, addr: int, nbytes: int, stop: bool = True) -> bytes:
+        self._counters["i2c_transactions"] += 1
+        self._counters["i2c_bytes"] += nbytes
+        return self._i2c.readfrom(addr, nbytes, stop)
+
+    def scan(self) -> list[int]:
+        return self._i2c.scan()
+
+    def writeto(self, addr: int, buf: bytes, stop: bool = True) -> int:
+        self._counters["i2c_transactions"] += 1
+        self._counters["i2c_bytes"] += len(buf)
+        return self._i2c.writeto(addr, buf, stop)
+
+
+class LCDProfiler:
+    """Measures the bus traffic of an LCD and the time spent waiting for it
+
+    Profiling is opt-in. While enabled, the profiler replaces a few methods of
+    the LCD and of its bus (and the pins or I2C instance of the bus) with
+    counting wrappers. Disabling the profiler restores the original methods, so
+    a disabled profiler costs nothing.
+
+        ```
+        from lcd1602 import LCD1602, LCDProfiler
+        lcd = LCD1602.begin_i2c(bus_id=1, scl=27, sda=26)
+        profiler = LCDProfiler(lcd, trace_size=16)
+        profiler.enable()
+        lcd.write_text(0, 0, "Hello World!")
+        print(profiler.stats())
+        ```
+
+    The following counters are reported by `stats()`:
+
+        * data_writes, data_reads: Data (DDRAM or CGRAM) operations
+        * ddram_sets, cgram_sets: Set address commands
+        * clear_home: Clear and home commands
+        * other_cmds: Other instructions (entry mode, display control, etc.)
+        * busy_reads: Busy flag reads
+        * i2c_transactions, i2c_bytes: I2C traffic (I2C bus only)
+        * pin_writes: Pin level writes (parallel buses only)
+        * bus_us: Time spent in bus operations, busy flag reads excluded
+        * sleep_us: Time spent waiting for commands to complete (fixed delays)
+        * poll_us: Time spent polling the busy flag
+
+    Data pins written through the SIO registers (see `HD44780Bus4`) and pins
+    driven by the PIO are not counted as pin writes. The bus initialization
+    sequence is not counted, as it is not made of commands.
+    """
+
+    _COUNTERS = (
+        "data_writes",
+        "data_reads",
+        "ddram_sets",
+        "cgram_sets",
+        "clear_home",
+        "other_cmds",
+        "busy_reads",
+        "i2c_transactions",
+        "i2c_bytes",
+        "pin_writes",
+        "bus_us",
+        "sleep_us",
+        "poll_us",
+    )
+
+    _PIN_ATTRS = ("_e_pin", "_rs_pin", "_rw_pin", "_bl_pin")
+
+    def __init__(self, lcd: LCD1602, trace_size: int = 0):
+        """Initializes a new instance of the LCDProfiler class
+
+        Creating a profiler DOES NOT enable it.
+
+        Args:
+            lcd (LCD1602): The LCD to profile.
+            trace_size (int, optional): The number of recent commands kept in the trace (see `get_trace()`). Defaults to 0 (no trace).
+
+        Raises:
+            TypeError: One of the arguments is of the wrong type.
+            ValueError: One of the arguments is out of range.
+        """
+        if not isinstance(lcd, LCD1602):
+            raise TypeError("Invalid LCD.")
+        _Helper.validate_integer_arg("trace_size", trace_size, min_value=0)
+
+        self._lcd = lcd
+        self._counters = {name: 0 for name in LCDProfiler._COUNTERS}
+        self._saved_attrs = None
+
+        # Ring buffer of the recent commands. Both lists are preallocated.
+        self._trace_size = trace_size
+        self._trace_cmds = [0] * trace_size
+        self._trace_ticks = [0] * trace_size
+        self._trace_pos = 0
+        self._trace_len = 0
+
+        # True while the bus sends a sequence of commands, so the commands of
+        # the base implementation of `_write_many_unchecked()` (which calls
+        # `_write_unchecked()`) are not counted twice.
+        self._is_in_many = False
+
+    def disable(self):
+        """Disables profiling, restoring the original methods of the LCD and its bus
+
+        Counters are kept.
+        """
+        if self._saved_attrs is None:
+            return
+
+        for obj, attrs in self._saved_attrs:
+            for name, value in attrs.items():
+                if value is None:
+                    delattr(obj, name)
+                else:
+                    setattr(obj, name, value)
+        self._saved_attrs = None
+
+    def enable(self):
+        """Enables profiling
+
+        Counters are not reset (see `reset()`).
+        """
+        if self._saved_attrs is not None:
+            return
+
+        lcd = self._lcd
+        bus = lcd._bus
+        counters = self._counters
+
+        # Instance attributes only: `None` means the attribute is deleted on
+        # `disable()` so the class method is visible again.
+        lcd_attrs = {"_wait_until_ready": None}
+        bus_attrs = {"_write_unchecked": None, "_write_many_unchecked": None, "_read_unchecked": None}
+        for name in LCDProfiler._PIN_ATTRS:
+            if getattr(bus, name, None) is not None:
+                bus_attrs[name] = getattr(bus, name)
+        if hasattr(bus, "_data_pins"):
+            bus_attrs["_data_pins"] = bus._data_pins
+        if hasattr(bus, "_i2c"):
+            bus_attrs["_i2c"] = bus._i2c
+        self._saved_attrs = [(lcd, lcd_attrs), (bus, bus_attrs)]
+
+        lcd._wait_until_ready = self._make_wait_until_ready(lcd._wait_until_ready)
+        bus._write_unchecked = self._make_write_unchecked(bus._write_unchecked)
+        bus._write_many_unchecked = self._make_write_many_unchecked(bus._write_many_unchecked)
+        bus._read_unchecked = self._make_read_unchecked(bus._read_unchecked)
+        for name in LCDProfiler._PIN_ATTRS:
+            if name in bus_attrs:
+                setattr(bus, name, _CountingPin(bus_attrs[name], counters))
+        if "_data_pins" in bus_attrs:
+            bus._data_pins = [_CountingPin(pin, counters) for pin in bus_attrs["_data_pins"]]
+        if "_i2c" in bus_attrs:
+            bus._i2c = _CountingI2C(bus_attrs["_i2c"], counters)
+
+    def get_trace(self) -> list[tuple[int, int]]:
+        """Gets the most recent commands sent to the LCD
+
+        Returns:
+            list[tuple[int, int]]: The commands, oldest first, as tuples (ticks_us, cmd). `ticks_us` is the value of `time.ticks_us()` when the command was handed to the bus. Commands sent in a single bus operation share the same value.
+        """
+        size = self._trace_size
+        start = self._trace_pos - self._trace_len
+        trace = []
+        for idx in range(start, self._trace_pos):
+            trace.append((self._trace_ticks[idx % size], self._trace_cmds[idx % size]))
+        return trace
+
+    def reset(self):
+        """Resets the counters and clears the trace"""
+        for name in LCDProfiler._COUNTERS:
+            self._counters[name] = 0
+        self._trace_pos = 0
+        self._trace_len = 0
+
+    def stats(self, reset: bool = False) -> dict:
+        """Gets the counters
+
+        See the class documentation for the list of counters.
+
+        Args:
+            reset (bool, optional): True to reset the counters (see `reset()`) once they have been read. Defaults to False.
+
+        Returns:
+            dict: A copy of the counters, by name.
+        """
+        _Helper.validate_boolean_arg("reset", reset)
+        stats = dict(self._counters)
+        if reset:
+            self.reset()
+        return stats
+
+    def _count(self, cmd: int):
+        # Counts a command by class and records it in the trace
+        counters = self._counters
+        if cmd & HD44780Cmds.BITMASK_RS:
+            counters["data_reads" if cmd & HD44780Cmds.BITMASK_RW else "data_writes"] += 1
+        elif cmd & HD44780Cmds.BITMASK_RW:
+            counters["busy_reads"] += 1
+        elif cmd & HD44780Cmds.C08_SET_DDRAM_ADDRESS:
+            counters["ddram_sets"] += 1
+        elif cmd & HD44780Cmds.C07_SET_CGRAM_ADDRESS:
+            counters["cgram_sets"] += 1
+        elif cmd == HD44780Cmds.C01_CLEAR or cmd & ~1 == HD44780Cmds.C02_HOME:
+            counters["clear_home"] += 1
+        else:
+            counters["other_cmds"] += 1
+
+        size = self._trace_size
+        if size:
+            pos = self._trace_pos % size
+            self._trace_cmds[pos] = cmd
+            self._trace_ticks[pos] = time.ticks_us()
+            self._trace_pos = pos + 1
+            self._trace_len = min(self._trace_len + 1, size)
+
+    def _make_read_unchecked(self, read_unchecked):
+        def wrapper(cmd: int) -> int:
+            self._count(cmd)
+            started_at = time.ticks_us()
+            data = read_unchecked(cmd)
+            if cmd != HD44780Cmds.C09_READ_BUSY_FLAG_AND_ADDR:
+                self._counters["bus_us"] += time.ticks_diff(time.ticks_us(), started_at)
+            return data
+
+        return wrapper
+
+    def _make_wait_until_ready(self, wait_until_ready):
+        lcd = self._lcd
+
+        def wrapper():
+            if lcd._pending_cmd is None:
+                return wait_until_ready()
+            # Same condition as `LCD1602._wait_until_ready()`
+            name = "poll_us" if lcd._bus.can_read and not lcd._is_calibrated else "sleep_us"
+            started_at = time.ticks_us()
+            wait_until_ready()
+            self._counters[name] += time.ticks_diff(time.ticks_us(), started_at)
+
+        return wrapper
+
+    def _make_write_many_unchecked(self, write_many_unchecked):
+        def wrapper(cmds: list[int], delay_us: int):
+            for cmd in cmds:
+                self._count(cmd)
+            started_at = time.ticks_us()
+            self._is_in_many = True
+            try:
+                write_many_unchecked(cmds, delay_us)
+            finally:
+                self._is_in_many = False
+            self._counters["bus_us"] += time.ticks_diff(time.ticks_us(), started_at)
+
+        return wrapper
+
+    def _make_write_unchecked(self, write_unchecked):
+        def wrapper(cmd: int):
+            if self._is_in_many:
+                return write_unchecked(cmd)
+            self._count(cmd)
+            started_at = time.ticks_us()
+            write_unchecked(cmd)
+            self._counters["bus_us"] += time.ticks_diff(time.ticks_us(), started_at)
+
+        return wrapper
@@ -1,11 +1,11 @@
 import network
-import utime as time
+import uasyncio as asyncio
 from umachine import Pin
 
 # Custom modules
-from tinyhttpserver import TinyHttpServer
+from tinyhttpserver import AsyncTinyHttpServer
 from httphandlers import RequestHandler
-from lcd1602 import LCD1602  # https://github.com/jobinpa/mycropython_1602_lcd_library
+from lcd1602 import AsyncLCD1602, HD44780Bus4  # https://github.com/jobinpa/mycropython_1602_lcd_library
 import secrets
 
 # LCD pins
@@ -19,6 +19,12 @@ RED_LED = 18
 GREEN_LED = 19
 BLUE_LED = 20
 
+# Maximum number of HTTP connections served concurrently
+MAX_HTTP_CONNECTIONS = 4
+
+# Interval between two refreshes of the LCD status line
+LCD_REFRESH_MS = 250
+
 def get_wifi_status(wifi: network.WLAN) -> str:
     status = wifi.status()
     if status == network.STAT_IDLE:
@@ -36,7 +42,19 @@ def get_wifi_status(wifi: network.WLAN) -> str:
     else:
         return "UNKNOWN"
 
-def main():
+async def update_lcd(lcd: AsyncLCD1602, request_handler: RequestHandler, http_server: AsyncTinyHttpServer):
+    # Shows the LED color and the number of open HTTP connections. This task
+    # runs next to the HTTP server: it is not blocked by the clients.
+    status = None
+    while True:
+        new_status = "{:<6} conn:{:<2}".format(request_handler.color, http_server.num_connections)
+        if new_status != status:
+            status = new_status
+            await lcd.write_text(0, 1, "{:<{}}".format(status, 16))
+            await lcd.flush()
+        await asyncio.sleep_ms(LCD_REFRESH_MS)
+
+async def main_async():
     error = None
 
     # Setup LEDs
@@ -45,17 +63,19 @@ def main():
     blue_led = Pin(BLUE_LED, mode=Pin.OUT, value=0)
 
     # Setup LCD
-    lcd = LCD1602.begin_4bit(rs=LCD_RS_PIN, e=LCD_E_PIN, db_7_to_4=LCD_DB_7_TO_4_PINS, rw=LCD_RW_PIN)
+    lcd = AsyncLCD1602(HD44780Bus4(rs=LCD_RS_PIN, e=LCD_E_PIN, db_7_to_4=LCD_DB_7_TO_4_PINS, rw=LCD_RW_PIN))
+    await lcd.init()
 
     # Declare some variables
     wifi = None
     http_server = None
+    lcd_task = None
 
     try:
         # Connect to Wi-Fi
         print("Enabling WiFi..")
-        lcd.clear()
-        lcd.write_text(0, 0, "Enabling WiFi")
+        await lcd.clear()
+        await lcd.write_text(0, 0, "Enabling WiFi")
 
         wifi = network.WLAN(network.STA_IF)
         wifi.active(True)
@@ -63,25 +83,30 @@ def main():
         
         while not wifi.isconnected():
             print("Enabling WiFi..", get_wifi_status(wifi))
-            lcd.write_text(0, 1, "{:<{}}".format(get_wifi_status(wifi), 16))
-            time.sleep(1)
+            await lcd.write_text(0, 1, "{:<{}}".format(get_wifi_status(wifi), 16))
+            await asyncio.sleep(1)
 
         wifi_info = wifi.ifconfig()
         
         print("WiFi connected!. IP address is ", wifi_info[0])
-        lcd.clear()
-        lcd.write_text(0, 0, "WiFi connected!")
-        lcd.write_text(0, 1, str(wifi_info[0]))
+        await lcd.clear()
+        await lcd.write_text(0, 0, str(wifi_info[0]))
 
-        # Start HTTP server
+        # Start HTTP server. The LCD is updated by a sibling task while the
+        # server handles the connections.
         request_handler = RequestHandler(red_led, green_led, blue_led)
-        http_server = TinyHttpServer(wifi_info[0], 80, request_handler)
-        http_server.start()
+        http_server = AsyncTinyHttpServer(wifi_info[0], 80, request_handler, MAX_HTTP_CONNECTIONS)
+        lcd_task = asyncio.create_task(update_lcd(lcd, request_handler, http_server))
+        await http_server.start()
     except KeyboardInterrupt:
         pass
     except Exception as e:
         error = e
     finally:
+        # Stop updating the LCD
+        if lcd_task is not None:
+            lcd_task.cancel()
+
         # Turn off all LEDs
         red_led.off()
         green_led.off()
@@ -95,19 +120,25 @@ def main():
         # Disconnect Wi-Fi
         if wifi is not None:
             print("Disabling WiFi...")
-            lcd.clear()
-            lcd.write_text(0, 0, "Disabling WiFi")
+            await lcd.clear()
+            await lcd.write_text(0, 0, "Disabling WiFi")
+            await lcd.flush()
 
             wifi.disconnect()
             while wifi.isconnected():
-                time.sleep(1)
+                await asyncio.sleep(1)
             wifi.active(False)
 
         print("Program ended") if error is None else print("Program ended with error: ", error)
-        lcd.clear()
-        lcd.write_text(0, 0, "Program ended")
+        await lcd.clear()
+        await lcd.write_text(0, 0, "Program ended")
         if error is not None:
-            lcd.write_text(0, 1, str(error))
+            await lcd.write_text(0, 1, str(error))
+        await lcd.flush()
+
+
+def main():
+    asyncio.run(main_async())
 
 
 if __name__ == "__main__":
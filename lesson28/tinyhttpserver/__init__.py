@@ -1,4 +1,8 @@
 from tinyhttpserver.httprequest import HttpRequest
 from tinyhttpserver.httpresponse import HttpResponse
 from tinyhttpserver.httprequesthandler import HttpRequestHandler
+from tinyhttpserver.httprequestparser import HttpRequestError, HttpRequestParser
+from tinyhttpserver.httpresponsewriter import HttpResponseWriter
+from tinyhttpserver.staticfilecache import StaticFile, StaticFileCache
 from tinyhttpserver.tinyhttpserver import TinyHttpServer
+from tinyhttpserver.asynctinyhttpserver import AsyncTinyHttpServer
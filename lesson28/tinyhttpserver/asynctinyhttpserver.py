@@ -0,0 +1,278 @@
+import uasyncio as asyncio
+import utime as time
+from tinyhttpserver import HttpResponse, HttpRequestHandler, HttpRequestError, HttpRequestParser
+from tinyhttpserver.tinyhttpserver import ServerStatus, TinyHttpServer
+
+
+class AsyncTinyHttpServer(TinyHttpServer):
+    """Serves HTTP requests from an asyncio task.
+
+    Unlike `TinyHttpServer.start()`, which handles one connection at a time,
+    this server handles each connection in its own task: a slow or idle client
+    does not stall the other clients, and other tasks (LCD, LEDs, etc.) keep
+    running while the server waits for the network. Requests are handled by
+    `HttpRequestHandler.handle_request_async()`.
+
+        ```
+        import uasyncio as asyncio
+
+        async def main():
+            http_server = AsyncTinyHttpServer("0.0.0.0", 80, request_handler)
+            server_task = asyncio.create_task(http_server.start())
+            ...  # Other tasks
+            await server_task
+
+        asyncio.run(main())
+        ```
+
+    At most `max_connections` connections are served at a time, which bounds
+    the memory used by the server. Connections above the cap are accepted but
+    wait for a free slot before their request is read; those still waiting
+    after `request_timeout_ms` get a 503 Service Unavailable response. The
+    listen backlog (`listen_backlog`) is independent of the cap: it only holds
+    the connections not accepted yet, and a burst of clients overflowing it
+    has its connection attempts retried by TCP after a second or more. Clients
+    that do not send a complete request within `request_timeout_ms` get a 408
+    Request Timeout response.
+
+    Connections are persistent (HTTP/1.1 keep-alive): a client can send several
+    requests on the same connection, one after the other or pipelined (sent
+    without waiting for the previous responses). Requests are parsed by
+    `HttpRequestParser` as their bytes are received, within the limits set by
+    `max_request_size` (start line and headers) and `max_body_size`. A
+    connection is closed when the client asks for it
+    (`Connection: close`), after `max_requests_per_connection` requests, after
+    being idle for `keep_alive_timeout_ms`, or when another client waits for
+    its slot.
+    """
+
+    _STREAMS_HAVE_READINTO = hasattr(asyncio.StreamReader, "readinto")
+
+    def __init__(self, addr: str, port: int, request_handler: HttpRequestHandler, max_connections: int = 4):
+        """Creates a new instance of AsyncTinyHttpServer.
+
+        Args:
+            addr (str): The address to listen at.
+            port (int): The port to listen at.
+            request_handler (HttpRequestHandler): The handler of the requests.
+            max_connections (int, optional): The maximum number of connections served concurrently. Defaults to 4.
+        """
+        super().__init__(addr, port, request_handler)
+        self.max_concurrent_requests = max_connections
+        self.listen_backlog = 32
+        self.request_timeout_ms = 5000
+        self.keep_alive_timeout_ms = 5000
+        self.max_requests_per_connection = 20
+        self.num_connections = 0
+        self._num_waiting_connections = 0
+        self._idle_writers = []
+        self._server = None
+        self._stopped = None
+        self._slot_freed = None
+
+    async def start(self):
+        # The server can start only if it's stopped
+        if self.status != ServerStatus.STOPPED:
+            return
+
+        print("Starting AsyncTinyHttpServer...")
+        self.status = ServerStatus.STARTING
+        self._stopped = asyncio.Event()
+        self._slot_freed = asyncio.Event()
+
+        try:
+            # Starts listening for incoming connections. Each connection is
+            # handled by its own task. This task only waits for the server to
+            # be stopped.
+            self._server = await asyncio.start_server(
+                self._handle_connection, self.addr, self.port, backlog=self.listen_backlog
+            )
+            self.status = ServerStatus.RUNNING
+            print("AsyncTinyHttpServer listening at address {0} port {1}".format(self.addr, self.port))
+            await self._stopped.wait()
+        finally:
+            # Make sure the server is stopped when we exit this method (even
+            # if the task was cancelled) so the server socket is closed
+            self.stop()
+
+    def stop(self):
+        if self.status != ServerStatus.RUNNING:
+            return
+
+        print("Stopping AsyncTinyHttpServer...")
+        self.status = ServerStatus.STOPPING
+        server = self._server
+        self._server = None
+
+        try:
+            if server is not None:
+                server.close()
+        except:
+            pass
+
+        # Close the idle persistent connections: their tasks are waiting for a
+        # request that will not be served
+        while self._idle_writers:
+            self._idle_writers.pop().close()
+
+        self.status = ServerStatus.STOPPED
+        self._stopped.set()
+        print("AsyncTinyHttpServer stopped")
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client_addr = writer.get_extra_info("peername")
+
+        # Wait for a free slot if too many clients are already connected
+        if not await self._acquire_slot():
+            print(client_addr, "<Too many connections>")
+            try:
+                await self._send_response_async(HttpResponse(503, "Service Unavailable", None, None), writer)
+            except OSError:
+                pass
+            await self._close_connection(writer)
+            return
+
+        # The parser and the receive buffer are reused by all the requests of
+        # the connection. Bytes received after a request (pipelined requests)
+        # stay in the buffer, between `pending_start` and `pending_end`.
+        parser = HttpRequestParser(self.max_request_size, self.max_body_size)
+        buffer = memoryview(bytearray(self.receive_buffer_size))
+        pending_start = 0
+        pending_end = 0
+
+        num_requests = 0
+        keep_alive = True
+        try:
+            while keep_alive and self.status == ServerStatus.RUNNING:
+                # Receive the next request
+                try:
+                    started_on = None
+                    while not parser.is_done():
+                        if pending_start == pending_end:
+                            num_bytes = await self._receive(reader, writer, buffer, num_requests, started_on)
+                            if num_bytes == 0:
+                                # The connection was closed
+                                return
+                            pending_start = 0
+                            pending_end = num_bytes
+                        if started_on is None:
+                            started_on = time.ticks_ms()
+                        pending_start += parser.feed(buffer[pending_start:pending_end])
+                except HttpRequestError as ex:
+                    print(client_addr, "<Invalid request>")
+                    await self._send_response_async(HttpResponse(ex.code, ex.status_message, None, None), writer)
+                    return
+                except asyncio.TimeoutError:
+                    if num_requests == 0 or parser.is_started():
+                        print(client_addr, "<Request timeout>")
+                        await self._send_response_async(HttpResponse(408, "Request Timeout", None, None), writer)
+                    return
+
+                request = parser.get_request()
+                num_requests += 1
+                print(client_addr, request.method, request.target, request.version)
+
+                # We only support support HTTP/1.x (not HTTP/2.x)
+                if not request.version.startswith("HTTP/1."):
+                    await self._send_response_async(HttpResponse(505, "HTTP Version Not Supported", None, None), writer)
+                    return
+
+                # Keep the connection open if the client asks for it, unless it
+                # has sent its maximum number of requests or other clients are
+                # waiting for a slot
+                keep_alive = (
+                    request.should_keep_alive()
+                    and num_requests < self.max_requests_per_connection
+                    and self._num_waiting_connections == 0
+                )
+
+                # Handle the request. If the handler returns None, it's because
+                # it didn't know how to handle the request. We return a 404
+                # response in that case.
+                response = await self.request_handler.handle_request_async(request)
+                if response is None:
+                    response = HttpResponse(404, "Not Found", None, None)
+                await self._send_response_async(response, writer, keep_alive)
+
+                # The request's body is in the parser's buffer: it can only be
+                # reused once the response has been sent
+                parser.reset()
+        except OSError as ex:
+            # Log the error only if the server is running as it is normal to
+            # get an error when stopping the server
+            if self.status == ServerStatus.RUNNING:
+                print("AsyncTinyHttpServer client socket error: ", ex)
+        finally:
+            self.num_connections -= 1
+            self._slot_freed.set()
+            await self._close_connection(writer)
+
+    async def _acquire_slot(self) -> bool:
+        # Takes a connection slot, waiting up to `request_timeout_ms` for one
+        # to be freed. Idle persistent connections are closed to free their
+        # slot. There is no await between the check and the increment, so
+        # other tasks cannot take the slot in-between.
+        try:
+            while self.num_connections >= self.max_concurrent_requests:
+                if self._idle_writers:
+                    self._idle_writers.pop(0).close()
+                self._slot_freed.clear()
+                self._num_waiting_connections += 1
+                try:
+                    await asyncio.wait_for(self._slot_freed.wait(), self.request_timeout_ms / 1000)
+                finally:
+                    self._num_waiting_connections -= 1
+        except asyncio.TimeoutError:
+            return False
+        self.num_connections += 1
+        return True
+
+    async def _close_connection(self, writer: asyncio.StreamWriter):
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+    async def _receive(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, buffer: memoryview, num_requests: int, started_on: int | None
+    ) -> int:
+        # Receives bytes into the buffer. Returns 0 when the connection is
+        # closed. Raises asyncio.TimeoutError when the client is too slow: a
+        # request must be complete `request_timeout_ms` after its first byte.
+        if started_on is not None:
+            timeout_ms = self.request_timeout_ms - time.ticks_diff(time.ticks_ms(), started_on)
+            if timeout_ms <= 0:
+                raise asyncio.TimeoutError()
+        elif num_requests > 0:
+            # While waiting for the next request, a persistent connection is
+            # idle: it is closed after `keep_alive_timeout_ms` or as soon as
+            # another client needs its slot (see `_acquire_slot()`)
+            timeout_ms = self.keep_alive_timeout_ms
+        else:
+            timeout_ms = self.request_timeout_ms
+
+        is_idle = started_on is None and num_requests > 0
+        if is_idle:
+            self._idle_writers.append(writer)
+        try:
+            return await asyncio.wait_for(self._receive_into(reader, buffer), timeout_ms / 1000)
+        finally:
+            if is_idle and writer in self._idle_writers:
+                self._idle_writers.remove(writer)
+
+    async def _receive_into(self, reader: asyncio.StreamReader, buffer: memoryview) -> int:
+        # MicroPython streams receive straight into the buffer. CPython
+        # streams (used by the host tools) return new bytes objects.
+        if AsyncTinyHttpServer._STREAMS_HAVE_READINTO:
+            return await reader.readinto(buffer)
+        data = await reader.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    async def _send_response_async(self, response: HttpResponse, writer: asyncio.StreamWriter, keep_alive: bool = False):
+        if self.status == ServerStatus.RUNNING:
+            started_on = time.ticks_us()
+            num_bytes = await self._response_writer.send_async(writer, response, keep_alive)
+            elapsed_us = time.ticks_diff(time.ticks_us(), started_on)
+            print(response.code, response.status_message, "({} bytes in {} us)".format(num_bytes, elapsed_us))
@@ -1,12 +1,88 @@
 class HttpRequest:
-    def __init__(self, method: str, target: str, version: str):
+    def __init__(
+        self, method: str, target: str, version: str, headers: dict | None = None, body: bytes | memoryview | None = None
+    ):
         """Creates a new instance of HttpRequest.
 
+        The target is split into `path` and `query`, both percent-decoded. For
+        instance, the target `/led?color=dark%20red` has the path `/led` and
+        the query `{"color": "dark red"}`.
+
         Args:
             method (str): The HTTP method (GET, PUT, POST, HEAD, OPTIONS).
             target (str): The request target (typically a URL)
             version (str): The HTTP version (ex: HTTP/1.1).
+            headers (dict | None): The headers, by lowercase name (ex: content-length).
+            body (bytes | memoryview | None): The request's body. `HttpRequestParser` provides a memoryview that is only valid until the next request is parsed.
+
+        Raises:
+            ValueError: The target contains an invalid percent-encoded sequence.
         """
         self.method = method
         self.target = target
         self.version = version
+        self.headers = {} if headers is None else headers
+        self.body = body
+
+        separator = target.find("?")
+        if separator < 0:
+            self.path = HttpRequest._unquote(target, False)
+            self.query = {}
+        else:
+            self.path = HttpRequest._unquote(target[:separator], False)
+            self.query = HttpRequest._parse_query(target[separator + 1 :])
+
+    def should_keep_alive(self) -> bool:
+        """Returns whether the client asks to keep the connection open after the response.
+
+        HTTP/1.1 connections are persistent unless the client sends
+        `Connection: close`. HTTP/1.0 connections are persistent only if the
+        client sends `Connection: keep-alive`.
+
+        Returns:
+            bool: True if the connection should be kept open.
+        """
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    @staticmethod
+    def _parse_query(query: str) -> dict:
+        # name1=value1&name2=value2. The last value of a repeated name wins.
+        params = {}
+        for param in query.split("&"):
+            if param == "":
+                continue
+            separator = param.find("=")
+            if separator < 0:
+                params[HttpRequest._unquote(param, True)] = ""
+            else:
+                params[HttpRequest._unquote(param[:separator], True)] = HttpRequest._unquote(param[separator + 1 :], True)
+        return params
+
+    @staticmethod
+    def _unquote(text: str, plus_is_space: bool) -> str:
+        # Decodes %XX sequences (UTF-8 encoded) and, in query strings, the plus
+        # signs encoding spaces. Most targets have nothing to decode.
+        if "%" not in text and not (plus_is_space and "+" in text):
+            return text
+
+        decoded = bytearray()
+        idx = 0
+        length = len(text)
+        while idx < length:
+            char = text[idx]
+            if char == "%":
+                digits = text[idx + 1 : idx + 3]
+                if len(digits) != 2 or digits[0] in "+-" or digits.strip() != digits:
+                    raise ValueError("Invalid percent-encoded sequence")
+                decoded.append(int(digits, 16))
+                idx += 3
+                continue
+            if char == "+" and plus_is_space:
+                decoded.append(0x20)
+            else:
+                decoded.extend(char.encode("utf-8"))
+            idx += 1
+        return bytes(decoded).decode("utf-8")
@@ -5,7 +5,8 @@ class HttpRequestHandler:
     """Handles HTTP requests.
 
     This base class needs to be subclassed to handle HTTP requests. The subclass
-    needs to override the handle_request method.
+    needs to override the handle_request method. Subclasses used with
+    AsyncTinyHttpServer can override the handle_request_async method instead.
     """
 
     def handle_request(self, request: HttpRequest) -> HttpResponse | None:
@@ -18,3 +19,18 @@ class HttpRequestHandler:
             HttpResponse | None: The response to send back to the client. If None, a 404 Not Found response is returned.
         """
         raise NotImplementedError()
+
+    async def handle_request_async(self, request: HttpRequest) -> HttpResponse | None:
+        """This method is called by AsyncTinyHttpServer when a request is received.
+
+        The default implementation calls handle_request. Override this method to
+        await while handling a request, so other connections and tasks can run
+        in the meantime.
+
+        Args:
+            request (HttpRequest): The request that was received.
+
+        Returns:
+            HttpResponse | None: The response to send back to the client. If None, a 404 Not Found response is returned.
+        """
+        return self.handle_request(request)
@@ -0,0 +1,319 @@
+from tinyhttpserver import HttpRequest
+
+
+class HttpRequestError(Exception):
+    def __init__(self, code: int, status_message: str):
+        """Creates a new instance of HttpRequestError.
+
+        Args:
+            code (int): The HTTP status code of the response to send back (ex: 400).
+            status_message (str): The HTTP status message of the response to send back (ex: Bad Request).
+        """
+        super().__init__(status_message)
+        self.code = code
+        self.status_message = status_message
+
+
+class HttpRequestParser:
+    """Parses HTTP/1.x requests from bytes received in any number of pieces.
+
+    The parser works on bytes, without decoding the whole request to a string:
+    only the start line and the headers are decoded, once they are complete.
+    Bytes are fed as they are received (for instance after each `recv_into()`
+    call on a reusable buffer), and `feed()` returns how many of them belong
+    to the current request. The remaining bytes (pipelined requests) must be
+    fed again after `reset()`:
+
+        ```
+        parser = HttpRequestParser()
+        buffer = memoryview(bytearray(512))
+        while not parser.is_done():
+            num_bytes = client_socket.recv_into(buffer)
+            num_used = parser.feed(buffer[:num_bytes])
+        request = parser.get_request()
+        ```
+
+    The head (start line and headers) and the body are copied to buffers
+    allocated once, when the parser is created. Requests whose head is larger
+    than `max_header_size` or that have more than `max_headers` headers are
+    rejected with a 431 Request Header Fields Too Large error. Requests whose
+    body is larger than `max_body_size` are rejected with a 413 Content Too
+    Large error. Bodies are framed by the Content-Length header or sent with
+    the chunked transfer coding.
+    """
+
+    # Parser states
+    _HEAD = 0
+    _BODY = 1
+    _CHUNK_SIZE = 2
+    _CHUNK_EXTENSION = 3
+    _CHUNK_DATA = 4
+    _CHUNK_DATA_END = 5
+    _TRAILER = 6
+    _DONE = 7
+
+    # Byte values
+    _LF = 0x0A
+    _CR = 0x0D
+
+    def __init__(self, max_header_size: int = 1024, max_body_size: int = 1024, max_headers: int = 16):
+        """Creates a new instance of HttpRequestParser.
+
+        Args:
+            max_header_size (int, optional): The maximum size of the start line and the headers, in bytes. Defaults to 1024.
+            max_body_size (int, optional): The maximum size of the body, in bytes. Defaults to 1024.
+            max_headers (int, optional): The maximum number of headers. Defaults to 16.
+        """
+        self.max_header_size = max_header_size
+        self.max_body_size = max_body_size
+        self.max_headers = max_headers
+        self._head = bytearray(max_header_size)
+        self._head_mv = memoryview(self._head)
+        self._body = bytearray(max_body_size)
+        self._body_mv = memoryview(self._body)
+        self.reset()
+
+    def feed(self, data: bytes | bytearray | memoryview) -> int:
+        """Parses received bytes.
+
+        Args:
+            data (bytes | bytearray | memoryview): The received bytes.
+
+        Returns:
+            int: The number of bytes used. When the request is complete, the remaining bytes belong to the next request.
+
+        Raises:
+            HttpRequestError: The request is invalid or too large. The connection must be closed after sending the error response.
+        """
+        if not isinstance(data, memoryview):
+            data = memoryview(data)
+
+        pos = 0
+        end = len(data)
+        while pos < end and self._state != HttpRequestParser._DONE:
+            state = self._state
+            if state == HttpRequestParser._HEAD:
+                pos = self._feed_head(data, pos, end)
+            elif state == HttpRequestParser._BODY or state == HttpRequestParser._CHUNK_DATA:
+                pos = self._feed_body(data, pos, end)
+            else:
+                pos = self._feed_chunk_line(data, pos, end)
+        return pos
+
+    def get_request(self) -> HttpRequest | None:
+        """Returns the parsed request.
+
+        Returns:
+            HttpRequest | None: The request, or None if it is not complete yet. Its body is only valid until the next request is parsed.
+        """
+        return self._request if self._state == HttpRequestParser._DONE else None
+
+    def is_done(self) -> bool:
+        """Returns whether a complete request has been parsed."""
+        return self._state == HttpRequestParser._DONE
+
+    def is_started(self) -> bool:
+        """Returns whether some bytes of the current request have been received."""
+        return self._head_len > 0
+
+    def reset(self):
+        """Prepares the parser for the next request. The buffers are reused."""
+        self._state = HttpRequestParser._HEAD
+        self._request = None
+        self._head_len = 0
+        self._line_len = 0  # Length of the current line, without CR and LF
+        self._body_len = 0
+        self._remaining = 0  # Bytes left in the body or in the current chunk
+        self._trailer_len = 0
+
+    def _feed_head(self, data: memoryview, pos: int, end: int) -> int:
+        # Copies the head to its buffer until the empty line ending it
+        head = self._head
+        head_len = self._head_len
+        line_len = self._line_len
+        max_header_size = self.max_header_size
+        while pos < end:
+            byte = data[pos]
+            pos += 1
+
+            # Empty lines before the start line are ignored
+            if head_len == 0 and (byte == HttpRequestParser._CR or byte == HttpRequestParser._LF):
+                continue
+
+            if head_len == max_header_size:
+                raise HttpRequestError(431, "Request Header Fields Too Large")
+            head[head_len] = byte
+            head_len += 1
+
+            if byte == HttpRequestParser._LF:
+                if line_len == 0:
+                    self._head_len = head_len
+                    self._parse_head()
+                    return pos
+                line_len = 0
+            elif byte != HttpRequestParser._CR:
+                line_len += 1
+
+        self._head_len = head_len
+        self._line_len = line_len
+        return pos
+
+    def _feed_body(self, data: memoryview, pos: int, end: int) -> int:
+        # Copies the body (or the current chunk) to its buffer
+        num_bytes = min(self._remaining, end - pos)
+        body_len = self._body_len
+        self._body_mv[body_len : body_len + num_bytes] = data[pos : pos + num_bytes]
+        self._body_len = body_len + num_bytes
+        self._remaining -= num_bytes
+        pos += num_bytes
+
+        if self._remaining == 0:
+            if self._state == HttpRequestParser._BODY:
+                self._finish()
+            else:
+                self._state = HttpRequestParser._CHUNK_DATA_END
+        return pos
+
+    def _feed_chunk_line(self, data: memoryview, pos: int, end: int) -> int:
+        # Parses the chunk size lines (hexadecimal size and extensions), the
+        # line ends after the chunk data and the trailer, byte by byte: the
+        # chunk size is computed on the fly and nothing needs to be copied.
+        while pos < end:
+            byte = data[pos]
+            pos += 1
+            state = self._state
+
+            if byte == HttpRequestParser._LF:
+                if state == HttpRequestParser._CHUNK_SIZE or state == HttpRequestParser._CHUNK_EXTENSION:
+                    if self._line_len == 0:
+                        raise HttpRequestError(400, "Bad Request")
+                    self._line_len = 0
+                    if self._remaining == 0:
+                        # The last chunk is followed by the trailer
+                        self._state = HttpRequestParser._TRAILER
+                    else:
+                        self._state = HttpRequestParser._CHUNK_DATA
+                        return pos
+                elif state == HttpRequestParser._CHUNK_DATA_END:
+                    if self._line_len != 0:
+                        raise HttpRequestError(400, "Bad Request")
+                    self._state = HttpRequestParser._CHUNK_SIZE
+                elif self._line_len == 0:
+                    # The trailer (ignored) ends with an empty line
+                    self._finish()
+                    return pos
+                else:
+                    self._line_len = 0
+            elif byte == HttpRequestParser._CR:
+                continue
+            elif state == HttpRequestParser._CHUNK_SIZE:
+                digit = HttpRequestParser._get_hex_digit(byte)
+                if digit < 0:
+                    if self._line_len == 0 or (byte != 0x3B and byte != 0x20 and byte != 0x09):  # ; or whitespace
+                        raise HttpRequestError(400, "Bad Request")
+                    self._state = HttpRequestParser._CHUNK_EXTENSION
+                    continue
+                self._remaining = self._remaining * 16 + digit
+                self._line_len += 1
+                if self._body_len + self._remaining > self.max_body_size:
+                    raise HttpRequestError(413, "Content Too Large")
+            elif state == HttpRequestParser._CHUNK_DATA_END:
+                raise HttpRequestError(400, "Bad Request")
+            else:
+                # Chunk extensions and trailer fields are ignored, but they
+                # count towards the header size limit
+                if state == HttpRequestParser._TRAILER:
+                    self._line_len += 1
+                self._trailer_len += 1
+                if self._trailer_len > self.max_header_size:
+                    raise HttpRequestError(431, "Request Header Fields Too Large")
+        return pos
+
+    def _finish(self):
+        self._request.body = self._body_mv[: self._body_len]
+        self._state = HttpRequestParser._DONE
+
+    def _parse_head(self):
+        # Decodes the start line and the headers, and finds how the body is framed
+        # https://developer.mozilla.org/en-US/docs/Web/HTTP/Messages#http_requests
+        try:
+            lines = bytes(self._head_mv[: self._head_len]).decode("utf-8").split("\n")
+        except UnicodeError:
+            raise HttpRequestError(400, "Bad Request")
+
+        # Parse the start line
+        # https://developer.mozilla.org/en-US/docs/Web/HTTP/Messages#start_line
+        request_line = lines[0].rstrip("\r").split(" ")
+        if len(request_line) != 3 or request_line[0] == "" or request_line[1] == "" or not request_line[2].startswith("HTTP/"):
+            raise HttpRequestError(400, "Bad Request")
+
+        # Parse the headers. The last two lines are the empty line ending them
+        # and what follows the last newline (nothing).
+        # https://developer.mozilla.org/en-US/docs/Web/HTTP/Messages#headers
+        if len(lines) - 3 > self.max_headers:
+            raise HttpRequestError(431, "Request Header Fields Too Large")
+        headers = {}
+        for line in lines[1:-2]:
+            line = line.rstrip("\r")
+            separator = line.find(":")
+            name = line[:separator]
+            if separator <= 0 or name.strip() != name or " " in name or "\t" in name:
+                raise HttpRequestError(400, "Bad Request")
+            name = name.lower()
+            value = line[separator + 1 :].strip()
+            if name in headers:
+                if name == "content-length" and headers[name] != value:
+                    raise HttpRequestError(400, "Bad Request")
+                value = headers[name] + ", " + value
+            headers[name] = value
+
+        try:
+            self._request = HttpRequest(request_line[0], request_line[1], request_line[2], headers)
+        except ValueError:
+            raise HttpRequestError(400, "Bad Request")
+
+        # Find how the body is framed
+        # https://developer.mozilla.org/en-US/docs/Web/HTTP/Messages#body
+        transfer_encoding = headers.get("transfer-encoding")
+        content_length = headers.get("content-length")
+        if transfer_encoding is not None:
+            # A request with both headers may be read differently by proxies
+            if content_length is not None:
+                raise HttpRequestError(400, "Bad Request")
+            if transfer_encoding.lower() != "chunked":
+                raise HttpRequestError(501, "Not Implemented")
+            self._state = HttpRequestParser._CHUNK_SIZE
+        elif content_length is not None:
+            content_length = content_length.split(",")[0].strip()
+            if content_length == "" or not HttpRequestParser._is_decimal(content_length):
+                raise HttpRequestError(400, "Bad Request")
+            self._remaining = int(content_length)
+            if self._remaining > self.max_body_size:
+                raise HttpRequestError(413, "Content Too Large")
+            self._state = HttpRequestParser._BODY
+            if self._remaining == 0:
+                self._finish()
+        else:
+            # No body
+            self._state = HttpRequestParser._DONE
+        self._line_len = 0
+
+    @staticmethod
+    def _get_hex_digit(byte: int) -> int:
+        # Returns the value of a hexadecimal digit, or -1
+        if 0x30 <= byte <= 0x39:  # 0-9
+            return byte - 0x30
+        if 0x41 <= byte <= 0x46:  # A-F
+            return byte - 0x37
+        if 0x61 <= byte <= 0x66:  # a-f
+            return byte - 0x57
+        return -1
+
+    @staticmethod
+    def _is_decimal(text: str) -> bool:
+        # Returns True when the text only has ASCII digits. `str.isdigit()`
+        # also accepts other digits (such as "²"), which `int()` rejects.
+        for char in text:
+            if not "0" <= char <= "9":
+                return False
+        return True
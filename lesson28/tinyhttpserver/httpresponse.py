@@ -1,14 +1,26 @@
 class HttpResponse:
-    def __init__(self, code: int, status_message: str, content: str | None, content_type: str | None):
+    def __init__(
+        self,
+        code: int,
+        status_message: str,
+        content: str | bytes | None,
+        content_type: str | None,
+        headers: dict | None = None,
+        file_path: str | None = None,
+    ):
         """Creates a new instance of HttpResponse.
 
         Args:
             code (int): The HTTP status code.
             status_message (str): The HTTP status message.
-            content (str | None): The response's content.
+            content (str | bytes | None): The response's content. Text is encoded to UTF-8, bytes (or any buffer) are sent as is.
             content_type (str | None): The response's MIME content type.
+            headers (dict | None): Additional headers, by name (ex: ETag).
+            file_path (str | None): The path of a file to send as the content, instead of `content`. The file is sent in chunks, without being loaded in memory.
         """
         self.code = code
         self.status_message = status_message
         self.content = content
         self.content_type = content_type
+        self.headers = {} if headers is None else headers
+        self.file_path = file_path
@@ -0,0 +1,227 @@
+import uasyncio as asyncio
+import uerrno as errno
+import uos as os
+import uselect as select
+import utime as time
+from tinyhttpserver import HttpResponse
+
+
+class HttpResponseWriter:
+    """Sends responses without building them in memory.
+
+    The headers are assembled in a buffer allocated once, from parts encoded
+    once: the status lines and the content types are cached, and the Date
+    header is formatted at most once per second. The content is then sent
+    from a memoryview, without being copied nor concatenated to the headers.
+    Small contents are copied after the headers, so the response fits in a
+    single TCP segment.
+
+    `socket.send()` may send only part of the data (it does on MicroPython
+    when the socket's send buffer is full). The writer sends the rest until
+    everything has been written, waiting for the socket to accept more data:
+    a slow client slows the writer down instead of filling the memory
+    (backpressure). The asyncio variant awaits `drain()` after each chunk.
+
+    Files (see `HttpResponse.file_path`) are streamed from flash in chunks of
+    `chunk_size` bytes, read into the same buffer.
+    """
+
+    _DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+    _MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+    # Headers that are the same for every response
+    _SERVER_HEADERS = b"Server: TinyHttpServer\r\nCache-Control: no-cache\r\n"
+    _KEEP_ALIVE_HEADER = b"Connection: keep-alive\r\n\r\n"
+    _CLOSE_HEADER = b"Connection: close\r\n\r\n"
+
+    def __init__(self, chunk_size: int = 1024, send_timeout_ms: int = 5000):
+        """Creates a new instance of HttpResponseWriter.
+
+        Args:
+            chunk_size (int, optional): The size of the buffer used for the headers and the file chunks, in bytes. Defaults to 1024.
+            send_timeout_ms (int, optional): The maximum time to wait for a client to accept more data. Defaults to 5000.
+        """
+        self.chunk_size = chunk_size
+        self.send_timeout_ms = send_timeout_ms
+        self._buffer = bytearray(chunk_size)
+        self._buffer_mv = memoryview(self._buffer)
+        self._status_lines = {}  # Status code -> (status message, encoded status line)
+        self._content_types = {}  # Content type -> encoded Content-Type header
+        self._date = b""
+        self._date_time = None
+
+    def send(self, client_socket, response: HttpResponse, keep_alive: bool = False) -> int:
+        """Sends a response on a blocking socket.
+
+        Args:
+            client_socket (socket): The client socket.
+            response (HttpResponse): The response.
+            keep_alive (bool, optional): Whether the connection is kept open after the response. Defaults to False.
+
+        Returns:
+            int: The number of bytes sent.
+
+        Raises:
+            OSError: The client socket failed, or did not accept data for `send_timeout_ms`.
+        """
+        content, content_length = self._get_content(response)
+        header_len = self._encode_headers(response, content_length, keep_alive)
+        buffer_mv = self._buffer_mv
+
+        if response.file_path is not None and content_length > 0:
+            self._send_all(client_socket, buffer_mv[:header_len])
+            with open(response.file_path, "rb") as f:
+                while True:
+                    num_bytes = f.readinto(self._buffer)
+                    if not num_bytes:
+                        break
+                    self._send_all(client_socket, buffer_mv[:num_bytes])
+        elif content is not None and header_len + content_length <= len(self._buffer):
+            buffer_mv[header_len : header_len + content_length] = content
+            self._send_all(client_socket, buffer_mv[: header_len + content_length])
+        else:
+            self._send_all(client_socket, buffer_mv[:header_len])
+            if content is not None:
+                self._send_all(client_socket, content)
+        return header_len + content_length
+
+    async def send_async(self, writer: asyncio.StreamWriter, response: HttpResponse, keep_alive: bool = False) -> int:
+        """Sends a response on an asyncio stream.
+
+        The buffer is shared by all the connections: it is handed over to the
+        stream (which sends or copies it) before each await.
+
+        Args:
+            writer (asyncio.StreamWriter): The client stream.
+            response (HttpResponse): The response.
+            keep_alive (bool, optional): Whether the connection is kept open after the response. Defaults to False.
+
+        Returns:
+            int: The number of bytes sent.
+
+        Raises:
+            OSError: The client stream failed.
+        """
+        content, content_length = self._get_content(response)
+        header_len = self._encode_headers(response, content_length, keep_alive)
+        buffer_mv = self._buffer_mv
+
+        if response.file_path is not None and content_length > 0:
+            writer.write(buffer_mv[:header_len])
+            await writer.drain()
+            with open(response.file_path, "rb") as f:
+                while True:
+                    num_bytes = f.readinto(self._buffer)
+                    if not num_bytes:
+                        break
+                    writer.write(buffer_mv[:num_bytes])
+                    await writer.drain()
+        elif content is not None and header_len + content_length <= len(self._buffer):
+            buffer_mv[header_len : header_len + content_length] = content
+            writer.write(buffer_mv[: header_len + content_length])
+            await writer.drain()
+        else:
+            writer.write(buffer_mv[:header_len])
+            await writer.drain()
+            if content is not None:
+                for pos in range(0, content_length, self.chunk_size):
+                    writer.write(content[pos : pos + self.chunk_size])
+                    await writer.drain()
+        return header_len + content_length
+
+    def _append(self, pos: int, data: bytes) -> int:
+        # Copies data to the buffer at `pos`, growing it if needed. Returns the new position.
+        end = pos + len(data)
+        if end > len(self._buffer):
+            buffer = bytearray(max(end, 2 * len(self._buffer)))
+            buffer[:pos] = self._buffer_mv[:pos]
+            self._buffer = buffer
+            self._buffer_mv = memoryview(buffer)
+        self._buffer_mv[pos:end] = data
+        return end
+
+    def _encode_headers(self, response: HttpResponse, content_length: int, keep_alive: bool) -> int:
+        # Assembles the status line and the headers in the buffer. Returns their length.
+        # https://developer.mozilla.org/en-US/docs/Web/HTTP/Messages#http_responses
+        status_line = self._status_lines.get(response.code)
+        if status_line is None or status_line[0] != response.status_message:
+            status_line = (response.status_message, "HTTP/1.1 {} {}\r\n".format(response.code, response.status_message).encode("utf-8"))
+            self._status_lines[response.code] = status_line
+        pos = self._append(0, status_line[1])
+
+        # A 304 Not Modified response has no payload: the client uses the one
+        # it has in cache
+        if response.code != 304:
+            content_type = "text/plain" if response.content_type is None else response.content_type
+            content_type_header = self._content_types.get(content_type)
+            if content_type_header is None:
+                content_type_header = "Content-Type: {}\r\n".format(content_type).encode("utf-8")
+                self._content_types[content_type] = content_type_header
+            pos = self._append(pos, content_type_header)
+            pos = self._append(pos, "Content-Length: {}\r\n".format(content_length).encode("utf-8"))
+
+        pos = self._append(pos, HttpResponseWriter._SERVER_HEADERS)
+        pos = self._append(pos, self._get_date_header())
+        for name, value in response.headers.items():
+            pos = self._append(pos, "{}: {}\r\n".format(name, value).encode("utf-8"))
+
+        # The headers end with an empty line, even if there is no payload. The
+        # client relies on it (and on Content-Length) to find where the
+        # response ends when the connection is kept open.
+        return self._append(pos, HttpResponseWriter._KEEP_ALIVE_HEADER if keep_alive else HttpResponseWriter._CLOSE_HEADER)
+
+    def _get_content(self, response: HttpResponse) -> tuple:
+        # Returns the content as a memoryview (None for a file or no content) and its length
+        if response.code == 304:
+            return None, 0
+        if response.file_path is not None:
+            return None, os.stat(response.file_path)[6]
+        content = response.content
+        if content is None:
+            return None, 0
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        content = memoryview(content)
+        return content, len(content)
+
+    def _get_date_header(self) -> bytes:
+        # https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Date
+        # Date: <day-name>, <day> <month> <year> <hour>:<minute>:<second> GMT
+        now = time.time()
+        if now != self._date_time:
+            current_time = time.gmtime(now)
+            self._date = "Date: {}, {:02} {} {:04} {:02}:{:02}:{:02} GMT\r\n".format(
+                HttpResponseWriter._DAYS[current_time[6]],  # Day name
+                current_time[2],  # Day
+                HttpResponseWriter._MONTHS[current_time[1] - 1],  # Month (1 to 12)
+                current_time[0],  # Year
+                current_time[3],  # Hour
+                current_time[4],  # Minute
+                current_time[5],  # Second
+            ).encode("utf-8")
+            self._date_time = now
+        return self._date
+
+    def _send_all(self, client_socket, data: memoryview):
+        # Sends until all the data has been accepted by the socket, waiting
+        # for it to be writable when its send buffer is full
+        pos = 0
+        length = len(data)
+        poller = None
+        while pos < length:
+            try:
+                num_bytes = client_socket.send(data[pos:])
+            except OSError as ex:
+                if ex.args[0] != errno.EAGAIN:
+                    raise
+                num_bytes = 0
+            if num_bytes:
+                pos += num_bytes
+                continue
+
+            # Nothing was sent: wait until the client reads some data
+            if poller is None:
+                poller = select.poll()
+                poller.register(client_socket, select.POLLOUT)
+            if not poller.poll(self.send_timeout_ms):
+                raise OSError(errno.ETIMEDOUT)
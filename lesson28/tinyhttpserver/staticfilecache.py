@@ -0,0 +1,156 @@
+import ubinascii as binascii
+import uos as os
+from tinyhttpserver import HttpRequest, HttpResponse
+
+
+class StaticFile:
+    def __init__(self, path: str, content: bytes, etag: str, size: int, mtime: int):
+        """Creates a new instance of StaticFile.
+
+        Args:
+            path (str): The path of the file.
+            content (bytes): The content of the file, as sent to the clients.
+            etag (str): The entity tag of the content (a quoted hash of the content).
+            size (int): The size of the file when it was loaded, in bytes.
+            mtime (int): The modification time of the file when it was loaded.
+        """
+        self.path = path
+        self.content = content
+        self.etag = etag
+        self.size = size
+        self.mtime = mtime
+
+
+class StaticFileCache:
+    """Keeps static files (pages, style sheets, etc.) in memory.
+
+    A file is read from flash the first time it is requested, and kept as
+    bytes ready to be sent: later requests do not read nor encode it again.
+    Each file gets an entity tag (ETag) computed from its content. A client
+    sending it back in the If-None-Match header gets a 304 Not Modified
+    response without payload.
+
+    The cache holds at most `max_size` bytes. When a file does not fit, the
+    least recently used files are evicted. A file is reloaded when its size or
+    modification time changes, or after `invalidate()` is called.
+
+    Files larger than `max_size` are not kept in memory: `get()` reads them on
+    every call, and `get_response()` has them streamed from flash (see
+    `HttpResponse.file_path`), with an ETag made of their size and
+    modification time.
+    """
+
+    def __init__(self, max_size: int = 16384):
+        """Creates a new instance of StaticFileCache.
+
+        Args:
+            max_size (int, optional): The maximum number of bytes kept in memory. Defaults to 16384.
+        """
+        self.max_size = max_size
+        self.size = 0
+        self._files = {}  # Path -> StaticFile
+
+        # Paths from the least recently used to the most recently used
+        self._lru = []
+
+    def get(self, path: str) -> StaticFile:
+        """Returns a file, loading it if it is not in the cache or has changed.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            StaticFile: The file.
+
+        Raises:
+            OSError: The file does not exist or cannot be read.
+        """
+        # Checking the file's metadata is much cheaper than reading it
+        stat = os.stat(path)
+        size = stat[6]
+        mtime = stat[8]
+
+        file = self._files.get(path)
+        if file is not None and (file.size != size or file.mtime != mtime):
+            self.invalidate(path)
+            file = None
+
+        if file is None:
+            file = self._load(path, size, mtime)
+            if size <= self.max_size:
+                self._evict(self.max_size - size)
+                self._files[path] = file
+                self._lru.append(path)
+                self.size += size
+        else:
+            # Mark as most recently used
+            self._lru.remove(path)
+            self._lru.append(path)
+
+        return file
+
+    def get_response(self, request: HttpRequest, path: str, content_type: str) -> HttpResponse | None:
+        """Returns the response serving a file to a request.
+
+        Args:
+            request (HttpRequest): The request.
+            path (str): The path of the file.
+            content_type (str): The MIME content type of the file.
+
+        Returns:
+            HttpResponse | None: A 200 OK response with the file's content, a 304 Not Modified response if the client already has it, or None if the file does not exist.
+        """
+        try:
+            stat = os.stat(path)
+            if stat[6] > self.max_size:
+                etag = 'W/"{:x}-{:x}"'.format(stat[6], stat[8])
+                content = None
+            else:
+                file = self.get(path)
+                etag = file.etag
+                content = file.content
+        except OSError:
+            return None
+
+        headers = {"ETag": etag}
+        if StaticFileCache._matches(request.headers.get("if-none-match"), etag):
+            return HttpResponse(304, "Not Modified", None, None, headers)
+        if content is None:
+            return HttpResponse(200, "OK", None, content_type, headers, path)
+        return HttpResponse(200, "OK", content, content_type, headers)
+
+    def invalidate(self, path: str | None = None):
+        """Removes a file from the cache, so it is read again on the next request.
+
+        Args:
+            path (str | None, optional): The path of the file. Defaults to None (all files).
+        """
+        paths = list(self._lru) if path is None else [path]
+        for path in paths:
+            file = self._files.pop(path, None)
+            if file is not None:
+                self._lru.remove(path)
+                self.size -= file.size
+
+    def _evict(self, max_size: int):
+        # Evicts the least recently used files until the cache holds at most `max_size` bytes
+        while self.size > max_size:
+            self.invalidate(self._lru[0])
+
+    def _load(self, path: str, size: int, mtime: int) -> StaticFile:
+        with open(path, "rb") as f:
+            content = f.read()
+        etag = '"{:08x}-{:x}"'.format(binascii.crc32(content) & 0xFFFFFFFF, len(content))
+        return StaticFile(path, content, etag, size, mtime)
+
+    @staticmethod
+    def _matches(if_none_match: str | None, etag: str) -> bool:
+        # If-None-Match holds `*` or a comma-separated list of entity tags,
+        # which may be weak (prefixed with W/)
+        if if_none_match is None:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag == etag or tag == "W/" + etag:
+                return True
+        return False
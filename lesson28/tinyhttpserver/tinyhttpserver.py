@@ -1,6 +1,6 @@
 import usocket as socket
 import utime as time
-from tinyhttpserver import HttpRequest, HttpResponse, HttpRequestHandler
+from tinyhttpserver import HttpRequest, HttpResponse, HttpRequestHandler, HttpRequestError, HttpRequestParser, HttpResponseWriter
 
 class ServerStatus:
     STOPPED = 0
@@ -9,17 +9,17 @@ class ServerStatus:
     STOPPING = 3
 
 class TinyHttpServer:
-    _DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-    _MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-
     def __init__(self, addr: str, port: int, request_handler: HttpRequestHandler):
         self.addr = addr
         self.port = port
         self.request_handler = request_handler
-        self.max_request_size = 1024
+        self.max_request_size = 1024  # Start line and headers
+        self.max_body_size = 1024
+        self.receive_buffer_size = 512
         self.max_concurrent_requests = 1
         self.status = ServerStatus.STOPPED
         self._server_socket = None
+        self._response_writer = HttpResponseWriter()
 
     def start(self):
         # The server can start only if it's stopped
@@ -40,17 +40,27 @@ class TinyHttpServer:
             self.status = ServerStatus.RUNNING
             print("TinyHttpServer listening at address {0} port {1}".format(self.addr, self.port))
 
+            # One connection is served at a time: the parser and the receive
+            # buffer are allocated once
+            parser = HttpRequestParser(self.max_request_size, self.max_body_size)
+            buffer = memoryview(bytearray(self.receive_buffer_size))
+
             while self.status == ServerStatus.RUNNING:
                 client_socket = None
 
                 try:
                     # Parse the incoming request
                     client_socket, client_addr = server_socket.accept()
-                    request = self._parse_request(client_socket.recv(self.max_request_size))
+                    parser.reset()
+                    try:
+                        request = self._receive_request(client_socket, parser, buffer)
+                    except HttpRequestError as ex:
+                        print(client_addr, "<Invalid request>")
+                        self._send_response(HttpResponse(ex.code, ex.status_message, None, None), client_socket)
+                        continue
 
                     if request is None:
-                        print(client_addr, "<Invalid request>")
-                        self._send_response(HttpResponse(400, "Bad Request", None, None), client_socket)
+                        # The client closed the connection
                         continue
 
                     print(client_addr, request.method, request.target, request.version)
@@ -100,78 +110,20 @@ class TinyHttpServer:
         self.status = ServerStatus.STOPPED
         print("TinyHttpServer stopped")
 
-    def _encode_response(self, http_response: HttpResponse) -> bytes:
-        # https://developer.mozilla.org/en-US/docs/Web/HTTP/Messages#http_responses
-
-        # Status line
-        response = "HTTP/1.1 {} {}\r\n".format(http_response.code, http_response.status_message)
-
-        # Headers
-        content_type = "text/plain" if http_response.content_type is None else http_response.content_type
-        response += "Content-Type: {}\r\n".format(content_type)
-
-        content_length = 0 if http_response.content is None else len(http_response.content.encode("utf-8"))
-        response += "Content-Length: {}\r\n".format(content_length)
-        response += "Server: TinyHttpServer\r\n"
-
-        response += "Date: {}\r\n".format(self._get_timestamp())
-        response += "Connection: close\r\n"
-        response += "Cache-Control: no-cache\r\n"
-
-        # Payload
-        if http_response.content is not None:
-            response += "\r\n"
-            response += http_response.content
-
-        # Encode and return the response
-        return response.encode("utf-8")
-
-    def _get_timestamp(self) -> str:
-        # https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Date
-        # Date: <day-name>, <day> <month> <year> <hour>:<minute>:<second> GMT
-        current_time = time.gmtime()
-        timestamp = "{}, {:02} {} {:04} {:02}:{:02}:{:02} GMT".format(
-            TinyHttpServer._DAYS[current_time[6]],  # Day name
-            current_time[2],  # Day
-            TinyHttpServer._MONTHS[current_time[1]],  # Month
-            current_time[0],  # Year
-            current_time[3],  # Hour
-            current_time[4],  # Minute
-            current_time[5],  # Second
-        )
-        return timestamp
-
-    def _parse_request(self, request: bytes) -> HttpRequest | None:
-        # Decode the request
-        # https://developer.mozilla.org/en-US/docs/Web/HTTP/Messages#http_requests
-        lines = None
-        try:
-            lines = request.decode("utf-8").replace("\r", "").split("\n")
-        except UnicodeError:
-            return None
-
-        # Parse the start line
-        # https://developer.mozilla.org/en-US/docs/Web/HTTP/Messages#start_line
-        request_line = lines[0].split(" ")
-        if len(request_line) != 3:
-            return None
-        method = request_line[0].strip()
-        target = request_line[1].strip()
-        version = request_line[2].strip()
-
-        # Parse the headers
-        # https://developer.mozilla.org/en-US/docs/Web/HTTP/Messages#headers
-        # This is not implemented
-
-        # Parse the body
-        # https://developer.mozilla.org/en-US/docs/Web/HTTP/Messages#body
-        # This is not implemented
-
-        # Return the request
-        return HttpRequest(method, target, version)
+    def _receive_request(self, client_socket: socket.socket, parser: HttpRequestParser, buffer: memoryview) -> HttpRequest | None:
+        # Receives bytes until the parser has a complete request. Returns None
+        # if the client closes the connection before. Bytes received after the
+        # request are ignored: the connection is closed after the response.
+        while not parser.is_done():
+            num_bytes = client_socket.recv_into(buffer)
+            if num_bytes == 0:
+                return None
+            parser.feed(buffer[:num_bytes])
+        return parser.get_request()
 
     def _send_response(self, response: HttpResponse, client_socket: socket.socket):
         if self.status == ServerStatus.RUNNING:
-            print(response.code, response.status_message)
-            encoded_response = self._encode_response(response)
-            client_socket.send(encoded_response)
\ No newline at end of file
+            started_on = time.ticks_us()
+            num_bytes = self._response_writer.send(client_socket, response)
+            elapsed_us = time.ticks_diff(time.ticks_us(), started_on)
+            print(response.code, response.status_message, "({} bytes in {} us)".format(num_bytes, elapsed_us))
\ No newline at end of file